@@ -0,0 +1,135 @@
+"""FT Job Assignment: a flat (job, user, role) index of who is on which job.
+
+A user is on a job as its lead (FT Job.job_lead_user), as crew (FT Job Crew via
+FT Technician.user) or as the FT Schedule technician. Rows are rebuilt per job
+from hooks on FT Job (crew rows are saved with their parent) and FT Schedule,
+and explicitly by bulk writers that bypass document hooks, so "my jobs" is one
+indexed range scan on (user, scheduled_start).
+"""
+
+import frappe
+from frappe.utils import now_datetime
+
+ASSIGNMENT_DOCTYPE = "FT Job Assignment"
+
+
+def _technician_users(technicians):
+	if not technicians:
+		return {}
+	return {
+		row.name: row.user
+		for row in frappe.get_all(
+			"FT Technician",
+			filters={"name": ["in", list(technicians)]},
+			fields=["name", "user"],
+			limit_page_length=0,
+		)
+		if row.user
+	}
+
+
+def _assignment_rows(job_names):
+	"""[(job, user, role, scheduled_start, status)] for the given jobs, from their source rows."""
+	jobs = {
+		str(row.name): row
+		for row in frappe.get_all(
+			"FT Job",
+			filters={"name": ["in", list(job_names)]},
+			fields=["name", "job_lead_user", "job_status", "job_scheduled_start"],
+			limit_page_length=0,
+		)
+	}
+	if not jobs:
+		return []
+	out = []
+	for job in jobs.values():
+		if job.job_lead_user:
+			out.append((job.name, job.job_lead_user, "lead", job.job_scheduled_start, job.job_status))
+
+	crew = frappe.get_all(
+		"FT Job Crew",
+		filters={"parenttype": "FT Job", "parent": ["in", list(jobs)]},
+		fields=["parent", "job_crew_technician"],
+		limit_page_length=0,
+	)
+	tech_users = _technician_users({row.job_crew_technician for row in crew if row.job_crew_technician})
+	for row in crew:
+		job = jobs.get(str(row.parent))
+		user = tech_users.get(row.job_crew_technician)
+		if job and user:
+			out.append((job.name, user, "crew", job.job_scheduled_start, job.job_status))
+
+	for row in frappe.get_all(
+		"FT Schedule",
+		filters={"schedule_job": ["in", list(jobs)], "schedule_technician": ["is", "set"]},
+		fields=["schedule_job", "schedule_technician", "schedule_scheduled_start"],
+		limit_page_length=0,
+	):
+		job = jobs.get(str(row.schedule_job))
+		if job:
+			start = row.schedule_scheduled_start or job.job_scheduled_start
+			out.append((job.name, row.schedule_technician, "schedule", start, job.job_status))
+	return list(dict.fromkeys(out))
+
+
+def refresh_jobs(job_names):
+	"""Replace the assignment rows of `job_names` with their current lead/crew/schedule users."""
+	job_names = [str(name) for name in job_names or [] if name]
+	if not job_names or not frappe.db.table_exists(ASSIGNMENT_DOCTYPE):
+		return
+	rows = _assignment_rows(job_names)
+	frappe.db.delete(ASSIGNMENT_DOCTYPE, {"job": ["in", job_names]})
+	if not rows:
+		return
+	now = now_datetime()
+	owner = frappe.session.user
+	frappe.db.bulk_insert(
+		ASSIGNMENT_DOCTYPE,
+		[
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"docstatus",
+			"job",
+			"user",
+			"role",
+			"scheduled_start",
+			"status",
+		],
+		[(frappe.generate_hash(length=10), now, now, owner, owner, 0, *row) for row in rows],
+	)
+
+
+def assigned_job_names(user, limit=500, statuses=None):
+	"""Job names for `user` in scheduled order, from the index table."""
+	filters = {"user": user}
+	if statuses:
+		filters["status"] = ["in", list(statuses)]
+	rows = frappe.get_all(
+		ASSIGNMENT_DOCTYPE,
+		filters=filters,
+		fields=["job", "min(scheduled_start) as start"],
+		group_by="job",
+		order_by="start asc",
+		limit_page_length=limit,
+	)
+	return [row.job for row in rows]
+
+
+def on_job_update(doc, method=None):
+	# Bulk writers refresh the jobs they touched in one go.
+	if frappe.flags.in_bulk_schedule_update:
+		return
+	refresh_jobs([doc.name])
+
+
+def on_job_trash(doc, method=None):
+	if frappe.db.table_exists(ASSIGNMENT_DOCTYPE):
+		frappe.db.delete(ASSIGNMENT_DOCTYPE, {"job": str(doc.name)})
+
+
+def on_schedule_change(doc, method=None):
+	if doc.schedule_job and not frappe.flags.in_bulk_schedule_update:
+		refresh_jobs([doc.schedule_job])
@@ -0,0 +1,319 @@
+"""Double-booking detection for technicians, job crew and instruments.
+
+Bookings in the requested window are loaded with a few indexed range queries
+and grouped per resource into a static interval tree, so checking a drop or
+listing every clash in a month is a handful of O(log n) lookups instead of a
+query per job.
+"""
+
+from datetime import timedelta
+
+import frappe
+from frappe.utils import get_datetime
+
+# Scheduled rows without an end are treated as this long (matches the calendar default).
+DEFAULT_DURATION = timedelta(minutes=90)
+# Range scans on the start index reach back this far to catch long bookings already under way.
+LOOKBACK = timedelta(days=14)
+INACTIVE_INSTRUMENT_STATUSES = ("Returned", "Cancelled")
+
+
+class IntervalTree:
+	"""Static augmented interval tree over half-open [start, end) intervals.
+
+	Built once from a list of (start, end, item); `overlapping(start, end)`
+	returns the items whose interval intersects the query.
+	"""
+
+	def __init__(self, intervals):
+		self._rows = sorted(intervals, key=lambda row: (row[0], row[1]))
+		self._max_end = [None] * len(self._rows)
+		self._build(0, len(self._rows))
+
+	def __len__(self):
+		return len(self._rows)
+
+	def __iter__(self):
+		return iter(self._rows)
+
+	def _build(self, lo, hi):
+		if lo >= hi:
+			return None
+		mid = (lo + hi) // 2
+		best = self._rows[mid][1]
+		for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+			if child is not None and child > best:
+				best = child
+		self._max_end[mid] = best
+		return best
+
+	def overlapping(self, start, end):
+		out = []
+		stack = [(0, len(self._rows))]
+		while stack:
+			lo, hi = stack.pop()
+			if lo >= hi:
+				continue
+			mid = (lo + hi) // 2
+			if self._max_end[mid] <= start:
+				continue
+			stack.append((lo, mid))
+			row_start, row_end, item = self._rows[mid]
+			if row_start < end:
+				if row_end > start:
+					out.append(item)
+				stack.append((mid + 1, hi))
+		return out
+
+
+def _span(start, end):
+	start = get_datetime(start) if start else None
+	if not start:
+		return None, None
+	end = get_datetime(end) if end else None
+	if not end or end <= start:
+		end = start + DEFAULT_DURATION
+	return start, end
+
+
+def _technician_users():
+	"""FT Technician name -> User, so crew rows and schedule rows share one resource key."""
+	return {
+		row.name: row.user or row.name
+		for row in frappe.get_all("FT Technician", fields=["name", "user"], limit_page_length=0)
+	}
+
+
+def _job_slots(start, end):
+	"""job id -> (start, end, technician user) for jobs scheduled in the window; FT Schedule wins."""
+	lo = start - LOOKBACK
+	slots = {}
+	for row in frappe.get_all(
+		"FT Job",
+		filters=[["job_scheduled_start", ">=", lo], ["job_scheduled_start", "<", end]],
+		fields=["name", "job_scheduled_start", "job_scheduled_end", "job_lead_user"],
+		limit_page_length=0,
+	):
+		slots[str(row.name)] = (*_span(row.job_scheduled_start, row.job_scheduled_end), row.job_lead_user)
+	fields = ["schedule_job", "schedule_scheduled_start", "schedule_technician"]
+	if frappe.db.has_column("FT Schedule", "schedule_scheduled_end"):
+		fields.append("schedule_scheduled_end")
+	for row in frappe.get_all(
+		"FT Schedule",
+		filters=[["schedule_scheduled_start", ">=", lo], ["schedule_scheduled_start", "<", end]],
+		fields=fields,
+		limit_page_length=0,
+	):
+		if row.schedule_job:
+			span = _span(row.schedule_scheduled_start, row.get("schedule_scheduled_end"))
+			slots[str(row.schedule_job)] = (*span, row.schedule_technician)
+	return {job: slot for job, slot in slots.items() if slot[0] and slot[0] < end and slot[1] > start}
+
+
+def _crew_by_job(job_ids, tech_users):
+	crew = {}
+	if not job_ids:
+		return crew
+	for row in frappe.get_all(
+		"FT Job Crew",
+		filters={"parenttype": "FT Job", "parent": ["in", list(job_ids)]},
+		fields=["parent", "job_crew_technician"],
+		limit_page_length=0,
+	):
+		if row.job_crew_technician:
+			crew.setdefault(str(row.parent), set()).add(
+				tech_users.get(row.job_crew_technician, row.job_crew_technician)
+			)
+	return crew
+
+
+def _instrument_bookings(start, end, instruments=None):
+	filters = [
+		["instrument_booking_start", ">=", start - LOOKBACK],
+		["instrument_booking_start", "<", end],
+		["instrument_booking_status", "not in", INACTIVE_INSTRUMENT_STATUSES],
+	]
+	if instruments is not None:
+		if not instruments:
+			return []
+		filters.append(["instrument_booking_instrument", "in", list(instruments)])
+	return frappe.get_all(
+		"FT Instrument Booking",
+		filters=filters,
+		fields=[
+			"name",
+			"instrument_booking_instrument",
+			"instrument_booking_job",
+			"instrument_booking_start",
+			"instrument_booking_end",
+		],
+		limit_page_length=0,
+	)
+
+
+class ConflictIndex:
+	"""Per-resource interval trees for one window.
+
+	Resources are ("technician", user) and ("instrument", name). Technician
+	intervals carry the job id; instrument intervals carry (booking, job).
+	"""
+
+	def __init__(self, start, end):
+		self.start = get_datetime(start)
+		self.end = get_datetime(end)
+		tech_users = _technician_users()
+		self.slots = _job_slots(self.start, self.end)
+		self.crew = _crew_by_job(self.slots.keys(), tech_users)
+		by_resource = {}
+		for job, (job_start, job_end, technician) in self.slots.items():
+			for person in self.people(job, technician):
+				by_resource.setdefault(("technician", person), []).append((job_start, job_end, job))
+		for row in _instrument_bookings(self.start, self.end):
+			booking_start, booking_end = _span(row.instrument_booking_start, row.instrument_booking_end)
+			if booking_start and booking_start < self.end and booking_end > self.start:
+				by_resource.setdefault(("instrument", row.instrument_booking_instrument), []).append(
+					(booking_start, booking_end, (row.name, str(row.instrument_booking_job or "")))
+				)
+		self.trees = {resource: IntervalTree(rows) for resource, rows in by_resource.items()}
+
+	def people(self, job, technician=None):
+		people = set(self.crew.get(str(job), ()))
+		if technician:
+			people.add(technician)
+		return people
+
+	def clashes(self, resource, start, end, ignore_job=None):
+		tree = self.trees.get(resource)
+		if tree is None:
+			return []
+		out = []
+		for item in tree.overlapping(start, end):
+			job = item[1] if isinstance(item, tuple) else item
+			if ignore_job is not None and job == str(ignore_job):
+				continue
+			out.append(item)
+		return out
+
+	def all_conflicts(self):
+		out = []
+		for (kind, resource), tree in self.trees.items():
+			if len(tree) < 2:
+				continue
+			seen = set()
+			for row_start, row_end, item in tree:
+				for other in tree.overlapping(row_start, row_end):
+					if other == item:
+						continue
+					pair = tuple(sorted((str(item), str(other))))
+					if pair in seen:
+						continue
+					seen.add(pair)
+					out.append(_conflict_row(kind, resource, item, other))
+		return out
+
+
+def _conflict_row(kind, resource, item, other):
+	if kind == "instrument":
+		return {
+			"type": "instrument",
+			"resource": resource,
+			"bookings": [item[0], other[0]],
+			"jobs": [item[1], other[1]],
+		}
+	return {"type": "technician", "resource": resource, "jobs": [item, other]}
+
+
+def conflicts_for_move(job_id, start, end, technician_id=None):
+	"""Clashes the job would have if scheduled at [start, end) with `technician_id` (plus its crew)."""
+	start, end = _span(start, end)
+	if not start:
+		return []
+	job_id = str(job_id)
+	index = ConflictIndex(start, end)
+	if technician_id is None:
+		technician_id = (index.slots.get(job_id) or (None, None, None))[2]
+	if not index.crew.get(job_id):
+		index.crew.update(_crew_by_job([job_id], _technician_users()))
+	out = []
+	for person in sorted(index.people(job_id, technician_id)):
+		for other in index.clashes(("technician", person), start, end, ignore_job=job_id):
+			out.append(_conflict_row("technician", person, job_id, other))
+	for booking in frappe.get_all(
+		"FT Instrument Booking",
+		filters={
+			"instrument_booking_job": job_id,
+			"instrument_booking_status": ["not in", INACTIVE_INSTRUMENT_STATUSES],
+		},
+		fields=["name", "instrument_booking_instrument"],
+		limit_page_length=0,
+	):
+		resource = ("instrument", booking.instrument_booking_instrument)
+		for other in index.clashes(resource, start, end, ignore_job=job_id):
+			out.append(_conflict_row("instrument", resource[1], (booking.name, job_id), other))
+	return out
+
+
+def conflicts_for_jobs(job_ids, start, end):
+	"""Clashes involving any of `job_ids` at their current slots, from a single index over [start, end)."""
+	index = ConflictIndex(start, end)
+	wanted = {str(job) for job in job_ids} & set(index.slots)
+	out = []
+	seen = set()
+	for job in sorted(wanted):
+		job_start, job_end, technician = index.slots[job]
+		for person in sorted(index.people(job, technician)):
+			for other in index.clashes(("technician", person), job_start, job_end, ignore_job=job):
+				pair = (person, *sorted((job, other)))
+				if pair not in seen:
+					seen.add(pair)
+					out.append(_conflict_row("technician", person, job, other))
+	if not wanted:
+		return out
+	for booking in frappe.get_all(
+		"FT Instrument Booking",
+		filters={
+			"instrument_booking_job": ["in", sorted(wanted)],
+			"instrument_booking_status": ["not in", INACTIVE_INSTRUMENT_STATUSES],
+		},
+		fields=["name", "instrument_booking_instrument", "instrument_booking_job"],
+		limit_page_length=0,
+	):
+		job = str(booking.instrument_booking_job)
+		job_start, job_end, _ = index.slots[job]
+		resource = ("instrument", booking.instrument_booking_instrument)
+		for other in index.clashes(resource, job_start, job_end, ignore_job=job):
+			pair = (resource, *sorted((booking.name, other[0])))
+			if pair not in seen:
+				seen.add(pair)
+				out.append(_conflict_row("instrument", resource[1], (booking.name, job), other))
+	return out
+
+
+def instrument_booking_clashes(instrument, start, end, ignore_booking=None):
+	"""Other active bookings of `instrument` overlapping [start, end)."""
+	start, end = _span(start, end)
+	if not instrument or not start:
+		return []
+	rows = []
+	for row in _instrument_bookings(start, end, instruments=[instrument]):
+		if ignore_booking and row.name == ignore_booking:
+			continue
+		rows.append((*_span(row.instrument_booking_start, row.instrument_booking_end), row.name))
+	return IntervalTree(rows).overlapping(start, end)
+
+
+@frappe.whitelist()
+def check_schedule_conflicts(job_id, start=None, end=None, technician_id=None):
+	"""Conflicts a calendar drop would create; called before/while dragging."""
+	if not job_id:
+		frappe.throw("job_id is required")
+	return {"job_id": job_id, "conflicts": conflicts_for_move(job_id, start, end, technician_id)}
+
+
+@frappe.whitelist()
+def get_conflicts_in_range(start, end):
+	"""Every technician/crew and instrument double-booking overlapping [start, end)."""
+	start_dt, end_dt = get_datetime(start), get_datetime(end)
+	if not start_dt or not end_dt or end_dt <= start_dt:
+		frappe.throw("A valid start/end range is required")
+	return {"conflicts": ConflictIndex(start_dt, end_dt).all_conflicts()}
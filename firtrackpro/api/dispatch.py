@@ -0,0 +1,505 @@
+"""Auto-dispatch: propose technician/day/slot assignments for unassigned FT Jobs.
+
+Each technician-day is a route. Jobs (earliest required date first) are put
+into the route where they add the least travel, among technicians whose work
+calendar, clearances and inductions allow it. Time the technician is already
+booked for (own jobs and crew slots) is taken out of their day first. Random relocate/swap moves then
+run until the time budget is spent, and a move is kept only when it lowers
+travel + lateness. Nothing is written: the dispatcher reviews the proposal
+and applies it through the scheduler endpoints.
+"""
+
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.query_builder.functions import Max
+from frappe.utils import cint, flt, get_datetime, getdate, now_datetime
+
+from firtrackpro.api import conflicts, scheduler, work_calendar
+
+TRAVEL_KMH = 50.0
+UNKNOWN_TRAVEL_MINUTES = 20
+# Cost of one day past job_required_date, in travel-minute units.
+LATE_PENALTY = 240
+UNASSIGNED_PENALTY = 100000
+DEFAULT_TIME_BUDGET = 3.0
+MAX_TIME_BUDGET = 15.0
+MAX_RANGE_DAYS = 31
+# Jobs in these states are done with and never offered for dispatch.
+FINISHED_JOB_STATUSES = {
+	"Complete",
+	"Completed",
+	"Office Review",
+	"Invoiced",
+	"Closed",
+	"Finalised",
+	"Cancelled",
+}
+
+
+def _child_rows(doctype, parents, fields):
+	by_parent = {}
+	if not parents:
+		return by_parent
+	for row in frappe.get_all(
+		doctype,
+		filters={"parent": ["in", list(parents)]},
+		fields=["parent", *fields],
+		limit_page_length=0,
+	):
+		by_parent.setdefault(row.parent, []).append(row)
+	return by_parent
+
+
+def _expiry_ok(value, day):
+	if not value:
+		return True
+	try:
+		return getdate(value) >= day
+	except Exception:
+		return True
+
+
+def _latest_fixes(technicians, since):
+	"""{technician: (lat, lng)} of each technician's newest located fix since `since`.
+
+	The newest timestamp per technician is grouped in the database (on the technician,
+	timestamp index), so only one row per technician comes back.
+	"""
+	if not technicians:
+		return {}
+	location = frappe.qb.DocType("FT Technician Location")
+	located = (location.latitude != 0) | (location.longitude != 0)
+	latest = (
+		frappe.qb.from_(location)
+		.select(location.technician, Max(location.timestamp).as_("latest"))
+		.where(location.technician.isin(list(technicians)))
+		.where(location.timestamp >= since)
+		.where(located)
+		.groupby(location.technician)
+	)
+	rows = (
+		frappe.qb.from_(location)
+		.join(latest)
+		.on((location.technician == latest.technician) & (location.timestamp == latest.latest))
+		.select(location.technician, location.latitude, location.longitude)
+		.where(located)
+		.run(as_dict=True)
+	)
+	return {row.technician: (flt(row.latitude), flt(row.longitude)) for row in rows}
+
+
+def _load_technicians(only=None):
+	filters = {"status": "active", "user": ["is", "set"]}
+	if only:
+		filters["user"] = ["in", only]
+	techs = frappe.get_all("FT Technician", filters=filters, fields=["name", "user", "work_calendar"])
+	names = [t.name for t in techs]
+	competencies = _child_rows("FT Technician Competency", names, ["competency"])
+	licences = _child_rows(
+		"FT Technician Licence", names, ["technician_licence_type", "technician_licence_expirs_on"]
+	)
+	clearances = _child_rows(
+		"FT Technician Clearance", names, ["technician_clearance_type", "technician_clearance_expires_on"]
+	)
+	inductions = _child_rows(
+		"FT Induction Record", names, ["induction_property", "induction_template", "induction_expires_on"]
+	)
+	last_fix = _latest_fixes(names, now_datetime() - timedelta(days=7))
+	return [
+		{
+			"name": t.name,
+			"user": t.user,
+			"calendar": t.work_calendar,
+			"competencies": {str(r.competency).lower() for r in competencies.get(t.name, []) if r.competency},
+			"licences": [
+				(str(r.technician_licence_type or "").lower(), r.technician_licence_expirs_on)
+				for r in licences.get(t.name, [])
+			],
+			"clearances": [
+				(str(r.technician_clearance_type or "").lower(), r.technician_clearance_expires_on)
+				for r in clearances.get(t.name, [])
+			],
+			"inductions": [
+				(r.induction_property, str(r.induction_template or "").lower(), r.induction_expires_on)
+				for r in inductions.get(t.name, [])
+			],
+			"origin": last_fix.get(t.name),
+		}
+		for t in techs
+	]
+
+
+def _load_property_requirements(property_ids):
+	coords = {}
+	if property_ids:
+		for row in frappe.get_all(
+			"FT Property",
+			filters={"name": ["in", list(property_ids)]},
+			fields=["name", "property_lat", "property_lng"],
+			limit_page_length=0,
+		):
+			if row.property_lat or row.property_lng:
+				coords[row.name] = (flt(row.property_lat), flt(row.property_lng))
+	credentials = {
+		parent: [
+			str(r.property_credential_type or "").lower()
+			for r in rows
+			if cint(r.property_credential_blocking)
+		]
+		for parent, rows in _child_rows(
+			"FT Property Credential Requirement",
+			property_ids,
+			["property_credential_type", "property_credential_blocking"],
+		).items()
+	}
+	inductions = {
+		parent: [
+			str(r.property_induction_template or "").lower()
+			for r in rows
+			if cint(r.property_induction_blocking) and cint(r.property_induction_required)
+		]
+		for parent, rows in _child_rows(
+			"FT Property Induction Requirement",
+			property_ids,
+			["property_induction_template", "property_induction_blocking", "property_induction_required"],
+		).items()
+	}
+	return coords, credentials, inductions
+
+
+def _haversine_km(a, b):
+	lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+	h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+	return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+def travel_minutes(a, b):
+	"""Straight-line drive estimate between two (lat, lng) points."""
+	if a is None or b is None:
+		return UNKNOWN_TRAVEL_MINUTES
+	return _haversine_km(a, b) / TRAVEL_KMH * 60.0
+
+
+def _free_spans(spans, busy):
+	"""Minute spans left in `spans` once the (start, end) minute intervals in `busy` are taken out."""
+	out = []
+	for span_start, span_end in spans:
+		cursor = span_start
+		for busy_start, busy_end in sorted(busy):
+			if busy_end <= cursor or busy_start >= span_end:
+				continue
+			if busy_start > cursor:
+				out.append((cursor, busy_start))
+			cursor = max(cursor, busy_end)
+		if cursor < span_end:
+			out.append((cursor, span_end))
+	return out
+
+
+def _busy_minutes(techs, days, index, skip_jobs=()):
+	"""(tech index, day index) -> booked (start, end) minute-of-day intervals from the conflict index."""
+	busy = {}
+	skip = {str(job) for job in skip_jobs}
+	for ti, tech in enumerate(techs):
+		tree = index.trees.get(("technician", tech["user"]))
+		if tree is None:
+			continue
+		for di, day in enumerate(days):
+			midnight = datetime.combine(day, datetime.min.time())
+			for job in tree.overlapping(midnight, midnight + timedelta(days=1)):
+				if job in skip:
+					continue
+				job_start, job_end, _technician = index.slots[job]
+				busy.setdefault((ti, di), []).append(
+					(
+						max(0.0, (job_start - midnight).total_seconds() / 60.0),
+						min(24 * 60.0, (job_end - midnight).total_seconds() / 60.0),
+					)
+				)
+	return busy
+
+
+class _Problem:
+	def __init__(
+		self, jobs, techs, days, calendars, coords, credentials, inductions, requirements, busy=None
+	):
+		self.jobs = jobs
+		self.techs = techs
+		self.days = days
+		self.coords = [coords.get(j.get("property_id")) for j in jobs]
+		self.origins = [t["origin"] for t in techs]
+		self.duration = [max(15, cint(j.get("duration_minutes")) or 90) for j in jobs]
+		self.required = [getdate(j["required_date"]) if j.get("required_date") else None for j in jobs]
+		self.windows = {}
+		for ti, tech in enumerate(techs):
+			calendar = calendars.get(tech["calendar"]) or work_calendar.get_calendar()
+			for di, day in enumerate(days):
+				self.windows[(ti, di)] = _free_spans(calendar.windows(day), (busy or {}).get((ti, di), []))
+		self.capacity = {key: sum(end - start for start, end in spans) for key, spans in self.windows.items()}
+		self._travel = {}
+		self._eligible = {}
+		self.credentials = credentials
+		self.inductions = inductions
+		self.requirements = requirements or {}
+
+	def eligible(self, ji, ti, di):
+		key = (ji, ti, di)
+		if key not in self._eligible:
+			self._eligible[key] = bool(self.capacity.get((ti, di))) and self._check(
+				self.jobs[ji], self.techs[ti], self.days[di]
+			)
+		return self._eligible[key]
+
+	def _check(self, job, tech, day):
+		prop = job.get("property_id")
+		for kind in self.credentials.get(prop, []):
+			if not any(t == kind and _expiry_ok(exp, day) for t, exp in tech["clearances"]):
+				return False
+		for template in self.inductions.get(prop, []):
+			if not any(
+				p == prop and (not template or tpl == template) and _expiry_ok(exp, day)
+				for p, tpl, exp in tech["inductions"]
+			):
+				return False
+		needs = self.requirements.get(job.get("title")) or {}
+		if not {str(c).lower() for c in needs.get("competencies") or []} <= tech["competencies"]:
+			return False
+		for licence in needs.get("licences") or []:
+			if not any(t == str(licence).lower() and _expiry_ok(exp, day) for t, exp in tech["licences"]):
+				return False
+		return True
+
+	def travel(self, a, b):
+		"""Minutes from point a to job b; a is a job index or ("origin", tech index)."""
+		key = (a, b)
+		if key not in self._travel:
+			if isinstance(a, tuple):
+				src = self.origins[a[1]]
+				# No recent location fix: the first job of the day carries no travel.
+				self._travel[key] = 0.0 if src is None else travel_minutes(src, self.coords[b])
+			else:
+				self._travel[key] = travel_minutes(self.coords[a], self.coords[b])
+		return self._travel[key]
+
+	def lateness(self, ji, di):
+		required = self.required[ji]
+		day = self.days[di]
+		return (day - required).days * LATE_PENALTY if required and day > required else 0
+
+	def leg_delta(self, key, route, pos, ji):
+		"""Extra travel from putting ji at route[pos] (or taking it out when route[pos] is ji)."""
+		prev = route[pos - 1] if pos else ("origin", key[0])
+		nxt_pos = pos + 1 if pos < len(route) and route[pos] == ji else pos
+		nxt = route[nxt_pos] if nxt_pos < len(route) else None
+		delta = self.travel(prev, ji)
+		if nxt is not None:
+			delta += self.travel(ji, nxt) - self.travel(prev, nxt)
+		return delta
+
+	def route_cost(self, key, route):
+		"""(travel + lateness, travel + work minutes) for one technician-day route."""
+		prev = ("origin", key[0])
+		cost = 0.0
+		load = 0.0
+		for ji in route:
+			leg = self.travel(prev, ji)
+			cost += leg + self.lateness(ji, key[1])
+			load += leg + self.duration[ji]
+			prev = ji
+		return cost, load
+
+
+def _solve(problem, time_budget, seed=None):
+	rng = random.Random(seed)
+	routes = {key: [] for key, cap in problem.capacity.items() if cap}
+	costs = {key: 0.0 for key in routes}
+	loads = {key: 0.0 for key in routes}
+	where = {}
+	order = sorted(
+		range(len(problem.jobs)),
+		key=lambda ji: (problem.required[ji] or problem.days[-1], -problem.duration[ji]),
+	)
+
+	def best_insert(ji, keys):
+		best = None
+		for key in keys:
+			if not problem.eligible(ji, *key):
+				continue
+			route = routes[key]
+			late = problem.lateness(ji, key[1])
+			room = problem.capacity[key] - loads[key] - problem.duration[ji]
+			for pos in range(len(route) + 1):
+				leg = problem.leg_delta(key, route, pos, ji)
+				if leg > room:
+					continue
+				if best is None or leg + late < best[0]:
+					best = (leg + late, key, pos, leg)
+		return best
+
+	def place(ji, best):
+		delta, key, pos, leg = best
+		routes[key].insert(pos, ji)
+		costs[key] += delta
+		loads[key] += leg + problem.duration[ji]
+		where[ji] = key
+
+	def unplace(ji):
+		key = where.pop(ji)
+		route = routes[key]
+		pos = route.index(ji)
+		leg = problem.leg_delta(key, route, pos, ji)
+		route.pop(pos)
+		costs[key] -= leg + problem.lateness(ji, key[1])
+		loads[key] -= leg + problem.duration[ji]
+		return leg + problem.lateness(ji, key[1])
+
+	for ji in order:
+		best = best_insert(ji, routes.keys())
+		if best:
+			place(ji, best)
+
+	iterations = 0
+	deadline = time.monotonic() + time_budget
+	keys = list(routes)
+	jobs = list(range(len(problem.jobs)))
+	while keys and jobs and time.monotonic() < deadline:
+		iterations += 1
+		ji = rng.choice(jobs)
+		src = where.get(ji)
+		if rng.random() < 0.7:
+			# Relocate: move the job to the cheapest spot on a few sampled routes.
+			candidates = [k for k in rng.sample(keys, min(4, len(keys))) if k != src]
+			best = best_insert(ji, candidates)
+			if not best:
+				continue
+			if src is None:
+				gain = UNASSIGNED_PENALTY
+			else:
+				route = routes[src]
+				gain = problem.leg_delta(src, route, route.index(ji), ji) + problem.lateness(ji, src[1])
+			if best[0] < gain - 1e-6:
+				if src is not None:
+					unplace(ji)
+				place(ji, best)
+		else:
+			# Swap with a job on another route.
+			other = rng.choice(jobs)
+			dst = where.get(other)
+			if src is None or dst is None or src == dst:
+				continue
+			if not problem.eligible(ji, *dst) or not problem.eligible(other, *src):
+				continue
+			a = [other if j == ji else j for j in routes[src]]
+			b = [ji if j == other else j for j in routes[dst]]
+			cost_a, load_a = problem.route_cost(src, a)
+			cost_b, load_b = problem.route_cost(dst, b)
+			if load_a > problem.capacity[src] or load_b > problem.capacity[dst]:
+				continue
+			if cost_a + cost_b < costs[src] + costs[dst] - 1e-6:
+				routes[src], routes[dst] = a, b
+				costs[src], costs[dst] = cost_a, cost_b
+				loads[src], loads[dst] = load_a, load_b
+				where[ji], where[other] = dst, src
+	return routes, iterations
+
+
+def _timed_route(problem, key, route):
+	"""Lay the route out inside the day's windows; returns (job index, start, end, travel) rows."""
+	ti, di = key
+	day = problem.days[di]
+	spans = problem.windows[key]
+	if not spans:
+		return []
+	midnight = datetime.combine(day, datetime.min.time())
+	span_idx = 0
+	cursor = spans[0][0]
+	prev = ("origin", ti)
+	out = []
+	for ji in route:
+		leg = problem.travel(prev, ji)
+		cursor += leg
+		while span_idx < len(spans) and cursor + problem.duration[ji] > spans[span_idx][1]:
+			span_idx += 1
+			if span_idx < len(spans):
+				cursor = max(cursor, spans[span_idx][0])
+		if span_idx >= len(spans):
+			break
+		start = midnight + timedelta(minutes=round(cursor))
+		cursor += problem.duration[ji]
+		out.append((ji, start, midnight + timedelta(minutes=round(cursor)), round(leg)))
+		prev = ji
+	return out
+
+
+@frappe.whitelist()
+def propose_dispatch(start, end, technicians=None, requirements=None, time_budget=None, seed=None):
+	"""Propose technician + slot for the unassigned jobs between `start` and `end`.
+
+	`technicians` optionally limits the pool (list of User ids). `requirements`
+	maps a job title to {"competencies": [...], "licences": [...]} the
+	technician must hold. `time_budget` caps the improvement phase in seconds.
+	"""
+	start_dt, end_dt = get_datetime(start), get_datetime(end)
+	if not start_dt or not end_dt or end_dt <= start_dt:
+		frappe.throw("A valid start/end range is required")
+	if (end_dt - start_dt).days > MAX_RANGE_DAYS:
+		frappe.throw(f"Dispatch range is limited to {MAX_RANGE_DAYS} days")
+	if isinstance(technicians, str):
+		technicians = json.loads(technicians) if technicians.strip().startswith("[") else [technicians]
+	if isinstance(requirements, str):
+		requirements = json.loads(requirements or "{}")
+	budget = min(
+		MAX_TIME_BUDGET, max(0.0, flt(time_budget) if time_budget is not None else DEFAULT_TIME_BUDGET)
+	)
+
+	started = time.monotonic()
+	rows, _ = scheduler._get_jobs_in_window(start_dt, end_dt)
+	jobs = [r for r in rows if not r.get("technician_id") and r.get("status") not in FINISHED_JOB_STATUSES]
+	techs = _load_technicians(technicians)
+	last_day = (end_dt - timedelta(microseconds=1)).date()
+	days = [start_dt.date() + timedelta(days=i) for i in range((last_day - start_dt.date()).days + 1)]
+	property_ids = {j.get("property_id") for j in jobs if j.get("property_id")}
+	coords, credentials, inductions = _load_property_requirements(property_ids)
+	calendars = work_calendar.get_calendars({t["calendar"] for t in techs})
+	# Time already booked (including crew slots) is taken out of each technician-day.
+	index = conflicts.ConflictIndex(
+		datetime.combine(days[0], datetime.min.time()),
+		datetime.combine(days[-1] + timedelta(days=1), datetime.min.time()),
+	)
+	busy = _busy_minutes(techs, days, index, skip_jobs=[j["id"] for j in jobs])
+	problem = _Problem(jobs, techs, days, calendars, coords, credentials, inductions, requirements, busy)
+	routes, iterations = _solve(problem, budget, seed=cint(seed) if seed is not None else None)
+
+	proposals = []
+	placed = set()
+	total_travel = 0
+	for key, route in routes.items():
+		for ji, slot_start, slot_end, leg in _timed_route(problem, key, route):
+			placed.add(ji)
+			total_travel += leg
+			proposals.append(
+				{
+					"job_id": jobs[ji]["id"],
+					"technician_id": techs[key[0]]["user"],
+					"scheduled_start": slot_start,
+					"scheduled_end": slot_end,
+					"travel_minutes": leg,
+				}
+			)
+	proposals.sort(key=lambda p: (p["technician_id"], p["scheduled_start"]))
+	return {
+		"proposals": proposals,
+		"unassigned": [jobs[ji]["id"] for ji in range(len(jobs)) if ji not in placed],
+		"stats": {
+			"jobs": len(jobs),
+			"technicians": len(techs),
+			"travel_minutes": total_travel,
+			"iterations": iterations,
+			"elapsed_ms": round((time.monotonic() - started) * 1000),
+		},
+	}
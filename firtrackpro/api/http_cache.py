@@ -0,0 +1,43 @@
+"""ETag / If-None-Match handling shared by the cacheable read endpoints.
+
+An endpoint hashes its payload with payload_etag(), stores it under "etag" and
+returns conditional_response(): the ETag header is always set, and a client
+that already holds that version (If-None-Match, or an `etag` argument for
+clients that cannot set headers) gets a 304 with a small body instead.
+"""
+
+import hashlib
+import json
+
+import frappe
+
+
+def payload_etag(payload) -> str:
+	"""Stable hash of a JSON-serialisable payload."""
+	return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def client_etags(fallback=None) -> set[str]:
+	"""Entity tags the client already holds, without weak prefixes or quotes."""
+	headers = getattr(getattr(frappe.local, "request", None), "headers", None) or {}
+	raw = str(headers.get("If-None-Match") or fallback or "")
+	tags = set()
+	for part in raw.split(","):
+		part = part.strip()
+		if part.startswith("W/"):
+			part = part[2:]
+		tags.add(part.strip('"'))
+	tags.discard("")
+	return tags
+
+
+def conditional_response(payload, etag: str, fallback=None):
+	"""`payload`, or a 304 "not modified" body when the client's tag matches `etag` (or is `*`)."""
+	response_headers = getattr(frappe.local, "response_headers", None)
+	if response_headers is not None:
+		response_headers["ETag"] = f'"{etag}"'
+	tags = client_etags(fallback)
+	if etag in tags or "*" in tags:
+		frappe.local.response["http_status_code"] = 304
+		return {"not_modified": True, "etag": etag}
+	return payload
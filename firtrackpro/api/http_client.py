@@ -0,0 +1,154 @@
+"""Pooled outbound HTTP for integrations (Xero, QuickBooks, MYOB, FireLink, Google, partner tenants).
+
+One `requests.Session` per scheme+host keeps TCP/TLS connections alive across
+calls within a worker. The sessions are shared by every site the worker serves,
+so they never store cookies. Pool sizes and the default timeout can be tuned from
+site config:
+
+	firtrackpro_http_pool_connections   (default 4)
+	firtrackpro_http_pool_maxsize       (default 10)
+	firtrackpro_http_timeout            (default 30 seconds)
+"""
+
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+from urllib.parse import urlparse
+
+import frappe
+
+from firtrackpro.api import rate_limit
+
+try:
+	import requests
+	from requests.adapters import HTTPAdapter
+except Exception:  # pragma: no cover
+	requests = None
+	HTTPAdapter = None
+
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+
+_sessions: dict[str, Any] = {}
+_metrics: dict[str, dict[str, float]] = {}
+_lock = threading.Lock()
+
+
+def _conf_int(key: str, default: int) -> int:
+	try:
+		return int(frappe.conf.get(key) or default)
+	except Exception:
+		return default
+
+
+def _host_key(url: str) -> str:
+	parsed = urlparse(str(url or ""))
+	return f"{parsed.scheme or 'https'}://{(parsed.netloc or '').lower()}"
+
+
+def get_session(url: str):
+	"""Return the shared keep-alive session for the URL's scheme+host."""
+	if requests is None:
+		frappe.throw("Outbound HTTP is unavailable (requests library missing).")
+	key = _host_key(url)
+	session = _sessions.get(key)
+	if session is not None:
+		return session
+	with _lock:
+		session = _sessions.get(key)
+		if session is None:
+			session = requests.Session()
+			# Shared across requests and sites: never keep cookies between calls.
+			session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+			adapter = HTTPAdapter(
+				pool_connections=_conf_int("firtrackpro_http_pool_connections", DEFAULT_POOL_CONNECTIONS),
+				pool_maxsize=_conf_int("firtrackpro_http_pool_maxsize", DEFAULT_POOL_MAXSIZE),
+			)
+			session.mount("https://", adapter)
+			session.mount("http://", adapter)
+			_sessions[key] = session
+	return session
+
+
+def _record(host: str, elapsed_ms: float, failed: bool) -> None:
+	with _lock:
+		row = _metrics.setdefault(host, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+		row["calls"] += 1
+		row["total_ms"] += elapsed_ms
+		row["max_ms"] = max(row["max_ms"], elapsed_ms)
+		if failed:
+			row["errors"] += 1
+
+
+def request(
+	method: str,
+	url: str,
+	timeout: Any = None,
+	gzip: bool = True,
+	throttle: tuple[str, str] | None = None,
+	**kwargs,
+):
+	"""Drop-in for `requests.request` that reuses the per-host pool and records metrics.
+
+	`gzip=False` asks the server for an uncompressed body (some partner proxies
+	mangle compressed responses). `throttle=(provider, tenant)` draws from the
+	shared rate-limit bucket before each attempt and retries 429s with
+	Retry-After/backoff; the last 429 is returned to the caller unchanged.
+	"""
+	session = get_session(url)
+	headers = dict(kwargs.pop("headers", None) or {})
+	headers.setdefault("Accept-Encoding", "gzip, deflate" if gzip else "identity")
+	if timeout is None:
+		timeout = _conf_int("firtrackpro_http_timeout", DEFAULT_TIMEOUT)
+	host = _host_key(url)
+	attempts = rate_limit.MAX_ATTEMPTS if throttle else 1
+	for attempt in range(attempts):
+		if throttle:
+			rate_limit.acquire(*throttle)
+		started = time.monotonic()
+		failed = True
+		try:
+			resp = session.request(method.upper(), url, headers=headers, timeout=timeout, **kwargs)
+			failed = not resp.ok
+		finally:
+			_record(host, (time.monotonic() - started) * 1000.0, failed)
+		if throttle:
+			rate_limit.observe(*throttle, resp)
+		if resp.status_code != 429 or attempt == attempts - 1:
+			return resp
+		rate_limit.wait(rate_limit.backoff(resp, attempt))
+	return resp
+
+
+def get(url: str, **kwargs):
+	return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+	return request("POST", url, **kwargs)
+
+
+def delete(url: str, **kwargs):
+	return request("DELETE", url, **kwargs)
+
+
+def get_metrics(reset: bool = False) -> dict[str, dict[str, float]]:
+	"""Per-host call counts and latency for this worker process."""
+	with _lock:
+		out = {
+			host: {**row, "avg_ms": round(row["total_ms"] / row["calls"], 1) if row["calls"] else 0.0}
+			for host, row in _metrics.items()
+		}
+		if reset:
+			_metrics.clear()
+	return out
+
+
+@frappe.whitelist()
+def http_metrics(reset=0):
+	"""Outbound call metrics of the worker serving this request (System Manager)."""
+	frappe.only_for("System Manager")
+	return get_metrics(reset=bool(frappe.utils.cint(reset)))
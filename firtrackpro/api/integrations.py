@@ -14,6 +14,8 @@ import frappe
 from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
 from frappe.utils.file_manager import save_file
 
+from firtrackpro.api import http_cache, http_client, rate_limit
+
 try:
 	import requests
 except Exception:  # pragma: no cover
@@ -54,6 +56,8 @@ FIRELINK_BRIDGE_TOKEN_CANDIDATES = (
 )
 FIRELINK_BASE_FALLBACK = "https://firelink.firetrackpro.com.au"
 FIRELINK_ADDRESS_DOCTYPES = ("FL Address", "Address")
+ADDRESS_KEY_FIELD = "address_key"
+ADDRESS_MATCH_KEY_FIELD = "address_match_key"
 
 FIRELINK_PROVISION_COMMAND_CANDIDATES = (
 	"firelink_provision_command",
@@ -249,22 +253,131 @@ def _xero_basic_auth(client_id: str, client_secret: str) -> str:
 	return base64.b64encode(raw).decode("utf-8")
 
 
-def _xero_refresh_if_needed(config: dict[str, Any]) -> dict[str, Any]:
-	access_token = _as_str(config.get("xeroAccessToken"))
-	refresh_token = _as_str(config.get("xeroRefreshToken"))
-	expires_at = _as_str(config.get("xeroTokenExpiresAt"))
-	if not access_token:
-		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	if not refresh_token:
+OAUTH_TOKEN_FIELDS: dict[str, tuple[str, str, str]] = {
+	"Xero": ("xeroAccessToken", "xeroRefreshToken", "xeroTokenExpiresAt"),
+	"QuickBooks": ("quickbooksAccessToken", "quickbooksRefreshToken", "quickbooksTokenExpiresAt"),
+}
+OAUTH_REFRESH_MARGIN = timedelta(minutes=2)
+# The scheduler refreshes anything expiring inside this window so request paths rarely have to.
+OAUTH_BACKGROUND_WINDOW = timedelta(minutes=10)
+OAUTH_TOKEN_CACHE_TTL = 60 * 60 * 24 * 30
+
+
+def _oauth_token_cache_key(provider: str) -> str:
+	return f"firtrackpro:oauth_tokens:{provider}"
+
+
+def _oauth_token_expiry(raw: Any) -> datetime | None:
+	value = _as_str(raw)
+	if not value:
+		return None
+	try:
+		parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+	except Exception:
+		return None
+	return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _clear_oauth_token_cache(provider: str) -> None:
+	frappe.cache().delete_value(_oauth_token_cache_key(provider))
+
+
+def _merge_cached_oauth_tokens(provider: str, config: dict[str, Any]) -> dict[str, Any]:
+	"""Adopt tokens another worker refreshed if they outlive the ones this config was loaded with.
+
+	The cache is read outside the DB transaction, so it sees rotations that the
+	caller's snapshot of the defaults blob cannot.
+	"""
+	fields = OAUTH_TOKEN_FIELDS[provider]
+	if not _as_str(config.get(fields[1])):
+		return config
+	cached = frappe.cache().get_value(_oauth_token_cache_key(provider))
+	if not isinstance(cached, dict):
+		return config
+	cached_exp = _oauth_token_expiry(cached.get(fields[2]))
+	current_exp = _oauth_token_expiry(config.get(fields[2]))
+	if cached_exp and (current_exp is None or cached_exp > current_exp):
+		for field in fields:
+			config[field] = _as_str(cached.get(field))
+	return config
+
+
+def _oauth_needs_refresh(provider: str, config: dict[str, Any], margin: timedelta) -> bool:
+	expires = _oauth_token_expiry(config.get(OAUTH_TOKEN_FIELDS[provider][2]))
+	return expires is None or expires <= datetime.now(timezone.utc) + margin
+
+
+def _single_flight_refresh(
+	provider: str,
+	config: dict[str, Any],
+	refresh_fn,
+	margin: timedelta = OAUTH_REFRESH_MARGIN,
+) -> dict[str, Any]:
+	"""Refresh the provider's tokens at most once across all workers.
+
+	Only the lock holder calls the identity endpoint; the others wait, then pick
+	the rotated tokens up from the cache. The new tokens are written straight to
+	the stored record and committed before the lock is released: the old refresh
+	token is already spent, so a later rollback in the caller (or a save of a
+	stale row) must not be able to lose the new one. That commit also persists
+	whatever the caller has written so far; the sync jobs that refresh mid-run
+	already commit per chunk and their upserts are idempotent.
+	"""
+	fields = OAUTH_TOKEN_FIELDS[provider]
+	config = _merge_cached_oauth_tokens(provider, config)
+	if not _as_str(config.get(fields[1])) or not _oauth_needs_refresh(provider, config, margin):
 		return config
-	if expires_at:
+	cache = frappe.cache()
+	lock = cache.lock(cache.make_key(f"firtrackpro:oauth_refresh:{provider}"), timeout=60, blocking_timeout=30)
+	if not lock.acquire():
+		return _merge_cached_oauth_tokens(provider, config)
+	try:
+		config = _merge_cached_oauth_tokens(provider, config)
+		if not _oauth_needs_refresh(provider, config, margin):
+			return config
+		config = refresh_fn(config)
+		tokens = {field: _as_str(config.get(field)) for field in fields}
+		cache.set_value(_oauth_token_cache_key(provider), tokens, expires_in_sec=OAUTH_TOKEN_CACHE_TTL)
+		stored = _integration_record(provider)
+		stored.update(tokens)
+		_persist_integration_record(provider, stored)
+		frappe.db.commit()
+	finally:
 		try:
-			exp_dt = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
-			if exp_dt > datetime.now(timezone.utc):
-				return config
+			lock.release()
 		except Exception:
 			pass
+	return config
 
+
+def refresh_oauth_tokens():
+	"""Scheduler: refresh Xero/QuickBooks access tokens shortly before they expire."""
+	for provider in ("Xero", "QuickBooks"):
+		try:
+			row = _integration_record(provider)
+			if not _as_str(row.get(OAUTH_TOKEN_FIELDS[provider][1])):
+				continue
+			if provider == "Xero":
+				row = _xero_apply_site_config_credentials(row)[0]
+				_single_flight_refresh(provider, row, _xero_refresh_token, margin=OAUTH_BACKGROUND_WINDOW)
+			else:
+				row = _quickbooks_apply_site_config_credentials(row)[0]
+				_single_flight_refresh(provider, row, _quickbooks_refresh_token, margin=OAUTH_BACKGROUND_WINDOW)
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(frappe.get_traceback(), f"{provider} token refresh failed")
+
+
+def _xero_refresh_if_needed(config: dict[str, Any]) -> dict[str, Any]:
+	if not _as_str(config.get("xeroAccessToken")):
+		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
+	return _single_flight_refresh("Xero", config, _xero_refresh_token)
+
+
+def _xero_refresh_token(config: dict[str, Any]) -> dict[str, Any]:
+	access_token = _as_str(config.get("xeroAccessToken"))
+	refresh_token = _as_str(config.get("xeroRefreshToken"))
 	if requests is None:
 		frappe.throw("Xero token refresh is unavailable (requests library missing).")
 
@@ -280,7 +393,7 @@ def _xero_refresh_if_needed(config: dict[str, Any]) -> dict[str, Any]:
 		"Accept": "application/json",
 	}
 	form = {"grant_type": "refresh_token", "refresh_token": refresh_token}
-	resp = requests.post(token_url, headers=headers, data=form, timeout=20)
+	resp = http_client.post(token_url, headers=headers, data=form, timeout=20)
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		detail_l = detail.lower()
@@ -291,6 +404,7 @@ def _xero_refresh_if_needed(config: dict[str, Any]) -> dict[str, Any]:
 			config["xeroRefreshToken"] = ""
 			config["xeroTokenExpiresAt"] = ""
 			config["xeroConnectionsJson"] = "[]"
+			_clear_oauth_token_cache("Xero")
 			frappe.throw(
 				"Xero refresh token is invalid or missing in Xero. Reconnect Xero in Integrations to continue sync.",
 				frappe.ValidationError,
@@ -347,7 +461,7 @@ def _xero_fetch_connections(config: dict[str, Any]) -> list[dict[str, Any]]:
 	access_token = _as_str(config.get("xeroAccessToken"))
 	if not access_token:
 		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	resp = requests.get(
+	resp = http_client.get(
 		"https://api.xero.com/connections",
 		headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
 		timeout=20,
@@ -355,7 +469,7 @@ def _xero_fetch_connections(config: dict[str, Any]) -> list[dict[str, Any]]:
 	if resp.status_code == 401:
 		config = _xero_refresh_if_needed(config)
 		access_token = _as_str(config.get("xeroAccessToken"))
-		resp = requests.get(
+		resp = http_client.get(
 			"https://api.xero.com/connections",
 			headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
 			timeout=20,
@@ -387,7 +501,7 @@ def _xero_remote_disconnect(config: dict[str, Any]) -> dict[str, Any]:
 		conn_id = _as_str(row.get("id"))
 		if not conn_id:
 			continue
-		resp = requests.delete(
+		resp = http_client.delete(
 			f"https://api.xero.com/connections/{conn_id}",
 			headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
 			timeout=20,
@@ -395,7 +509,7 @@ def _xero_remote_disconnect(config: dict[str, Any]) -> dict[str, Any]:
 		if resp.status_code == 401:
 			config = _xero_refresh_if_needed(config)
 			access_token = _as_str(config.get("xeroAccessToken"))
-			resp = requests.delete(
+			resp = http_client.delete(
 				f"https://api.xero.com/connections/{conn_id}",
 				headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
 				timeout=20,
@@ -405,35 +519,141 @@ def _xero_remote_disconnect(config: dict[str, Any]) -> dict[str, Any]:
 	if failures:
 		return {"ok": False, "message": f"Some Xero connections could not be revoked: {', '.join(failures)}"}
 	return {"ok": True, "message": "Xero organization connections revoked."}
-def _xero_fetch_contacts(config: dict[str, Any]) -> list[dict[str, Any]]:
+
+
+XERO_API_BASE = "https://api.xero.com/api.xro/2.0"
+XERO_PAGE_SIZE = 100
+SYNC_CHECKPOINT_DOCTYPE = "FT Sync Checkpoint"
+
+
+def _xero_get(
+	config: dict[str, Any],
+	path: str,
+	label: str,
+	params: dict[str, Any] | None = None,
+	extra_headers: dict[str, str] | None = None,
+) -> Any:
 	if requests is None:
 		frappe.throw("Xero calls are unavailable (requests library missing).")
-	access_token = _as_str(config.get("xeroAccessToken"))
-	tenant_id = _as_str(config.get("tenantId"))
-	if not access_token:
-		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	if not tenant_id:
-		frappe.throw("Xero tenant is not linked yet. Click Check Xero Orgs first.", frappe.ValidationError)
-
-	headers = {
-		"Authorization": f"Bearer {access_token}",
-		"Accept": "application/json",
-		"xero-tenant-id": tenant_id,
-	}
-	resp = requests.get("https://api.xero.com/api.xro/2.0/Contacts", headers=headers, timeout=25)
+	url = f"{XERO_API_BASE}/{path.lstrip('/')}"
+	headers = {**_xero_api_headers(config), **(extra_headers or {})}
+	resp = http_client.get(url, headers=headers, params=params or {}, timeout=30, throttle=_xero_throttle(headers))
 	if _xero_is_auth_unsuccessful(resp):
-		config = _xero_refresh_and_reselect_tenant(config)
-		headers["Authorization"] = f"Bearer {_as_str(config.get('xeroAccessToken'))}"
-		headers["xero-tenant-id"] = _as_str(config.get("tenantId"))
-		resp = requests.get("https://api.xero.com/api.xro/2.0/Contacts", headers=headers, timeout=25)
+		# Update in place so later pages reuse the refreshed token.
+		config.update(_xero_refresh_and_reselect_tenant(config))
+		headers = {**_xero_api_headers(config), **(extra_headers or {})}
+		resp = http_client.get(url, headers=headers, params=params or {}, timeout=30, throttle=_xero_throttle(headers))
+	if resp.status_code == 304:
+		return resp
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		if _xero_is_auth_unsuccessful(resp):
 			frappe.throw("Xero authentication failed for the selected organization. Reconnect Xero and re-select the org in Integrations.", frappe.ValidationError)
-		frappe.throw(f"Xero contacts fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
-	payload = resp.json() if hasattr(resp, "json") else {}
-	rows = payload.get("Contacts") if isinstance(payload, dict) else []
-	return rows if isinstance(rows, list) else []
+		frappe.throw(f"Xero {label} fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
+	return resp
+
+
+def _xero_iter_pages(
+	config: dict[str, Any],
+	path: str,
+	collection: str,
+	label: str,
+	params: dict[str, Any] | None = None,
+	modified_since: str = "",
+	paged: bool = True,
+):
+	"""Yield each page of a Xero collection, walking page=N until a short page.
+
+	`modified_since` is sent as If-Modified-Since so Xero only returns rows
+	changed after the stored checkpoint; a 304 means nothing changed.
+	"""
+	extra_headers = {"If-Modified-Since": modified_since} if modified_since else {}
+	page = 1
+	while True:
+		query = dict(params or {})
+		if paged:
+			query["page"] = page
+		resp = _xero_get(config, path, label, params=query, extra_headers=extra_headers)
+		if resp.status_code == 304:
+			return
+		payload = resp.json() if hasattr(resp, "json") else {}
+		rows = payload.get(collection) if isinstance(payload, dict) else []
+		rows = rows if isinstance(rows, list) else []
+		if rows:
+			yield rows
+		if not paged or len(rows) < XERO_PAGE_SIZE:
+			return
+		page += 1
+
+
+def _xero_fetch_all(config: dict[str, Any], path: str, collection: str, label: str, **kwargs) -> list[dict[str, Any]]:
+	out: list[dict[str, Any]] = []
+	for rows in _xero_iter_pages(config, path, collection, label, **kwargs):
+		out.extend(rows)
+	return out
+
+
+def _xero_updated_at(row: dict[str, Any]) -> datetime | None:
+	# Xero serialises UpdatedDateUTC as "/Date(1573755038314+0000)/".
+	raw = _as_str((row or {}).get("UpdatedDateUTC"))
+	match = re.search(r"Date\((-?\d+)", raw)
+	if not match:
+		return None
+	try:
+		return datetime.fromtimestamp(int(match.group(1)) / 1000, tz=timezone.utc)
+	except Exception:
+		return None
+
+
+def _xero_high_water_mark(rows: list[dict[str, Any]], current: str = "") -> str:
+	best = None
+	if current:
+		try:
+			best = datetime.fromisoformat(current).replace(tzinfo=timezone.utc)
+		except Exception:
+			best = None
+	for row in rows:
+		updated = _xero_updated_at(row) if isinstance(row, dict) else None
+		if updated and (best is None or updated > best):
+			best = updated
+	return best.strftime("%Y-%m-%dT%H:%M:%S") if best else ""
+
+
+def _sync_checkpoint_key(provider: str, entity: str) -> str:
+	return f"{provider}:{entity}"
+
+
+def _get_sync_checkpoint(provider: str, entity: str) -> str:
+	"""Return the stored high-water mark (UTC, Xero If-Modified-Since format) or ''."""
+	value = frappe.db.get_value(SYNC_CHECKPOINT_DOCTYPE, _sync_checkpoint_key(provider, entity), "high_water_mark")
+	if not value:
+		return ""
+	return frappe.utils.get_datetime(value).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _save_sync_checkpoint(provider: str, entity: str, high_water_mark: str, row_count: int) -> None:
+	key = _sync_checkpoint_key(provider, entity)
+	values = {
+		"high_water_mark": high_water_mark.replace("T", " ") if high_water_mark else None,
+		"last_synced_at": frappe.utils.now_datetime(),
+		"last_row_count": int(row_count or 0),
+	}
+	if frappe.db.exists(SYNC_CHECKPOINT_DOCTYPE, key):
+		frappe.db.set_value(SYNC_CHECKPOINT_DOCTYPE, key, values, update_modified=False)
+		return
+	frappe.get_doc(
+		{
+			"doctype": SYNC_CHECKPOINT_DOCTYPE,
+			"checkpoint_key": key,
+			"provider": provider,
+			"entity": entity,
+			**values,
+		}
+	).insert(ignore_permissions=True)
+
+
+def _xero_fetch_contacts(config: dict[str, Any], modified_since: str = "") -> list[dict[str, Any]]:
+	return _xero_fetch_all(config, "Contacts", "Contacts", "contacts", modified_since=modified_since)
 
 
 def _ensure_customer_xero_fields() -> None:
@@ -645,6 +865,15 @@ def _ensure_accounting_sync_meta_fields() -> None:
 				"read_only": 1,
 				"no_copy": 1,
 			},
+			{
+				"fieldname": "accounting_sync_hash",
+				"label": "Accounting Sync Hash",
+				"fieldtype": "Data",
+				"insert_after": "accounting_sync_error",
+				"read_only": 1,
+				"hidden": 1,
+				"no_copy": 1,
+			},
 		],
 		"Supplier": [
 			{
@@ -688,6 +917,15 @@ def _ensure_accounting_sync_meta_fields() -> None:
 				"read_only": 1,
 				"no_copy": 1,
 			},
+			{
+				"fieldname": "accounting_sync_hash",
+				"label": "Accounting Sync Hash",
+				"fieldtype": "Data",
+				"insert_after": "accounting_sync_error",
+				"read_only": 1,
+				"hidden": 1,
+				"no_copy": 1,
+			},
 		],
 		"Sales Invoice": [
 			{
@@ -731,6 +969,15 @@ def _ensure_accounting_sync_meta_fields() -> None:
 				"read_only": 1,
 				"no_copy": 1,
 			},
+			{
+				"fieldname": "accounting_sync_hash",
+				"label": "Accounting Sync Hash",
+				"fieldtype": "Data",
+				"insert_after": "accounting_sync_error",
+				"read_only": 1,
+				"hidden": 1,
+				"no_copy": 1,
+			},
 		],
 		"Payment Entry": [
 			{
@@ -774,6 +1021,15 @@ def _ensure_accounting_sync_meta_fields() -> None:
 				"read_only": 1,
 				"no_copy": 1,
 			},
+			{
+				"fieldname": "accounting_sync_hash",
+				"label": "Accounting Sync Hash",
+				"fieldtype": "Data",
+				"insert_after": "accounting_sync_error",
+				"read_only": 1,
+				"hidden": 1,
+				"no_copy": 1,
+			},
 		],
 	}
 	create_custom_fields(fields, update=True)
@@ -857,7 +1113,202 @@ def _xero_contact_matches_entity(contact: dict[str, Any], entity: str) -> bool:
 	return True
 
 
-def _upsert_customer_from_xero_contact(contact: dict[str, Any]) -> str:
+ACCOUNTING_LOOKUP_FIELDS: dict[str, tuple[str, ...]] = {
+	"Customer": ("xero_contact_id", "email_id", "customer_name"),
+	"Supplier": ("xero_contact_id", "email_id", "supplier_name"),
+	"Item": ("xero_item_id", "name", "item_code"),
+	"Sales Invoice": ("xero_invoice_id", "bill_no"),
+	"Payment Entry": ("xero_payment_id",),
+}
+
+
+ACCOUNTING_FINGERPRINT_FIELD = "accounting_sync_hash"
+
+
+def _lookup_key(value: Any) -> str:
+	# MariaDB compares these columns case-insensitively; keep the maps consistent with that.
+	return _as_str(value).strip().lower()
+
+
+ACCOUNTING_LOOKUP_CHUNK = 500
+
+
+def _xero_record_keys(records: list[Any]) -> dict[str, dict[str, set[str]]]:
+	"""Match keys a batch of Xero-shaped records will look up: {doctype: {fieldname: {key}}}."""
+	keys: dict[str, dict[str, set[str]]] = {}
+
+	def add(doctype: str, fieldname: str, value: Any) -> None:
+		key = _lookup_key(value)
+		if key:
+			keys.setdefault(doctype, {}).setdefault(fieldname, set()).add(key)
+
+	def add_contact(contact: dict[str, Any], doctype: str, name_field: str) -> None:
+		add(doctype, "xero_contact_id", contact.get("ContactID"))
+		add(doctype, "email_id", _primary_email(contact))
+		add(doctype, name_field, contact.get("Name"))
+
+	for record in records or []:
+		if not isinstance(record, dict):
+			continue
+		if "PaymentID" in record:
+			add("Payment Entry", "xero_payment_id", record.get("PaymentID"))
+			invoice = record.get("Invoice") if isinstance(record.get("Invoice"), dict) else {}
+			add("Sales Invoice", "xero_invoice_id", invoice.get("InvoiceID"))
+		elif "InvoiceID" in record:
+			add("Sales Invoice", "xero_invoice_id", record.get("InvoiceID"))
+			add("Sales Invoice", "bill_no", record.get("InvoiceNumber"))
+			contact = record.get("Contact") if isinstance(record.get("Contact"), dict) else {}
+			add_contact(contact, "Customer", "customer_name")
+		elif "ItemID" in record or "Code" in record:
+			add("Item", "xero_item_id", record.get("ItemID"))
+			add("Item", "name", record.get("Code"))
+			add("Item", "item_code", record.get("Code"))
+		elif "ContactID" in record:
+			add_contact(record, "Customer", "customer_name")
+			add_contact(record, "Supplier", "supplier_name")
+	return keys
+
+
+def _converted_records(rows: list[Any], convert: Any) -> list[dict[str, Any]]:
+	"""Provider rows mapped to the Xero shape for key prefetching; rows that fail to map are skipped."""
+	out: list[dict[str, Any]] = []
+	for raw in rows or []:
+		try:
+			out.append(convert(raw if isinstance(raw, dict) else {}))
+		except Exception:
+			continue
+	return out
+
+
+def _load_accounting_rows(lookup: dict[str, Any], doctype: str, keys: dict[str, Any] | None = None) -> None:
+	"""Index `doctype` rows into the lookup: those matching `keys` per field, or every row."""
+	fields = ACCOUNTING_LOOKUP_FIELDS.get(doctype) or ()
+	index = lookup.setdefault(doctype, {fieldname: {} for fieldname in fields})
+	with_fingerprint = frappe.get_meta(doctype).has_field(ACCOUNTING_FINGERPRINT_FIELD)
+	fingerprints = (
+		lookup.setdefault("_fingerprints", {}).setdefault(doctype, {}) if with_fingerprint else None
+	)
+	query_fields = list(
+		dict.fromkeys(["name", *fields] + ([ACCOUNTING_FINGERPRINT_FIELD] if with_fingerprint else []))
+	)
+
+	def index_rows(rows: list[dict[str, Any]], only: str | None = None) -> None:
+		for row in rows:
+			for fieldname in [only] if only else fields:
+				key = _lookup_key(row.get(fieldname))
+				if key and key not in index[fieldname]:
+					index[fieldname][key] = _as_str(row.get("name"))
+			if fingerprints is not None and row.get(ACCOUNTING_FINGERPRINT_FIELD):
+				fingerprints[_as_str(row.get("name"))] = _as_str(row.get(ACCOUNTING_FINGERPRINT_FIELD))
+
+	if keys is None:
+		index_rows(
+			frappe.get_all(doctype, fields=query_fields, order_by="modified desc", limit_page_length=0)
+		)
+		return
+
+	# Per field, so each map keeps "newest row wins" like the full load.
+	loaded = lookup.setdefault("_loaded", {}).setdefault(doctype, {})
+	for fieldname in fields:
+		wanted = sorted(set(keys.get(fieldname) or ()) - loaded.get(fieldname, set()))
+		for i in range(0, len(wanted), ACCOUNTING_LOOKUP_CHUNK):
+			chunk = wanted[i : i + ACCOUNTING_LOOKUP_CHUNK]
+			rows = frappe.get_all(
+				doctype,
+				filters={fieldname: ["in", chunk]},
+				fields=query_fields,
+				order_by="modified desc",
+				limit_page_length=0,
+			)
+			index_rows(rows, only=fieldname)
+		loaded.setdefault(fieldname, set()).update(wanted)
+
+
+def _build_accounting_lookup(
+	*doctypes: str, records: list[Any] | None = None
+) -> dict[str, dict[str, dict[str, str]]]:
+	"""Load the match keys for each doctype once per sync run.
+
+	Returns {doctype: {fieldname: {normalised value: docname}}}. The first row
+	wins per value, ordered like `frappe.db.get_value` would resolve it. Stored
+	payload fingerprints are kept under lookup["_fingerprints"][doctype].
+
+	With `records` (the Xero-shaped batch being upserted) only rows matching the
+	batch's keys are prefetched, with IN queries; keys outside the batch are
+	fetched on first use. An empty batch loads nothing.
+	"""
+	lookup: dict[str, dict[str, dict[str, str]]] = {}
+	keys = None if records is None else _xero_record_keys(records)
+	for doctype in doctypes:
+		_load_accounting_rows(lookup, doctype, None if keys is None else keys.get(doctype, {}))
+	return lookup
+
+
+def _lookup_name(lookup: dict[str, Any] | None, doctype: str, fieldname: str, value: Any) -> str:
+	if not _as_str(value):
+		return ""
+	if lookup is None or doctype not in lookup:
+		if fieldname == "name":
+			return _as_str(value) if frappe.db.exists(doctype, _as_str(value)) else ""
+		return _as_str(frappe.db.get_value(doctype, {fieldname: _as_str(value)}, "name"))
+	key = _lookup_key(value)
+	if not key:
+		return ""
+	loaded = lookup.get("_loaded", {}).get(doctype)
+	if loaded is not None and key not in loaded.get(fieldname, set()):
+		_load_accounting_rows(lookup, doctype, {fieldname: {key}})
+	return _as_str((lookup[doctype].get(fieldname) or {}).get(key))
+
+
+def _accounting_fingerprint(payload: dict[str, Any]) -> str:
+	"""Stable hash of the mapped remote payload, stored on the record after each save."""
+	raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+	return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _skip_unchanged(lookup: dict[str, Any] | None, doctype: str, docname: str, fingerprint: str) -> bool:
+	"""Return True (and just touch the sync time) when the record already holds this fingerprint."""
+	if not docname:
+		return False
+	if lookup is not None and doctype in lookup.get("_fingerprints", {}):
+		stored = _as_str(lookup["_fingerprints"][doctype].get(docname))
+	elif frappe.get_meta(doctype).has_field(ACCOUNTING_FINGERPRINT_FIELD):
+		stored = _as_str(frappe.db.get_value(doctype, docname, ACCOUNTING_FINGERPRINT_FIELD))
+	else:
+		return False
+	if not stored or stored != fingerprint:
+		return False
+	frappe.db.set_value(
+		doctype,
+		docname,
+		"accounting_last_synced_at",
+		frappe.utils.now_datetime(),
+		update_modified=False,
+	)
+	if lookup is not None:
+		lookup.setdefault("_unchanged", set()).add((doctype, docname))
+	return True
+
+
+def _was_unchanged(lookup: dict[str, Any] | None, doctype: str, docname: str) -> bool:
+	return bool(lookup) and (doctype, docname) in lookup.get("_unchanged", set())
+
+
+def _remember_lookup(lookup: dict[str, Any] | None, doc: Any) -> None:
+	"""Record a saved doc in the run's lookup so later rows in the same batch match it."""
+	if lookup is None or doc.doctype not in lookup:
+		return
+	for fieldname, index in lookup[doc.doctype].items():
+		key = _lookup_key(doc.get(fieldname))
+		if key:
+			index.setdefault(key, _as_str(doc.name))
+	if doc.doctype in lookup.get("_fingerprints", {}):
+		lookup["_fingerprints"][doc.doctype][_as_str(doc.name)] = _as_str(
+			doc.get(ACCOUNTING_FINGERPRINT_FIELD)
+		)
+
+
+def _upsert_customer_from_xero_contact(contact: dict[str, Any], lookup: dict[str, Any] | None = None) -> str:
 	contact_id = _as_str(contact.get("ContactID"))
 	contact_name = _as_str(contact.get("Name"))
 	contact_number = _as_str(contact.get("ContactNumber"))
@@ -866,13 +1317,16 @@ def _upsert_customer_from_xero_contact(contact: dict[str, Any]) -> str:
 	if not contact_id or not contact_name:
 		return ""
 
-	customer_name = ""
-	if frappe.db.exists("Customer", {"xero_contact_id": contact_id}):
-		customer_name = frappe.db.get_value("Customer", {"xero_contact_id": contact_id}, "name")
-	elif email and frappe.db.exists("Customer", {"email_id": email}):
-		customer_name = frappe.db.get_value("Customer", {"email_id": email}, "name")
-	elif frappe.db.exists("Customer", {"customer_name": contact_name}):
-		customer_name = frappe.db.get_value("Customer", {"customer_name": contact_name}, "name")
+	customer_name = (
+		_lookup_name(lookup, "Customer", "xero_contact_id", contact_id)
+		or _lookup_name(lookup, "Customer", "email_id", email)
+		or _lookup_name(lookup, "Customer", "customer_name", contact_name)
+	)
+	fingerprint = _accounting_fingerprint(
+		{"id": contact_id, "name": contact_name, "number": contact_number, "email": email, "phone": phone}
+	)
+	if _skip_unchanged(lookup, "Customer", customer_name, fingerprint):
+		return customer_name
 
 	if customer_name:
 		doc = frappe.get_doc("Customer", customer_name)
@@ -894,13 +1348,15 @@ def _upsert_customer_from_xero_contact(contact: dict[str, Any]) -> str:
 	doc.accounting_provider = "Xero"
 	doc.accounting_external_id = contact_id
 	doc.accounting_sync_error = ""
+	doc.accounting_sync_hash = fingerprint
 
 	doc.flags.ignore_permissions = True
 	doc.save(ignore_permissions=True)
+	_remember_lookup(lookup, doc)
 	return _as_str(doc.name)
 
 
-def _upsert_supplier_from_xero_contact(contact: dict[str, Any]) -> str:
+def _upsert_supplier_from_xero_contact(contact: dict[str, Any], lookup: dict[str, Any] | None = None) -> str:
 	contact_id = _as_str(contact.get("ContactID"))
 	contact_name = _as_str(contact.get("Name"))
 	contact_number = _as_str(contact.get("ContactNumber"))
@@ -909,13 +1365,16 @@ def _upsert_supplier_from_xero_contact(contact: dict[str, Any]) -> str:
 	if not contact_id or not contact_name:
 		return ""
 
-	supplier_name = ""
-	if frappe.db.exists("Supplier", {"xero_contact_id": contact_id}):
-		supplier_name = frappe.db.get_value("Supplier", {"xero_contact_id": contact_id}, "name")
-	elif email and frappe.db.exists("Supplier", {"email_id": email}):
-		supplier_name = frappe.db.get_value("Supplier", {"email_id": email}, "name")
-	elif frappe.db.exists("Supplier", {"supplier_name": contact_name}):
-		supplier_name = frappe.db.get_value("Supplier", {"supplier_name": contact_name}, "name")
+	supplier_name = (
+		_lookup_name(lookup, "Supplier", "xero_contact_id", contact_id)
+		or _lookup_name(lookup, "Supplier", "email_id", email)
+		or _lookup_name(lookup, "Supplier", "supplier_name", contact_name)
+	)
+	fingerprint = _accounting_fingerprint(
+		{"id": contact_id, "name": contact_name, "number": contact_number, "email": email, "phone": phone}
+	)
+	if _skip_unchanged(lookup, "Supplier", supplier_name, fingerprint):
+		return supplier_name
 
 	if supplier_name:
 		doc = frappe.get_doc("Supplier", supplier_name)
@@ -938,123 +1397,53 @@ def _upsert_supplier_from_xero_contact(contact: dict[str, Any]) -> str:
 	doc.accounting_provider = "Xero"
 	doc.accounting_external_id = contact_id
 	doc.accounting_sync_error = ""
+	doc.accounting_sync_hash = fingerprint
 	doc.flags.ignore_permissions = True
 	doc.save(ignore_permissions=True)
+	_remember_lookup(lookup, doc)
 	return _as_str(doc.name)
 
 
-def _xero_fetch_invoices(config: dict[str, Any]) -> list[dict[str, Any]]:
-	if requests is None:
-		frappe.throw("Xero calls are unavailable (requests library missing).")
-	access_token = _as_str(config.get("xeroAccessToken"))
-	tenant_id = _as_str(config.get("tenantId"))
-	if not access_token:
-		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	if not tenant_id:
-		frappe.throw("Xero tenant is not linked yet. Click Check Xero Orgs first.", frappe.ValidationError)
-
-	headers = {
-		"Authorization": f"Bearer {access_token}",
-		"Accept": "application/json",
-		"xero-tenant-id": tenant_id,
-	}
-	params = {"where": 'Type=="ACCREC"'}
-	resp = requests.get("https://api.xero.com/api.xro/2.0/Invoices", headers=headers, params=params, timeout=30)
-	if _xero_is_auth_unsuccessful(resp):
-		config = _xero_refresh_and_reselect_tenant(config)
-		headers["Authorization"] = f"Bearer {_as_str(config.get('xeroAccessToken'))}"
-		headers["xero-tenant-id"] = _as_str(config.get("tenantId"))
-		resp = requests.get("https://api.xero.com/api.xro/2.0/Invoices", headers=headers, params=params, timeout=30)
-	if not resp.ok:
-		detail = _as_str(resp.text)
-		if _xero_is_auth_unsuccessful(resp):
-			frappe.throw("Xero authentication failed for the selected organization. Reconnect Xero and re-select the org in Integrations.", frappe.ValidationError)
-		frappe.throw(f"Xero invoices fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
-	payload = resp.json() if hasattr(resp, "json") else {}
-	rows = payload.get("Invoices") if isinstance(payload, dict) else []
-	return rows if isinstance(rows, list) else []
-
-
-def _xero_fetch_items(config: dict[str, Any]) -> list[dict[str, Any]]:
-	if requests is None:
-		frappe.throw("Xero calls are unavailable (requests library missing).")
-	access_token = _as_str(config.get("xeroAccessToken"))
-	tenant_id = _as_str(config.get("tenantId"))
-	if not access_token:
-		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	if not tenant_id:
-		frappe.throw("Xero tenant is not linked yet. Click Check Xero Orgs first.", frappe.ValidationError)
+def _xero_fetch_invoices(config: dict[str, Any], modified_since: str = "") -> list[dict[str, Any]]:
+	return _xero_fetch_all(
+		config,
+		"Invoices",
+		"Invoices",
+		"invoices",
+		params={"where": 'Type=="ACCREC"'},
+		modified_since=modified_since,
+	)
 
-	headers = {
-		"Authorization": f"Bearer {access_token}",
-		"Accept": "application/json",
-		"xero-tenant-id": tenant_id,
-	}
-	resp = requests.get("https://api.xero.com/api.xro/2.0/Items", headers=headers, timeout=30)
-	if _xero_is_auth_unsuccessful(resp):
-		config = _xero_refresh_and_reselect_tenant(config)
-		headers["Authorization"] = f"Bearer {_as_str(config.get('xeroAccessToken'))}"
-		headers["xero-tenant-id"] = _as_str(config.get("tenantId"))
-		resp = requests.get("https://api.xero.com/api.xro/2.0/Items", headers=headers, timeout=30)
-	if not resp.ok:
-		detail = _as_str(resp.text)
-		if _xero_is_auth_unsuccessful(resp):
-			frappe.throw("Xero authentication failed for the selected organization. Reconnect Xero and re-select the org in Integrations.", frappe.ValidationError)
-		frappe.throw(f"Xero items fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
-	payload = resp.json() if hasattr(resp, "json") else {}
-	rows = payload.get("Items") if isinstance(payload, dict) else []
-	return rows if isinstance(rows, list) else []
 
+def _xero_fetch_items(config: dict[str, Any], modified_since: str = "") -> list[dict[str, Any]]:
+	# The Items endpoint is not paginated; it always returns the full (filtered) list.
+	return _xero_fetch_all(config, "Items", "Items", "items", modified_since=modified_since, paged=False)
 
-def _xero_fetch_payments(config: dict[str, Any]) -> list[dict[str, Any]]:
-	if requests is None:
-		frappe.throw("Xero calls are unavailable (requests library missing).")
-	access_token = _as_str(config.get("xeroAccessToken"))
-	tenant_id = _as_str(config.get("tenantId"))
-	if not access_token:
-		frappe.throw("Xero is not connected. Run Connect Xero first.", frappe.ValidationError)
-	if not tenant_id:
-		frappe.throw("Xero tenant is not linked yet. Click Check Xero Orgs first.", frappe.ValidationError)
 
-	headers = {
-		"Authorization": f"Bearer {access_token}",
-		"Accept": "application/json",
-		"xero-tenant-id": tenant_id,
-	}
-	resp = requests.get("https://api.xero.com/api.xro/2.0/Payments", headers=headers, timeout=30)
-	if _xero_is_auth_unsuccessful(resp):
-		config = _xero_refresh_and_reselect_tenant(config)
-		headers["Authorization"] = f"Bearer {_as_str(config.get('xeroAccessToken'))}"
-		headers["xero-tenant-id"] = _as_str(config.get("tenantId"))
-		resp = requests.get("https://api.xero.com/api.xro/2.0/Payments", headers=headers, timeout=30)
-	if not resp.ok:
-		detail = _as_str(resp.text)
-		if _xero_is_auth_unsuccessful(resp):
-			frappe.throw("Xero authentication failed for the selected organization. Reconnect Xero and re-select the org in Integrations.", frappe.ValidationError)
-		frappe.throw(f"Xero payments fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
-	payload = resp.json() if hasattr(resp, "json") else {}
-	rows = payload.get("Payments") if isinstance(payload, dict) else []
-	return rows if isinstance(rows, list) else []
+def _xero_fetch_payments(config: dict[str, Any], modified_since: str = "") -> list[dict[str, Any]]:
+	return _xero_fetch_all(config, "Payments", "Payments", "payments", modified_since=modified_since)
 
 
 def _xero_fetch_credit_notes(config: dict[str, Any]) -> list[dict[str, Any]]:
 	if requests is None:
 		frappe.throw("Xero calls are unavailable (requests library missing).")
 	headers = _xero_api_headers(config)
-	resp = requests.get(
+	resp = http_client.get(
 		"https://api.xero.com/api.xro/2.0/CreditNotes",
 		headers=headers,
 		params={"where": 'Type=="ACCRECCREDIT"'},
 		timeout=30,
+		throttle=_xero_throttle(headers),
 	)
 	if _xero_is_auth_unsuccessful(resp):
 		config = _xero_refresh_and_reselect_tenant(config)
 		headers = _xero_api_headers(config)
-		resp = requests.get(
+		resp = http_client.get(
 			"https://api.xero.com/api.xro/2.0/CreditNotes",
 			headers=headers,
 			params={"where": 'Type=="ACCRECCREDIT"'},
 			timeout=30,
+			throttle=_xero_throttle(headers),
 		)
 	if not resp.ok:
 		detail = _as_str(resp.text)
@@ -1068,11 +1457,11 @@ def _xero_fetch_accounts(config: dict[str, Any]) -> list[dict[str, Any]]:
 	if requests is None:
 		frappe.throw("Xero calls are unavailable (requests library missing).")
 	headers = _xero_api_headers(config)
-	resp = requests.get("https://api.xero.com/api.xro/2.0/Accounts", headers=headers, timeout=30)
+	resp = http_client.get("https://api.xero.com/api.xro/2.0/Accounts", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if _xero_is_auth_unsuccessful(resp):
 		config = _xero_refresh_and_reselect_tenant(config)
 		headers = _xero_api_headers(config)
-		resp = requests.get("https://api.xero.com/api.xro/2.0/Accounts", headers=headers, timeout=30)
+		resp = http_client.get("https://api.xero.com/api.xro/2.0/Accounts", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		frappe.throw(f"Xero accounts fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -1085,11 +1474,11 @@ def _xero_fetch_tax_rates(config: dict[str, Any]) -> list[dict[str, Any]]:
 	if requests is None:
 		frappe.throw("Xero calls are unavailable (requests library missing).")
 	headers = _xero_api_headers(config)
-	resp = requests.get("https://api.xero.com/api.xro/2.0/TaxRates", headers=headers, timeout=30)
+	resp = http_client.get("https://api.xero.com/api.xro/2.0/TaxRates", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if _xero_is_auth_unsuccessful(resp):
 		config = _xero_refresh_and_reselect_tenant(config)
 		headers = _xero_api_headers(config)
-		resp = requests.get("https://api.xero.com/api.xro/2.0/TaxRates", headers=headers, timeout=30)
+		resp = http_client.get("https://api.xero.com/api.xro/2.0/TaxRates", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		frappe.throw(f"Xero tax rates fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -1102,11 +1491,11 @@ def _xero_fetch_tracking_categories(config: dict[str, Any]) -> list[dict[str, An
 	if requests is None:
 		frappe.throw("Xero calls are unavailable (requests library missing).")
 	headers = _xero_api_headers(config)
-	resp = requests.get("https://api.xero.com/api.xro/2.0/TrackingCategories", headers=headers, timeout=30)
+	resp = http_client.get("https://api.xero.com/api.xro/2.0/TrackingCategories", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if _xero_is_auth_unsuccessful(resp):
 		config = _xero_refresh_and_reselect_tenant(config)
 		headers = _xero_api_headers(config)
-		resp = requests.get("https://api.xero.com/api.xro/2.0/TrackingCategories", headers=headers, timeout=30)
+		resp = http_client.get("https://api.xero.com/api.xro/2.0/TrackingCategories", headers=headers, timeout=30, throttle=_xero_throttle(headers))
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		frappe.throw(f"Xero tracking categories fetch failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -1130,6 +1519,11 @@ def _xero_api_headers(config: dict[str, Any]) -> dict[str, str]:
 	}
 
 
+def _xero_throttle(headers: dict[str, str]) -> tuple[str, str]:
+	# Xero limits are per tenant, so the shared bucket is keyed by the tenant header.
+	return ("xero", _as_str(headers.get("xero-tenant-id")))
+
+
 def _xero_api_json(
 	config: dict[str, Any], method: str, path: str, payload: dict[str, Any] | None = None
 ) -> dict[str, Any]:
@@ -1137,11 +1531,11 @@ def _xero_api_json(
 		frappe.throw("Xero calls are unavailable (requests library missing).")
 	headers = _xero_api_headers(config)
 	url = f"https://api.xero.com/api.xro/2.0/{path.lstrip('/')}"
-	resp = requests.request(method.upper(), url, headers=headers, json=payload or {}, timeout=30)
+	resp = http_client.request(method.upper(), url, headers=headers, json=payload or {}, timeout=30, throttle=_xero_throttle(headers))
 	if _xero_is_auth_unsuccessful(resp):
 		config = _xero_refresh_and_reselect_tenant(config)
 		headers = _xero_api_headers(config)
-		resp = requests.request(method.upper(), url, headers=headers, json=payload or {}, timeout=30)
+		resp = http_client.request(method.upper(), url, headers=headers, json=payload or {}, timeout=30, throttle=_xero_throttle(headers))
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		if _xero_is_auth_unsuccessful(resp):
@@ -1413,16 +1807,17 @@ def _default_bank_account(company: str) -> str:
 	return _as_str(row[0].get("name")) if row else ""
 
 
-def _upsert_payment_entry_from_xero_payment(payment: dict[str, Any]) -> str:
+def _upsert_payment_entry_from_xero_payment(payment: dict[str, Any], lookup: dict[str, Any] | None = None) -> str:
 	payment_id = _as_str(payment.get("PaymentID"))
 	if not payment_id:
 		return ""
-	if frappe.db.exists("Payment Entry", {"xero_payment_id": payment_id}):
-		return _as_str(frappe.db.get_value("Payment Entry", {"xero_payment_id": payment_id}, "name"))
+	existing = _lookup_name(lookup, "Payment Entry", "xero_payment_id", payment_id)
+	if existing:
+		return existing
 
 	invoice = payment.get("Invoice") if isinstance(payment.get("Invoice"), dict) else {}
 	invoice_id = _as_str(invoice.get("InvoiceID"))
-	invoice_name = _as_str(frappe.db.get_value("Sales Invoice", {"xero_invoice_id": invoice_id}, "name")) if invoice_id else ""
+	invoice_name = _lookup_name(lookup, "Sales Invoice", "xero_invoice_id", invoice_id)
 	if not invoice_name:
 		return ""
 	invoice_doc = frappe.get_doc("Sales Invoice", invoice_name)
@@ -1476,10 +1871,11 @@ def _upsert_payment_entry_from_xero_payment(payment: dict[str, Any]) -> str:
 	doc.accounting_sync_error = ""
 	doc.flags.ignore_permissions = True
 	doc.insert(ignore_permissions=True)
+	_remember_lookup(lookup, doc)
 	return _as_str(doc.name)
 
 
-def _upsert_item_from_xero_item(item_row: dict[str, Any]) -> str:
+def _upsert_item_from_xero_item(item_row: dict[str, Any], lookup: dict[str, Any] | None = None) -> str:
 	xero_item_id = _as_str(item_row.get("ItemID"))
 	xero_item_code = _as_str(item_row.get("Code"))
 	name = _as_str(item_row.get("Name")) or xero_item_code
@@ -1488,13 +1884,11 @@ def _upsert_item_from_xero_item(item_row: dict[str, Any]) -> str:
 	if not xero_item_id and not xero_item_code:
 		return ""
 
-	item_name = ""
-	if xero_item_id and frappe.db.exists("Item", {"xero_item_id": xero_item_id}):
-		item_name = _as_str(frappe.db.get_value("Item", {"xero_item_id": xero_item_id}, "name"))
-	elif xero_item_code and frappe.db.exists("Item", xero_item_code):
-		item_name = xero_item_code
-	elif xero_item_code and frappe.db.exists("Item", {"item_code": xero_item_code}):
-		item_name = _as_str(frappe.db.get_value("Item", {"item_code": xero_item_code}, "name"))
+	item_name = (
+		_lookup_name(lookup, "Item", "xero_item_id", xero_item_id)
+		or _lookup_name(lookup, "Item", "name", xero_item_code)
+		or _lookup_name(lookup, "Item", "item_code", xero_item_code)
+	)
 
 	if item_name:
 		doc = frappe.get_doc("Item", item_name)
@@ -1523,32 +1917,41 @@ def _upsert_item_from_xero_item(item_row: dict[str, Any]) -> str:
 	doc.accounting_sync_error = ""
 	doc.flags.ignore_permissions = True
 	doc.save(ignore_permissions=True)
+	_remember_lookup(lookup, doc)
 	return _as_str(doc.name)
 
 
-def _upsert_sales_invoice_from_xero_invoice(invoice: dict[str, Any]) -> str:
+def _upsert_sales_invoice_from_xero_invoice(invoice: dict[str, Any], lookup: dict[str, Any] | None = None) -> str:
 	invoice_id = _as_str(invoice.get("InvoiceID"))
 	invoice_number = _as_str(invoice.get("InvoiceNumber"))
 	contact = invoice.get("Contact") if isinstance(invoice.get("Contact"), dict) else {}
 	contact_id = _as_str(contact.get("ContactID"))
-	customer = ""
-	if contact_id and frappe.db.exists("Customer", {"xero_contact_id": contact_id}):
-		customer = _as_str(frappe.db.get_value("Customer", {"xero_contact_id": contact_id}, "name"))
+	customer = _lookup_name(lookup, "Customer", "xero_contact_id", contact_id)
 	if not customer:
-		customer = _upsert_customer_from_xero_contact(contact if isinstance(contact, dict) else {})
+		customer = _upsert_customer_from_xero_contact(contact if isinstance(contact, dict) else {}, lookup)
 	if not customer:
 		return ""
 
-	doc_name = ""
-	if invoice_id and frappe.db.exists("Sales Invoice", {"xero_invoice_id": invoice_id}):
-		doc_name = _as_str(frappe.db.get_value("Sales Invoice", {"xero_invoice_id": invoice_id}, "name"))
-	elif invoice_number and frappe.db.exists("Sales Invoice", {"bill_no": invoice_number}):
-		doc_name = _as_str(frappe.db.get_value("Sales Invoice", {"bill_no": invoice_number}, "name"))
+	doc_name = _lookup_name(lookup, "Sales Invoice", "xero_invoice_id", invoice_id) or _lookup_name(
+		lookup, "Sales Invoice", "bill_no", invoice_number
+	)
 
 	total = float(invoice.get("Total") or 0)
 	date_val = _as_str(invoice.get("DateString") or invoice.get("Date") or frappe.utils.nowdate())[:10]
 	due_val = _as_str(invoice.get("DueDateString") or invoice.get("DueDate") or date_val)[:10]
 	erp_items = _xero_invoice_lines_to_erp_items(invoice, total)
+	fingerprint = _accounting_fingerprint(
+		{
+			"id": invoice_id,
+			"number": invoice_number,
+			"customer": customer,
+			"date": date_val,
+			"due": due_val,
+			"items": erp_items,
+		}
+	)
+	if _skip_unchanged(lookup, "Sales Invoice", doc_name, fingerprint):
+		return doc_name
 
 	if doc_name:
 		doc = frappe.get_doc("Sales Invoice", doc_name)
@@ -1566,11 +1969,13 @@ def _upsert_sales_invoice_from_xero_invoice(invoice: dict[str, Any]) -> str:
 		doc.accounting_provider = "Xero"
 		doc.accounting_external_id = invoice_id
 		doc.accounting_sync_error = ""
+		doc.accounting_sync_hash = fingerprint
 		doc.items = []
 		for row in erp_items:
 			doc.append("items", row)
 		doc.flags.ignore_permissions = True
 		doc.save(ignore_permissions=True)
+		_remember_lookup(lookup, doc)
 		return _as_str(doc.name)
 
 	doc = frappe.new_doc("Sales Invoice")
@@ -1586,10 +1991,12 @@ def _upsert_sales_invoice_from_xero_invoice(invoice: dict[str, Any]) -> str:
 	doc.accounting_provider = "Xero"
 	doc.accounting_external_id = invoice_id
 	doc.accounting_sync_error = ""
+	doc.accounting_sync_hash = fingerprint
 	for row in erp_items:
 		doc.append("items", row)
 	doc.flags.ignore_permissions = True
 	doc.insert(ignore_permissions=True)
+	_remember_lookup(lookup, doc)
 	return _as_str(doc.name)
 
 
@@ -1647,7 +2054,7 @@ def _google_http_get(url: str, params: dict[str, Any]) -> dict[str, Any]:
 	query = dict(params or {})
 	query["key"] = key
 	try:
-		res = requests.get(url, params=query, timeout=12)
+		res = http_client.get(url, params=query, timeout=12)
 		res.raise_for_status()
 		payload = res.json() if hasattr(res, "json") else {}
 	except Exception as exc:
@@ -1747,7 +2154,7 @@ def _firelink_http(
 	if headers:
 		req_headers.update(headers)
 	try:
-		resp = requests.request(
+		resp = http_client.request(
 			method=method.upper(),
 			url=url,
 			params=params or None,
@@ -1808,6 +2215,125 @@ def _pick_existing_field(field_names: set[str], candidates: tuple[str, ...]) ->
 	return ""
 
 
+def _address_field_mapping(field_names: set[str]) -> dict[str, str]:
+	line1_field = _pick_existing_field(
+		field_names,
+		(
+			"address_line1",
+			"fl_address_line1",
+			"line1",
+			"street_address",
+			"address",
+			"street",
+			"street1",
+			"address1",
+		),
+	)
+	if not line1_field:
+		return {}
+	return {
+		"title": _pick_existing_field(field_names, ("address_title", "fl_address_title", "title", "name")),
+		"line1": line1_field,
+		"line2": _pick_existing_field(
+			field_names, ("address_line2", "fl_address_line2", "line2", "street2", "address2")
+		),
+		"city": _pick_existing_field(field_names, ("city", "suburb", "town")),
+		"state": _pick_existing_field(field_names, ("state", "province")),
+		"post": _pick_existing_field(field_names, ("pincode", "postcode", "postal_code", "zip")),
+		"country": _pick_existing_field(field_names, ("country",)),
+		"place_id": _pick_existing_field(
+			field_names, ("google_place_id", "place_id", "google_places_id", "google_placeid")
+		),
+	}
+
+
+def _address_match_key(line1: Any, pincode: Any) -> str:
+	key = _address_key(line1)
+	return f"{key}|{_norm(pincode)}" if key else ""
+
+
+def _address_lookup_plan(
+	doctype: str,
+	mapping: dict[str, str],
+	field_names: set[str],
+	incoming: dict[str, Any],
+	fuzzy_title: bool = False,
+) -> list[tuple[str, list[list[Any]]]]:
+	"""Candidate queries to try in order, as (filters|or_filters, terms).
+
+	Doctypes carrying the indexed address_key columns are searched by exact key
+	only: _strong_match needs equal line1 keys, so a LIKE scan cannot find a
+	match the key lookup missed. The wildcard search is kept for doctypes (or
+	remote benches) that have not been migrated yet.
+	"""
+	plan: list[tuple[str, list[list[Any]]]] = []
+	if mapping.get("place_id") and incoming.get("place_id"):
+		plan.append(("filters", [[doctype, mapping["place_id"], "=", incoming["place_id"]]]))
+	key = _address_key(incoming.get("address_line1"))
+	if key and ADDRESS_KEY_FIELD in field_names:
+		if ADDRESS_MATCH_KEY_FIELD in field_names and incoming.get("pincode"):
+			match_key = _address_match_key(incoming.get("address_line1"), incoming.get("pincode"))
+			plan.append(("filters", [[doctype, ADDRESS_MATCH_KEY_FIELD, "=", match_key]]))
+		plan.append(("filters", [[doctype, ADDRESS_KEY_FIELD, "=", key]]))
+		return plan
+	fuzzy: list[list[Any]] = [[doctype, mapping["line1"], "like", f"%{incoming['address_line1']}%"]]
+	if mapping.get("city") and incoming.get("city"):
+		fuzzy.append([doctype, mapping["city"], "like", f"%{incoming['city']}%"])
+	if fuzzy_title and mapping.get("title") and incoming.get("address_title"):
+		fuzzy.append([doctype, mapping["title"], "like", f"%{incoming['address_title']}%"])
+	plan.append(("or_filters", fuzzy))
+	return plan
+
+
+def _ensure_address_key_fields() -> None:
+	fields: dict[str, list[dict[str, Any]]] = {}
+	for doctype in FIRELINK_ADDRESS_DOCTYPES:
+		if not frappe.db.exists("DocType", doctype):
+			continue
+		mapping = _address_field_mapping({d.fieldname for d in frappe.get_meta(doctype).fields if d.fieldname})
+		if not mapping:
+			continue
+		fields[doctype] = [
+			{
+				"fieldname": ADDRESS_KEY_FIELD,
+				"label": "Address Key",
+				"fieldtype": "Data",
+				"insert_after": mapping["line1"],
+				"search_index": 1,
+				"hidden": 1,
+				"read_only": 1,
+				"no_copy": 1,
+			},
+			{
+				"fieldname": ADDRESS_MATCH_KEY_FIELD,
+				"label": "Address Match Key",
+				"fieldtype": "Data",
+				"insert_after": ADDRESS_KEY_FIELD,
+				"search_index": 1,
+				"hidden": 1,
+				"read_only": 1,
+				"no_copy": 1,
+			},
+		]
+	if fields:
+		create_custom_fields(fields, update=True)
+
+
+def set_address_keys(doc, method=None):
+	"""Doc event (validate): keep the indexed address_key / address_match_key columns current."""
+	meta = frappe.get_meta(doc.doctype)
+	if not meta.has_field(ADDRESS_KEY_FIELD):
+		return
+	mapping = _address_field_mapping({d.fieldname for d in meta.fields if d.fieldname})
+	if not mapping:
+		return
+	line1 = doc.get(mapping["line1"])
+	doc.set(ADDRESS_KEY_FIELD, _address_key(line1) or None)
+	if meta.has_field(ADDRESS_MATCH_KEY_FIELD):
+		pincode = doc.get(mapping["post"]) if mapping["post"] else ""
+		doc.set(ADDRESS_MATCH_KEY_FIELD, _address_match_key(line1, pincode) or None)
+
+
 def _strong_match(existing: dict[str, Any], incoming: dict[str, Any]) -> bool:
 	row_line1 = _address_key(existing.get("address_line1"))
 	in_line1 = _address_key(incoming.get("address_line1"))
@@ -1895,44 +2421,10 @@ def _resolve_or_create_address_on_current_site(incoming: dict[str, Any]) -> dict
 			last_error = _as_str(exc)
 			continue
 
-		line1_field = _pick_existing_field(
-			field_names,
-			(
-				"address_line1",
-				"fl_address_line1",
-				"line1",
-				"street_address",
-				"address",
-				"street",
-				"street1",
-				"address1",
-			),
-		)
-		if not line1_field:
+		mapping = _address_field_mapping(field_names)
+		if not mapping:
 			last_error = f"{doctype} missing line1 field"
 			continue
-		mapping = {
-			"title": _pick_existing_field(
-				field_names, ("address_title", "fl_address_title", "title", "name")
-			),
-			"line1": line1_field,
-			"line2": _pick_existing_field(
-				field_names, ("address_line2", "fl_address_line2", "line2", "street2", "address2")
-			),
-			"city": _pick_existing_field(field_names, ("city", "suburb", "town")),
-			"state": _pick_existing_field(field_names, ("state", "province")),
-			"post": _pick_existing_field(field_names, ("pincode", "postcode", "postal_code", "zip")),
-			"country": _pick_existing_field(field_names, ("country",)),
-			"place_id": _pick_existing_field(
-				field_names, ("google_place_id", "place_id", "google_places_id", "google_placeid")
-			),
-		}
-
-		or_filters: list[list[Any]] = [[doctype, line1_field, "like", f"%{incoming['address_line1']}%"]]
-		if mapping["place_id"] and incoming.get("place_id"):
-			or_filters.insert(0, [doctype, mapping["place_id"], "=", incoming["place_id"]])
-		if mapping["city"] and incoming.get("city"):
-			or_filters.append([doctype, mapping["city"], "like", f"%{incoming['city']}%"])
 
 		select_fields = list(
 			dict.fromkeys(
@@ -1953,16 +2445,17 @@ def _resolve_or_create_address_on_current_site(incoming: dict[str, Any]) -> dict
 				]
 			)
 		)
-		rows = frappe.get_all(doctype, fields=select_fields, or_filters=or_filters, limit_page_length=50)
-		for row in rows:
-			normalized = _normalize_remote_row(row, mapping)
-			if _strong_match(normalized, incoming):
-				return {
-					"created": False,
-					"firelink_doctype": doctype,
-					"firelink_address_id": normalized.get("name"),
-					"address": normalized,
-				}
+		for kind, terms in _address_lookup_plan(doctype, mapping, field_names, incoming):
+			rows = frappe.get_all(doctype, fields=select_fields, limit_page_length=50, **{kind: terms})
+			for row in rows:
+				normalized = _normalize_remote_row(row, mapping)
+				if _strong_match(normalized, incoming):
+					return {
+						"created": False,
+						"firelink_doctype": doctype,
+						"firelink_address_id": normalized.get("name"),
+						"address": normalized,
+					}
 
 		doc = frappe.new_doc(doctype)
 		doc.set(mapping["line1"], incoming["address_line1"])
@@ -2171,6 +2664,7 @@ def xero_receive_tokens_local(**kwargs):
 	row["xeroTokenExpiresAt"] = _as_str(kwargs.get("xero_token_expires_at"))
 	row["xeroConnectedAt"] = _as_str(kwargs.get("xero_connected_at")) or _utc_iso_now()
 	row["xeroState"] = ""
+	_clear_oauth_token_cache("Xero")
 	connections = kwargs.get("xero_connections")
 	if isinstance(connections, list):
 		row["xeroConnectionsJson"] = json.dumps(connections)
@@ -2329,7 +2823,7 @@ def xero_oauth_callback(**kwargs):
 		"Accept": "application/json",
 	}
 	form = {"grant_type": "authorization_code", "code": code, "redirect_uri": _xero_redirect_uri(row)}
-	resp = requests.post(token_url, headers=headers, data=form, timeout=20)
+	resp = http_client.post(token_url, headers=headers, data=form, timeout=20)
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		frappe.throw(f"Xero token exchange failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -2346,6 +2840,7 @@ def xero_oauth_callback(**kwargs):
 	).isoformat()
 	row["xeroConnectedAt"] = _utc_iso_now()
 	row["xeroState"] = ""
+	_clear_oauth_token_cache("Xero")
 
 	connections = _xero_fetch_connections(row)
 	if not connections:
@@ -2395,6 +2890,7 @@ def xero_disconnect(**kwargs):
 	row["xeroTokenExpiresAt"] = ""
 	row["xeroConnectedAt"] = ""
 	row["xeroState"] = ""
+	_clear_oauth_token_cache("Xero")
 	row["xeroConnectionsJson"] = "[]"
 	row["tenantId"] = ""
 	row["enabled"] = False
@@ -2485,6 +2981,7 @@ def quickbooks_receive_tokens_local(**kwargs):
 	row["quickbooksTokenExpiresAt"] = _as_str(kwargs.get("quickbooks_token_expires_at"))
 	row["quickbooksConnectedAt"] = _as_str(kwargs.get("quickbooks_connected_at")) or _utc_iso_now()
 	row["quickbooksState"] = ""
+	_clear_oauth_token_cache("QuickBooks")
 	row["quickbooksRealmId"] = _as_str(kwargs.get("realm_id") or kwargs.get("quickbooks_realm_id"))
 	if _as_str(row.get("quickbooksRealmId")):
 		row["tenantId"] = _as_str(row.get("quickbooksRealmId"))
@@ -2635,7 +3132,7 @@ def quickbooks_oauth_callback(**kwargs):
 		"Accept": "application/json",
 	}
 	form = {"grant_type": "authorization_code", "code": code, "redirect_uri": _quickbooks_redirect_uri(row)}
-	resp = requests.post(token_url, headers=headers, data=form, timeout=20)
+	resp = http_client.post(token_url, headers=headers, data=form, timeout=20)
 	if not resp.ok:
 		detail = _as_str(resp.text)
 		frappe.throw(f"QuickBooks token exchange failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -2652,6 +3149,7 @@ def quickbooks_oauth_callback(**kwargs):
 	).isoformat()
 	row["quickbooksConnectedAt"] = _utc_iso_now()
 	row["quickbooksState"] = ""
+	_clear_oauth_token_cache("QuickBooks")
 	row["quickbooksRealmId"] = realm_id
 	if realm_id:
 		row["tenantId"] = realm_id
@@ -2683,7 +3181,7 @@ def _quickbooks_remote_disconnect(config: dict[str, Any]) -> dict[str, Any]:
 	if not token or not client_id or not client_secret:
 		return {"ok": True, "message": "No QuickBooks token to revoke."}
 	try:
-		resp = requests.post(
+		resp = http_client.post(
 			"https://developer.api.intuit.com/v2/oauth2/tokens/revoke",
 			headers={
 				"Authorization": f"Basic {_xero_basic_auth(client_id, client_secret)}",
@@ -2721,6 +3219,7 @@ def quickbooks_disconnect(**kwargs):
 	row["quickbooksTokenExpiresAt"] = ""
 	row["quickbooksConnectedAt"] = ""
 	row["quickbooksState"] = ""
+	_clear_oauth_token_cache("QuickBooks")
 	row["quickbooksRealmId"] = ""
 	row["tenantId"] = ""
 	row["enabled"] = False
@@ -2798,7 +3297,7 @@ def test_connection(**kwargs):
 		return f"{provider}: configuration saved. Network test skipped (requests not available)."
 
 	try:
-		response = requests.get(test_url, timeout=8, allow_redirects=True)
+		response = http_client.get(test_url, timeout=8, allow_redirects=True)
 		status = int(response.status_code)
 		if 200 <= status < 500:
 			if not client_id or not client_secret:
@@ -2821,20 +3320,14 @@ def _quickbooks_refresh_if_needed(row: dict[str, Any]) -> dict[str, Any]:
 	if requests is None:
 		return row
 	row, _ = _quickbooks_apply_site_config_credentials(row)
-	expires_raw = _as_str(row.get("quickbooksTokenExpiresAt"))
-	access_token = _as_str(row.get("quickbooksAccessToken"))
+	if not _as_str(row.get("quickbooksAccessToken")):
+		# Expiry alone can't tell a missing token apart from a fresh one.
+		row["quickbooksTokenExpiresAt"] = ""
+	return _single_flight_refresh("QuickBooks", row, _quickbooks_refresh_token)
+
+
+def _quickbooks_refresh_token(row: dict[str, Any]) -> dict[str, Any]:
 	refresh_token = _as_str(row.get("quickbooksRefreshToken"))
-	if access_token and expires_raw:
-		try:
-			expires = datetime.fromisoformat(expires_raw.replace("Z", "+00:00"))
-			if expires.tzinfo is None:
-				expires = expires.replace(tzinfo=timezone.utc)
-			if expires > datetime.now(timezone.utc) + timedelta(minutes=2):
-				return row
-		except Exception:
-			pass
-	if not refresh_token:
-		return row
 	client_id = _as_str(row.get("clientId"))
 	client_secret = _as_str(row.get("clientSecret"))
 	token_url = _as_str(row.get("tokenUrl")) or _as_str(PROVIDER_DEFAULTS["QuickBooks"].get("tokenUrl"))
@@ -2842,7 +3335,7 @@ def _quickbooks_refresh_if_needed(row: dict[str, Any]) -> dict[str, Any]:
 		return row
 	basic = base64.b64encode(f"{client_id}:{client_secret}".encode("utf-8")).decode("ascii")
 	headers = {"Authorization": f"Basic {basic}", "Accept": "application/json"}
-	resp = requests.post(token_url, headers=headers, data={"grant_type": "refresh_token", "refresh_token": refresh_token}, timeout=25)
+	resp = http_client.post(token_url, headers=headers, data={"grant_type": "refresh_token", "refresh_token": refresh_token}, timeout=25)
 	if int(resp.status_code) >= 300:
 		return row
 	data = resp.json() if hasattr(resp, "json") else {}
@@ -2855,7 +3348,6 @@ def _quickbooks_refresh_if_needed(row: dict[str, Any]) -> dict[str, Any]:
 		row["quickbooksRefreshToken"] = new_refresh
 	if expires_in > 0:
 		row["quickbooksTokenExpiresAt"] = (datetime.now(timezone.utc) + timedelta(seconds=expires_in)).isoformat()
-	_persist_integration_record("QuickBooks", row)
 	return row
 
 
@@ -2886,7 +3378,7 @@ def _quickbooks_query_entity(row: dict[str, Any], entity: str, limit: int = 200)
 	last_detail = ""
 	for base in base_candidates:
 		url = f"{base}/v3/company/{realm_id}/query"
-		resp = requests.get(url, headers=headers, params={"query": query, "minorversion": "75"}, timeout=30)
+		resp = http_client.get(url, headers=headers, params={"query": query, "minorversion": "75"}, timeout=30, throttle=("quickbooks", realm_id))
 		status = int(resp.status_code)
 		if status < 300:
 			if base != configured_base:
@@ -2937,7 +3429,7 @@ def _quickbooks_find_customer_by_display_name(row: dict[str, Any], display_name:
 	headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
 	for base in base_candidates:
 		url = f"{base}/v3/company/{realm_id}/query"
-		resp = requests.get(url, headers=headers, params={"query": query, "minorversion": "75"}, timeout=30)
+		resp = http_client.get(url, headers=headers, params={"query": query, "minorversion": "75"}, timeout=30, throttle=("quickbooks", realm_id))
 		if int(resp.status_code) < 300:
 			if base != configured_base:
 				row["baseUrl"] = base
@@ -3004,7 +3496,7 @@ def _quickbooks_push_customer(row: dict[str, Any], reference_name: str, document
 			payload["SyncToken"] = _as_str(existing.get("SyncToken"))
 			payload["sparse"] = True
 			url = f"{url}?operation=update"
-		resp = requests.post(url, headers=headers, json=payload, params={"minorversion": "75"}, timeout=30)
+		resp = http_client.post(url, headers=headers, json=payload, params={"minorversion": "75"}, timeout=30, throttle=("quickbooks", realm_id))
 		status = int(resp.status_code)
 		if status < 300:
 			if base != configured_base:
@@ -3140,88 +3632,110 @@ def _quickbooks_invoice_to_xero_invoice(row: dict[str, Any]) -> dict[str, Any]:
 	}
 
 
-def _quickbooks_upsert_customer_rows(rows: list[dict[str, Any]]) -> tuple[int, int, list[str]]:
+def _quickbooks_upsert_customer_rows(rows: list[dict[str, Any]]) -> tuple[int, int, int, list[str]]:
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup(
+		"Customer", records=_converted_records(rows, _quickbooks_customer_to_xero_contact)
+	)
 	for raw in rows:
 		try:
 			contact = _quickbooks_customer_to_xero_contact(raw if isinstance(raw, dict) else {})
 			cid = _as_str(contact.get("ContactID"))
-			existed = bool(cid and frappe.db.exists("Customer", {"xero_contact_id": cid}))
-			name = _upsert_customer_from_xero_contact(contact)
+			existed = bool(_lookup_name(lookup, "Customer", "xero_contact_id", cid))
+			name = _upsert_customer_from_xero_contact(contact, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Customer", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
-	return created, updated, errors[:20]
+	return created, updated, unchanged, errors[:20]
 
 
-def _quickbooks_upsert_supplier_rows(rows: list[dict[str, Any]]) -> tuple[int, int, list[str]]:
+def _quickbooks_upsert_supplier_rows(rows: list[dict[str, Any]]) -> tuple[int, int, int, list[str]]:
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup(
+		"Supplier", records=_converted_records(rows, _quickbooks_vendor_to_xero_contact)
+	)
 	for raw in rows:
 		try:
 			contact = _quickbooks_vendor_to_xero_contact(raw if isinstance(raw, dict) else {})
 			cid = _as_str(contact.get("ContactID"))
-			existed = bool(cid and frappe.db.exists("Supplier", {"xero_contact_id": cid}))
-			name = _upsert_supplier_from_xero_contact(contact)
+			existed = bool(_lookup_name(lookup, "Supplier", "xero_contact_id", cid))
+			name = _upsert_supplier_from_xero_contact(contact, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Supplier", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
-	return created, updated, errors[:20]
+	return created, updated, unchanged, errors[:20]
 
 
-def _quickbooks_upsert_item_rows(rows: list[dict[str, Any]]) -> tuple[int, int, list[str]]:
+def _quickbooks_upsert_item_rows(rows: list[dict[str, Any]]) -> tuple[int, int, int, list[str]]:
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Item", records=_converted_records(rows, _quickbooks_item_to_xero_item))
 	for raw in rows:
 		try:
 			item = _quickbooks_item_to_xero_item(raw if isinstance(raw, dict) else {})
 			iid = _as_str(item.get("ItemID"))
-			existed = bool(iid and frappe.db.exists("Item", {"xero_item_id": iid}))
-			name = _upsert_item_from_xero_item(item)
+			existed = bool(_lookup_name(lookup, "Item", "xero_item_id", iid))
+			name = _upsert_item_from_xero_item(item, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Item", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
-	return created, updated, errors[:20]
+	return created, updated, unchanged, errors[:20]
 
 
-def _quickbooks_upsert_invoice_rows(rows: list[dict[str, Any]]) -> tuple[int, int, list[str]]:
+def _quickbooks_upsert_invoice_rows(rows: list[dict[str, Any]]) -> tuple[int, int, int, list[str]]:
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup(
+		"Sales Invoice", "Customer", records=_converted_records(rows, _quickbooks_invoice_to_xero_invoice)
+	)
 	for raw in rows:
 		try:
 			inv = _quickbooks_invoice_to_xero_invoice(raw if isinstance(raw, dict) else {})
 			iid = _as_str(inv.get("InvoiceID"))
-			existed = bool(iid and frappe.db.exists("Sales Invoice", {"xero_invoice_id": iid}))
-			name = _upsert_sales_invoice_from_xero_invoice(inv)
+			existed = bool(_lookup_name(lookup, "Sales Invoice", "xero_invoice_id", iid))
+			name = _upsert_sales_invoice_from_xero_invoice(inv, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Sales Invoice", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
-	return created, updated, errors[:20]
+	return created, updated, unchanged, errors[:20]
 
 def _myob_company_uri(row: dict[str, Any]) -> str:
 	# MYOB can store company-file URI directly in tenantId.
@@ -3249,7 +3763,7 @@ def _myob_list_entity(row: dict[str, Any], endpoint: str) -> list[dict[str, Any]
 		"x-myobapi-version": "v2",
 		"Accept": "application/json",
 	}
-	resp = requests.get(url, headers=headers, timeout=30)
+	resp = http_client.get(url, headers=headers, timeout=30)
 	if int(resp.status_code) >= 300:
 		detail = _as_str(getattr(resp, "text", ""))
 		frappe.throw(f"MYOB query failed ({resp.status_code}): {detail}", frappe.ValidationError)
@@ -3442,14 +3956,15 @@ def sync_customer(**kwargs):
 	if provider == "QuickBooks":
 		row = _integration_record(provider)
 		rows = _quickbooks_query_entity(row, "Customer")
-		created, updated, errors = _quickbooks_upsert_customer_rows(rows)
+		created, updated, unchanged, errors = _quickbooks_upsert_customer_rows(rows)
 		frappe.db.commit()
-		return {"ok": True, "provider": provider, "entity": "customer", "count": len(rows), "created": created, "updated": updated, "errors": errors, "message": f"{provider} customer sync complete. {created} created, {updated} updated, {len(errors)} failed."}
+		return {"ok": True, "provider": provider, "entity": "customer", "count": len(rows), "created": created, "updated": updated, "unchanged": unchanged, "errors": errors, "message": f"{provider} customer sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed."}
 	if provider == "MYOB":
 		row = _integration_record(provider)
 		return _provider_manual_sync_snapshot(provider, "customer", row)
 
 	_ensure_customer_xero_fields()
+	_ensure_accounting_sync_meta_fields()
 	row = _integration_record(provider)
 	row = _xero_apply_site_config_credentials(row)[0]
 	row = _xero_refresh_if_needed(row)
@@ -3459,10 +3974,13 @@ def sync_customer(**kwargs):
 		first = connections[0] if isinstance(connections[0], dict) else {}
 		row["tenantId"] = _as_str(first.get("tenantId"))
 
-	contacts = _xero_fetch_contacts(row)
+	since = "" if _as_bool(kwargs.get("full_sync")) else _get_sync_checkpoint(provider, "customer")
+	contacts = _xero_fetch_contacts(row, modified_since=since)
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Customer", records=contacts)
 
 	for contact in contacts:
 		try:
@@ -3471,17 +3989,21 @@ def sync_customer(**kwargs):
 			if not _xero_contact_matches_entity(contact, "customer"):
 				continue
 			contact_id = _as_str(contact.get("ContactID"))
-			existed = bool(contact_id and frappe.db.exists("Customer", {"xero_contact_id": contact_id}))
-			name = _upsert_customer_from_xero_contact(contact)
+			existed = bool(_lookup_name(lookup, "Customer", "xero_contact_id", contact_id))
+			name = _upsert_customer_from_xero_contact(contact, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Customer", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
 
+	if not errors:
+		_save_sync_checkpoint(provider, "customer", _xero_high_water_mark(contacts, since), len(contacts))
 	_persist_integration_record(provider, row)
 	frappe.db.commit()
 	return {
@@ -3489,10 +4011,12 @@ def sync_customer(**kwargs):
 		"provider": provider,
 		"entity": "customer",
 		"count": len(contacts),
+		"modified_since": since,
 		"created": created,
 		"updated": updated,
+		"unchanged": unchanged,
 		"errors": errors[:20],
-		"message": f"{provider} customer sync complete. {created} created, {updated} updated, {len(errors)} failed.",
+		"message": f"{provider} customer sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed.",
 	}
 
 
@@ -3504,14 +4028,15 @@ def sync_supplier(**kwargs):
 	if provider == "QuickBooks":
 		row = _integration_record(provider)
 		rows = _quickbooks_query_entity(row, "Vendor")
-		created, updated, errors = _quickbooks_upsert_supplier_rows(rows)
+		created, updated, unchanged, errors = _quickbooks_upsert_supplier_rows(rows)
 		frappe.db.commit()
-		return {"ok": True, "provider": provider, "entity": "supplier", "count": len(rows), "created": created, "updated": updated, "errors": errors, "message": f"{provider} supplier sync complete. {created} created, {updated} updated, {len(errors)} failed."}
+		return {"ok": True, "provider": provider, "entity": "supplier", "count": len(rows), "created": created, "updated": updated, "unchanged": unchanged, "errors": errors, "message": f"{provider} supplier sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed."}
 	if provider == "MYOB":
 		row = _integration_record(provider)
 		return _provider_manual_sync_snapshot(provider, "supplier", row)
 
 	_ensure_supplier_xero_fields()
+	_ensure_accounting_sync_meta_fields()
 	row = _integration_record(provider)
 	row = _xero_apply_site_config_credentials(row)[0]
 	row = _xero_refresh_if_needed(row)
@@ -3521,10 +4046,13 @@ def sync_supplier(**kwargs):
 		first = connections[0] if isinstance(connections[0], dict) else {}
 		row["tenantId"] = _as_str(first.get("tenantId"))
 
-	contacts = _xero_fetch_contacts(row)
+	since = "" if _as_bool(kwargs.get("full_sync")) else _get_sync_checkpoint(provider, "supplier")
+	contacts = _xero_fetch_contacts(row, modified_since=since)
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Supplier", records=contacts)
 	for contact in contacts:
 		try:
 			if not isinstance(contact, dict):
@@ -3532,17 +4060,21 @@ def sync_supplier(**kwargs):
 			if not _xero_contact_matches_entity(contact, "supplier"):
 				continue
 			contact_id = _as_str(contact.get("ContactID"))
-			existed = bool(contact_id and frappe.db.exists("Supplier", {"xero_contact_id": contact_id}))
-			name = _upsert_supplier_from_xero_contact(contact)
+			existed = bool(_lookup_name(lookup, "Supplier", "xero_contact_id", contact_id))
+			name = _upsert_supplier_from_xero_contact(contact, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Supplier", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
 
+	if not errors:
+		_save_sync_checkpoint(provider, "supplier", _xero_high_water_mark(contacts, since), len(contacts))
 	_persist_integration_record(provider, row)
 	frappe.db.commit()
 	return {
@@ -3550,10 +4082,12 @@ def sync_supplier(**kwargs):
 		"provider": provider,
 		"entity": "supplier",
 		"count": len(contacts),
+		"modified_since": since,
 		"created": created,
 		"updated": updated,
+		"unchanged": unchanged,
 		"errors": errors[:20],
-		"message": f"{provider} supplier sync complete. {created} created, {updated} updated, {len(errors)} failed.",
+		"message": f"{provider} supplier sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed.",
 	}
 
 
@@ -3565,9 +4099,9 @@ def sync_invoice(**kwargs):
 	if provider == "QuickBooks":
 		row = _integration_record(provider)
 		rows = _quickbooks_query_entity(row, "Invoice")
-		created, updated, errors = _quickbooks_upsert_invoice_rows(rows)
+		created, updated, unchanged, errors = _quickbooks_upsert_invoice_rows(rows)
 		frappe.db.commit()
-		return {"ok": True, "provider": provider, "entity": "invoice", "count": len(rows), "created": created, "updated": updated, "errors": errors, "message": f"{provider} invoice sync complete. {created} created, {updated} updated, {len(errors)} failed."}
+		return {"ok": True, "provider": provider, "entity": "invoice", "count": len(rows), "created": created, "updated": updated, "unchanged": unchanged, "errors": errors, "message": f"{provider} invoice sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed."}
 	if provider == "MYOB":
 		row = _integration_record(provider)
 		return _provider_manual_sync_snapshot(provider, "invoice", row)
@@ -3584,26 +4118,33 @@ def sync_invoice(**kwargs):
 		first = connections[0] if isinstance(connections[0], dict) else {}
 		row["tenantId"] = _as_str(first.get("tenantId"))
 
-	invoices = _xero_fetch_invoices(row)
+	since = "" if _as_bool(kwargs.get("full_sync")) else _get_sync_checkpoint(provider, "invoice")
+	invoices = _xero_fetch_invoices(row, modified_since=since)
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Sales Invoice", "Customer", records=invoices)
 	for invoice in invoices:
 		try:
 			if not isinstance(invoice, dict):
 				continue
 			invoice_id = _as_str(invoice.get("InvoiceID"))
-			existed = bool(invoice_id and frappe.db.exists("Sales Invoice", {"xero_invoice_id": invoice_id}))
-			name = _upsert_sales_invoice_from_xero_invoice(invoice)
+			existed = bool(_lookup_name(lookup, "Sales Invoice", "xero_invoice_id", invoice_id))
+			name = _upsert_sales_invoice_from_xero_invoice(invoice, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Sales Invoice", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
 
+	if not errors:
+		_save_sync_checkpoint(provider, "invoice", _xero_high_water_mark(invoices, since), len(invoices))
 	_persist_integration_record(provider, row)
 	frappe.db.commit()
 	return {
@@ -3611,10 +4152,12 @@ def sync_invoice(**kwargs):
 		"provider": provider,
 		"entity": "invoice",
 		"count": len(invoices),
+		"modified_since": since,
 		"created": created,
 		"updated": updated,
+		"unchanged": unchanged,
 		"errors": errors[:20],
-		"message": f"{provider} invoice sync complete. {created} created, {updated} updated, {len(errors)} failed.",
+		"message": f"{provider} invoice sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed.",
 	}
 
 
@@ -3626,9 +4169,9 @@ def sync_item(**kwargs):
 	if provider == "QuickBooks":
 		row = _integration_record(provider)
 		rows = _quickbooks_query_entity(row, "Item")
-		created, updated, errors = _quickbooks_upsert_item_rows(rows)
+		created, updated, unchanged, errors = _quickbooks_upsert_item_rows(rows)
 		frappe.db.commit()
-		return {"ok": True, "provider": provider, "entity": "item", "count": len(rows), "created": created, "updated": updated, "errors": errors, "message": f"{provider} item sync complete. {created} created, {updated} updated, {len(errors)} failed."}
+		return {"ok": True, "provider": provider, "entity": "item", "count": len(rows), "created": created, "updated": updated, "unchanged": unchanged, "errors": errors, "message": f"{provider} item sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed."}
 	if provider == "MYOB":
 		row = _integration_record(provider)
 		return _provider_manual_sync_snapshot(provider, "item", row)
@@ -3644,26 +4187,33 @@ def sync_item(**kwargs):
 		first = connections[0] if isinstance(connections[0], dict) else {}
 		row["tenantId"] = _as_str(first.get("tenantId"))
 
-	items = _xero_fetch_items(row)
+	since = "" if _as_bool(kwargs.get("full_sync")) else _get_sync_checkpoint(provider, "item")
+	items = _xero_fetch_items(row, modified_since=since)
 	created = 0
 	updated = 0
+	unchanged = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Item", records=items)
 	for item_row in items:
 		try:
 			if not isinstance(item_row, dict):
 				continue
 			xero_item_id = _as_str(item_row.get("ItemID"))
-			existed = bool(xero_item_id and frappe.db.exists("Item", {"xero_item_id": xero_item_id}))
-			name = _upsert_item_from_xero_item(item_row)
+			existed = bool(_lookup_name(lookup, "Item", "xero_item_id", xero_item_id))
+			name = _upsert_item_from_xero_item(item_row, lookup)
 			if not name:
 				continue
-			if existed:
+			if _was_unchanged(lookup, "Item", name):
+				unchanged += 1
+			elif existed:
 				updated += 1
 			else:
 				created += 1
 		except Exception as exc:
 			errors.append(_as_str(exc))
 
+	if not errors:
+		_save_sync_checkpoint(provider, "item", _xero_high_water_mark(items, since), len(items))
 	_persist_integration_record(provider, row)
 	frappe.db.commit()
 	return {
@@ -3671,10 +4221,12 @@ def sync_item(**kwargs):
 		"provider": provider,
 		"entity": "item",
 		"count": len(items),
+		"modified_since": since,
 		"created": created,
 		"updated": updated,
+		"unchanged": unchanged,
 		"errors": errors[:20],
-		"message": f"{provider} item sync complete. {created} created, {updated} updated, {len(errors)} failed.",
+		"message": f"{provider} item sync complete. {created} created, {updated} updated, {unchanged} unchanged, {len(errors)} failed.",
 	}
 
 
@@ -3699,17 +4251,19 @@ def sync_payment(**kwargs):
 		first = connections[0] if isinstance(connections[0], dict) else {}
 		row["tenantId"] = _as_str(first.get("tenantId"))
 
-	payments = _xero_fetch_payments(row)
+	since = "" if _as_bool(kwargs.get("full_sync")) else _get_sync_checkpoint(provider, "payment")
+	payments = _xero_fetch_payments(row, modified_since=since)
 	created = 0
 	updated = 0
 	errors: list[str] = []
+	lookup = _build_accounting_lookup("Payment Entry", "Sales Invoice", records=payments)
 	for payment in payments:
 		try:
 			if not isinstance(payment, dict):
 				continue
 			payment_id = _as_str(payment.get("PaymentID"))
-			existed = bool(payment_id and frappe.db.exists("Payment Entry", {"xero_payment_id": payment_id}))
-			name = _upsert_payment_entry_from_xero_payment(payment)
+			existed = bool(_lookup_name(lookup, "Payment Entry", "xero_payment_id", payment_id))
+			name = _upsert_payment_entry_from_xero_payment(payment, lookup)
 			if not name:
 				continue
 			if existed:
@@ -3719,6 +4273,8 @@ def sync_payment(**kwargs):
 		except Exception as exc:
 			errors.append(_as_str(exc))
 
+	if not errors:
+		_save_sync_checkpoint(provider, "payment", _xero_high_water_mark(payments, since), len(payments))
 	_persist_integration_record(provider, row)
 	frappe.db.commit()
 	return {
@@ -3726,6 +4282,7 @@ def sync_payment(**kwargs):
 		"provider": provider,
 		"entity": "payment",
 		"count": len(payments),
+		"modified_since": since,
 		"created": created,
 		"updated": updated,
 		"errors": errors[:20],
@@ -3963,79 +4520,306 @@ def import_credit_notes(**kwargs):
 	return {"ok": True, "provider": provider, "creditNotes": out, "count": len(out)}
 
 
-@frappe.whitelist(methods=["POST"])
-def sync_now(**kwargs):
-	provider = _normalize_provider_name(kwargs.get("provider") or kwargs.get("integration_provider"), "Xero")
-	entity = _as_str(kwargs.get("entity") or "all").lower()
-	results: list[dict[str, Any]] = []
-	if entity in {"all", "item"}:
-		results.append({"entity": "item", "result": sync_item(provider=provider)})
-	if entity in {"all", "customer"}:
-		results.append({"entity": "customer", "result": sync_customer(provider=provider)})
-	if entity in {"all", "supplier"}:
-		results.append({"entity": "supplier", "result": sync_supplier(provider=provider)})
-	if entity in {"all", "invoice"}:
-		results.append({"entity": "invoice", "result": sync_invoice(provider=provider)})
-	if entity in {"all", "payment"}:
-		results.append({"entity": "payment", "result": sync_payment(provider=provider)})
-	return {"ok": True, "provider": provider, "entity": entity, "results": results, "message": "Accounting sync completed."}
+@frappe.whitelist(methods=["POST"])
+def sync_now(**kwargs):
+	provider = _normalize_provider_name(kwargs.get("provider") or kwargs.get("integration_provider"), "Xero")
+	entity = _as_str(kwargs.get("entity") or "all").lower()
+	results: list[dict[str, Any]] = []
+	if entity in {"all", "item"}:
+		results.append({"entity": "item", "result": sync_item(provider=provider)})
+	if entity in {"all", "customer"}:
+		results.append({"entity": "customer", "result": sync_customer(provider=provider)})
+	if entity in {"all", "supplier"}:
+		results.append({"entity": "supplier", "result": sync_supplier(provider=provider)})
+	if entity in {"all", "invoice"}:
+		results.append({"entity": "invoice", "result": sync_invoice(provider=provider)})
+	if entity in {"all", "payment"}:
+		results.append({"entity": "payment", "result": sync_payment(provider=provider)})
+	return {"ok": True, "provider": provider, "entity": entity, "results": results, "message": "Accounting sync completed."}
+
+
+ACCOUNTING_SYNC_NODE_DOCTYPE = "FT Accounting Sync Node"
+# entity -> entities that must be Done/Skipped first (per provider).
+ACCOUNTING_SYNC_DAG: dict[str, tuple[str, ...]] = {
+	"item": (),
+	"customer": (),
+	"supplier": (),
+	"invoice": ("customer", "item"),
+	"payment": ("invoice",),
+}
+ACCOUNTING_SYNC_FINISHED = {"Done", "Skipped"}
+ACCOUNTING_SYNC_JOB_TIMEOUT = 3600
+# The resume tick keeps looking after unfinished runs this many days old.
+ACCOUNTING_SYNC_RESUME_DAYS = 2
+
+
+def _accounting_sync_fn(entity: str):
+	return {
+		"customer": sync_customer,
+		"supplier": sync_supplier,
+		"invoice": sync_invoice,
+		"payment": sync_payment,
+		"item": sync_item,
+	}[entity]
+
+
+def _accounting_sync_node_key(run_id: str, provider: str, entity: str) -> str:
+	return f"{run_id}:{provider}:{entity}"
+
+
+def _accounting_sync_provider_ready(provider: str) -> tuple[bool, str]:
+	try:
+		row = _integration_record(provider)
+	except Exception as exc:
+		return False, f"record_unavailable: {_as_str(exc)}"
+	enabled = _as_bool(row.get("enabled"))
+	has_any_auth = bool(
+		_as_str(row.get("tenantId"))
+		or _as_str(row.get("xeroAccessToken"))
+		or _as_str(row.get("quickbooksAccessToken"))
+		or _as_str(row.get("clientId"))
+	)
+	if not enabled and not has_any_auth:
+		return False, "not_enabled_or_not_configured"
+	return True, ""
+
+
+def _accounting_sync_node_stale(node: dict[str, Any]) -> bool:
+	"""Queued/Running for longer than the job timeout: the worker died or the job was killed."""
+	cutoff = frappe.utils.add_to_date(frappe.utils.now_datetime(), seconds=-ACCOUNTING_SYNC_JOB_TIMEOUT)
+	if _as_str(node.get("status")) == "Running":
+		since = node.get("started_at") or node.get("modified")
+	elif _as_str(node.get("status")) == "Queued":
+		since = node.get("modified")
+	else:
+		return False
+	return bool(since) and frappe.utils.get_datetime(since) < cutoff
+
+
+def _rearm_stale_accounting_node(key: str, node: dict[str, Any]) -> None:
+	# A Running node already counted its attempt when it started.
+	status = _as_str(node.get("status"))
+	attempts = int(node.get("attempts") or 0) + (1 if status == "Queued" else 0)
+	frappe.db.set_value(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		key,
+		{"status": "Pending", "attempts": attempts, "error": f"Re-armed: stale {status} node"},
+	)
+
+
+def _plan_accounting_sync_nodes(run_id: str, provider: str) -> None:
+	"""Create the provider's nodes for this run; re-arm failed and stale ones, keep finished ones."""
+	for entity, deps in ACCOUNTING_SYNC_DAG.items():
+		key = _accounting_sync_node_key(run_id, provider, entity)
+		node = frappe.db.get_value(
+			ACCOUNTING_SYNC_NODE_DOCTYPE,
+			key,
+			["status", "attempts", "started_at", "modified"],
+			as_dict=True,
+		)
+		status = _as_str(node.status) if node else ""
+		if not status:
+			frappe.get_doc(
+				{
+					"doctype": ACCOUNTING_SYNC_NODE_DOCTYPE,
+					"node_key": key,
+					"run_id": run_id,
+					"provider": provider,
+					"entity": entity,
+					"status": "Pending",
+					"depends_on": ",".join(deps),
+				}
+			).insert(ignore_permissions=True)
+		elif status in {"Failed", "Blocked"}:
+			frappe.db.set_value(ACCOUNTING_SYNC_NODE_DOCTYPE, key, {"status": "Pending", "error": ""})
+		elif _accounting_sync_node_stale(node):
+			_rearm_stale_accounting_node(key, node)
+
+
+def _enqueue_ready_accounting_nodes(run_id: str, provider: str) -> list[str]:
+	"""Enqueue every Pending node whose dependencies have finished; block dependents of failures."""
+	nodes = frappe.get_all(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		filters={"run_id": run_id, "provider": provider},
+		fields=["name", "entity", "status", "depends_on", "retry_at"],
+	)
+	status_by_entity = {_as_str(n.entity): _as_str(n.status) for n in nodes}
+	now = frappe.utils.now_datetime()
+	queued: list[str] = []
+	for node in nodes:
+		if _as_str(node.status) != "Pending":
+			continue
+		if node.retry_at and frappe.utils.get_datetime(node.retry_at) > now:
+			# Deferred by a rate limit; resume_deferred_accounting_nodes picks it up.
+			continue
+		deps = [d for d in _as_str(node.depends_on).split(",") if d]
+		dep_states = [status_by_entity.get(d, "") for d in deps]
+		if any(state in {"Failed", "Blocked"} for state in dep_states):
+			frappe.db.set_value(ACCOUNTING_SYNC_NODE_DOCTYPE, node.name, "status", "Blocked")
+			continue
+		if not all(state in ACCOUNTING_SYNC_FINISHED for state in dep_states):
+			continue
+		# Lock the row so two dependencies finishing together enqueue the node once.
+		current = frappe.db.get_value(ACCOUNTING_SYNC_NODE_DOCTYPE, node.name, "status", for_update=True)
+		if _as_str(current) != "Pending":
+			continue
+		frappe.db.set_value(ACCOUNTING_SYNC_NODE_DOCTYPE, node.name, "status", "Queued")
+		frappe.enqueue(
+			"firtrackpro.api.integrations.run_accounting_sync_node",
+			queue="long",
+			timeout=ACCOUNTING_SYNC_JOB_TIMEOUT,
+			job_id=f"accounting_sync::{node.name}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			node_key=node.name,
+		)
+		queued.append(_as_str(node.entity))
+	return queued
+
+
+def run_accounting_sync_node(node_key: str):
+	"""Background job: run one provider/entity node and then release its dependents."""
+	node = frappe.db.get_value(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		node_key,
+		["run_id", "provider", "entity", "status", "attempts"],
+		as_dict=True,
+	)
+	if not node or _as_str(node.status) in ACCOUNTING_SYNC_FINISHED:
+		return
+	started = frappe.utils.now_datetime()
+	frappe.db.set_value(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		node_key,
+		{
+			"status": "Running",
+			"started_at": started,
+			"retry_at": None,
+			"attempts": int(node.attempts or 0) + 1,
+			"error": "",
+		},
+	)
+	frappe.db.commit()
+
+	values: dict[str, Any] = {}
+	try:
+		out = _accounting_sync_fn(_as_str(node.entity))(provider=_as_str(node.provider))
+		out = out if isinstance(out, dict) else {}
+		values = {
+			"status": "Done",
+			"row_count": _as_int(out.get("count"), 0),
+			"created_count": _as_int(out.get("created"), 0),
+			"updated_count": _as_int(out.get("updated"), 0),
+			"unchanged_count": _as_int(out.get("unchanged"), 0),
+			"error": "\n".join(_as_str(e) for e in (out.get("errors") or []))[:1000],
+		}
+	except rate_limit.RateLimitDeferred as exc:
+		# Not a failure: park the node and let the resume tick re-queue it once the limit resets.
+		frappe.db.rollback()
+		retry_at = frappe.utils.add_to_date(started, seconds=max(60, int(exc.retry_after or 0)))
+		values = {"status": "Pending", "retry_at": retry_at, "error": _as_str(exc)}
+	except Exception as exc:
+		frappe.db.rollback()
+		msg = _as_str(exc)
+		lower = msg.lower()
+		if (
+			"not implemented" in lower
+			or "is not implemented yet" in lower
+			or "no backend sync endpoint accepted" in lower
+		):
+			values = {"status": "Skipped", "error": msg or "not_implemented"}
+		else:
+			values = {"status": "Failed", "error": msg}
+			try:
+				frappe.log_error(frappe.get_traceback(), f"Accounting Auto Sync Failed: {node_key}")
+			except Exception:
+				pass
+
+	finished = frappe.utils.now_datetime()
+	values["finished_at"] = finished
+	values["duration_seconds"] = round((finished - started).total_seconds(), 3)
+	frappe.db.set_value(ACCOUNTING_SYNC_NODE_DOCTYPE, node_key, values)
+	# Commit first so a sibling finishing at the same moment sees this node as finished
+	# when it evaluates the shared dependents (and vice versa).
+	frappe.db.commit()
+	_enqueue_ready_accounting_nodes(_as_str(node.run_id), _as_str(node.provider))
+	frappe.db.commit()
+
+
+def resume_deferred_accounting_nodes():
+	"""Scheduler tick for recent unfinished runs.
+
+	Re-arms stale Queued/Running nodes and enqueues every Pending node that is
+	ready, so rate-limit deferrals resume and a missed wake-up never leaves a
+	node waiting for the next day's run.
+	"""
+	since = frappe.utils.add_days(frappe.utils.nowdate(), -ACCOUNTING_SYNC_RESUME_DAYS)
+	nodes = frappe.get_all(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		filters={"status": ["in", ["Pending", "Queued", "Running"]], "run_id": [">=", since]},
+		fields=["name", "run_id", "provider", "status", "attempts", "started_at", "modified"],
+		limit_page_length=0,
+	)
+	runs = set()
+	for node in nodes:
+		if _accounting_sync_node_stale(node):
+			_rearm_stale_accounting_node(node.name, node)
+		runs.add((_as_str(node.run_id), _as_str(node.provider)))
+	for run_id, provider in sorted(runs):
+		_enqueue_ready_accounting_nodes(run_id, provider)
+	if runs:
+		frappe.db.commit()
 
 
 def run_accounting_auto_sync():
 	"""Compulsory daily auto sync across all providers/entities.
 	This intentionally ignores per-provider toggle flags in tenant UI.
+
+	Each provider/entity pair runs as its own job on the long queue, ordered by
+	ACCOUNTING_SYNC_DAG; providers proceed independently. Nodes are keyed by the
+	run date, so re-running on the same day resumes failed/blocked nodes only.
 	"""
-	providers = ["Xero", "MYOB", "QuickBooks"]
-	entities: list[tuple[str, Any]] = [
-		("customer", sync_customer),
-		("supplier", sync_supplier),
-		("invoice", sync_invoice),
-		("payment", sync_payment),
-		("item", sync_item),
-	]
-	results: dict[str, Any] = {"ok": True, "mode": "compulsory_daily_all", "ran": [], "skipped": [], "errors": []}
+	run_id = frappe.utils.nowdate()
+	results: dict[str, Any] = {"ok": True, "mode": "compulsory_daily_all", "run_id": run_id, "queued": [], "skipped": []}
 
-	for provider in providers:
-		try:
-			row = _integration_record(provider)
-		except Exception as exc:
-			results["skipped"].append({"provider": provider, "reason": f"record_unavailable: {_as_str(exc)}"})
+	for provider in ["Xero", "MYOB", "QuickBooks"]:
+		ready, reason = _accounting_sync_provider_ready(provider)
+		if not ready:
+			results["skipped"].append({"provider": provider, "reason": reason})
 			continue
+		_plan_accounting_sync_nodes(run_id, provider)
+		for entity in _enqueue_ready_accounting_nodes(run_id, provider):
+			results["queued"].append({"provider": provider, "entity": entity})
 
-		enabled = _as_bool(row.get("enabled"))
-		has_any_auth = bool(
-			_as_str(row.get("tenantId"))
-			or _as_str(row.get("xeroAccessToken"))
-			or _as_str(row.get("quickbooksAccessToken"))
-			or _as_str(row.get("clientId"))
-		)
-		if not enabled and not has_any_auth:
-			results["skipped"].append({"provider": provider, "reason": "not_enabled_or_not_configured"})
-			continue
+	frappe.db.commit()
+	return results
 
-		for entity, fn in entities:
-			try:
-				out = fn(provider=provider)
-				results["ran"].append({"provider": provider, "entity": entity, "result": out})
-			except Exception as exc:
-				msg = _as_str(exc)
-				lower = msg.lower()
-				if (
-					"not implemented" in lower
-					or "is not implemented yet" in lower
-					or "no backend sync endpoint accepted" in lower
-				):
-					results["skipped"].append({"provider": provider, "entity": entity, "reason": msg or "not_implemented"})
-					continue
-				results["errors"].append({"provider": provider, "entity": entity, "error": msg})
 
-	if results["errors"]:
-		results["ok"] = False
-		try:
-			frappe.log_error(json.dumps(results, default=str), "Accounting Auto Sync Errors")
-		except Exception:
-			pass
-	return results
+@frappe.whitelist()
+def get_accounting_sync_run(run_id=None):
+	if frappe.session.user == "Guest":
+		frappe.throw("Login required", frappe.PermissionError)
+	run_id = _as_str(run_id) or frappe.utils.nowdate()
+	nodes = frappe.get_all(
+		ACCOUNTING_SYNC_NODE_DOCTYPE,
+		filters={"run_id": run_id},
+		fields=[
+			"provider",
+			"entity",
+			"status",
+			"attempts",
+			"started_at",
+			"finished_at",
+			"duration_seconds",
+			"row_count",
+			"created_count",
+			"updated_count",
+			"unchanged_count",
+			"error",
+		],
+		order_by="provider asc, creation asc",
+	)
+	return {"ok": True, "run_id": run_id, "nodes": nodes}
 
 
 @frappe.whitelist()
@@ -4195,46 +4979,10 @@ def firelink_address_resolve_or_create(**kwargs):
 			last_error = _as_str(exc)
 			continue
 
-		line1_field = _pick_existing_field(
-			field_names,
-			(
-				"address_line1",
-				"fl_address_line1",
-				"line1",
-				"street_address",
-				"address",
-				"street",
-				"street1",
-				"address1",
-			),
-		)
-		if not line1_field:
+		mapping = _address_field_mapping(field_names)
+		if not mapping:
 			last_error = f"{doctype} missing line1 field"
 			continue
-		mapping = {
-			"title": _pick_existing_field(
-				field_names, ("address_title", "fl_address_title", "title", "name")
-			),
-			"line1": line1_field,
-			"line2": _pick_existing_field(
-				field_names, ("address_line2", "fl_address_line2", "line2", "street2", "address2")
-			),
-			"city": _pick_existing_field(field_names, ("city", "suburb", "town")),
-			"state": _pick_existing_field(field_names, ("state", "province")),
-			"post": _pick_existing_field(field_names, ("pincode", "postcode", "postal_code", "zip")),
-			"country": _pick_existing_field(field_names, ("country",)),
-			"place_id": _pick_existing_field(
-				field_names, ("google_place_id", "place_id", "google_places_id", "google_placeid")
-			),
-		}
-
-		search_terms: list[list[Any]] = [[doctype, line1_field, "like", f"%{incoming['address_line1']}%"]]
-		if mapping["place_id"] and incoming["place_id"]:
-			search_terms.insert(0, [doctype, mapping["place_id"], "=", incoming["place_id"]])
-		if mapping["city"] and incoming["city"]:
-			search_terms.append([doctype, mapping["city"], "like", f"%{incoming['city']}%"])
-		if mapping["title"] and incoming["address_title"]:
-			search_terms.append([doctype, mapping["title"], "like", f"%{incoming['address_title']}%"])
 
 		fields = ["name", mapping["line1"]]
 		for key in ("title", "line2", "city", "state", "post", "country", "place_id"):
@@ -4242,24 +4990,27 @@ def firelink_address_resolve_or_create(**kwargs):
 				fields.append(mapping[key])
 		unique_fields = list(dict.fromkeys([f for f in fields if f]))
 
-		list_payload = _firelink_http(
-			"GET",
-			f"/api/resource/{quote(doctype, safe='')}",
-			params={
-				"fields": json.dumps(unique_fields),
-				"limit_page_length": "50",
-				"or_filters": json.dumps(search_terms),
-			},
-		)
-		rows = list_payload.get("data")
-		rows = rows if isinstance(rows, list) else []
 		best_row = None
-		for row in rows:
-			if not isinstance(row, dict):
-				continue
-			normalized = _normalize_remote_row(row, mapping)
-			if _strong_match(normalized, incoming):
-				best_row = row
+		for kind, terms in _address_lookup_plan(doctype, mapping, field_names, incoming, fuzzy_title=True):
+			list_payload = _firelink_http(
+				"GET",
+				f"/api/resource/{quote(doctype, safe='')}",
+				params={
+					"fields": json.dumps(unique_fields),
+					"limit_page_length": "50",
+					kind: json.dumps(terms),
+				},
+			)
+			rows = list_payload.get("data")
+			rows = rows if isinstance(rows, list) else []
+			for row in rows:
+				if not isinstance(row, dict):
+					continue
+				normalized = _normalize_remote_row(row, mapping)
+				if _strong_match(normalized, incoming):
+					best_row = row
+					break
+			if best_row:
 				break
 		if best_row:
 			normalized = _normalize_remote_row(best_row, mapping)
@@ -4351,13 +5102,48 @@ def _remote_bridge_payload(kwargs: dict[str, Any]) -> dict[str, Any]:
 	return payload
 
 
+def _firelink_sync_bridge_payload(kwargs: dict[str, Any]) -> dict[str, Any]:
+	"""Bridge payload for property/asset/defect pushes; source_site scopes idempotency on the host."""
+	return _remote_bridge_payload({**kwargs, "source_site": _as_str(getattr(frappe.local, "site", ""))})
+
+
+FIRELINK_IDEMPOTENCY_TTL = 24 * 3600
+
+
+def _firelink_caller() -> str:
+	"""The tenant a FireLink write is for: the bridge caller's site, else this site."""
+	form = getattr(frappe.local, "form_dict", None) or {}
+	return _as_str(form.get("source_site")) or _as_str(getattr(frappe.local, "site", ""))
+
+
+def _firelink_idempotent(key: Any, fn: Any) -> Any:
+	"""Run `fn` once per idempotency key: a push retried after a timeout gets the first result back.
+
+	Keys are unique per queued push (see FL Sync Outbox), so an entry only ever
+	answers retries of that one push. Entries are per caller and are written
+	once the upsert has committed; a rolled-back upsert is simply run again.
+	"""
+	key = _as_str(key)
+	if not key:
+		return fn()
+	cache = frappe.cache()
+	cache_key = f"firtrackpro:firelink_idempotency:{_firelink_caller()}:{key}"
+	done = cache.get_value(cache_key)
+	if isinstance(done, dict):
+		return done
+	result = fn()
+	if isinstance(result, dict) and not result.get("error"):
+		frappe.db.after_commit.add(
+			lambda: cache.set_value(cache_key, result, expires_in_sec=FIRELINK_IDEMPOTENCY_TTL)
+		)
+	return result
+
+
 def _firelink_remote_bridge_call(path: str, payload: dict[str, Any]) -> dict[str, Any]:
-	bridge = _firelink_http(
-		"POST",
-		path,
-		data=payload,
-		headers={"Content-Type": "application/x-www-form-urlencoded"},
-	)
+	headers = {"Content-Type": "application/x-www-form-urlencoded"}
+	if _as_str(payload.get("idempotency_key")):
+		headers["Idempotency-Key"] = _as_str(payload.get("idempotency_key"))
+	bridge = _firelink_http("POST", path, data=payload, headers=headers)
 	message = bridge.get("message") if isinstance(bridge.get("message"), dict) else bridge
 	if isinstance(message, dict):
 		return message
@@ -5809,86 +6595,156 @@ def firelink_public_signup_availability_bridge(**kwargs):
 	return {"row": _local_signup_availability_payload(kwargs)}
 
 
-@frappe.whitelist(allow_guest=True, methods=["POST"])
-def firelink_public_property_snapshot(**kwargs):
-	"""Guest-safe lookup for FireLink public sticker pages."""
-	sticker = _as_str(kwargs.get("propertyid") or kwargs.get("property_id") or kwargs.get("sticker_id")).lower()
-	if not sticker:
-		frappe.throw("Missing property sticker ID", frappe.ValidationError)
-
-	sticker_fields = [
-		"property_sticker_id",
+FIRELINK_STICKER_FIELDS = (
+	"property_sticker_id",
+	"firelink_sticker_id",
+	"property_firelink_sticker_id",
+	"public_firelink_id",
+	"sticker_id",
+)
+FIRELINK_SNAPSHOT_PROPERTY_FIELDS = {
+	"FL Property": ("name", "property_display_name", "property_address_json", "property_sticker_id", "property_front_image"),
+	"FT Property": (
+		"name",
+		"property_name",
+		"property_title",
+		"property_address",
+		"address_display",
 		"firelink_sticker_id",
 		"property_firelink_sticker_id",
 		"public_firelink_id",
 		"sticker_id",
-	]
-	property_candidates = [
-		("FL Property", ["name", "property_display_name", "property_address_json", "property_sticker_id", "property_front_image"]),
-		(
-			"FT Property",
-			[
-				"name",
-				"property_name",
-				"property_title",
-				"property_address",
-				"address_display",
-				"firelink_sticker_id",
-				"property_firelink_sticker_id",
-				"public_firelink_id",
-				"sticker_id",
-				"property_front_image",
-			],
-		),
-	]
-
-	found = None
-	for doctype, wanted_fields in property_candidates:
+		"property_front_image",
+	),
+}
+FIRELINK_STICKER_INDEX_KEY = "firtrackpro:firelink_sticker_index"
+FIRELINK_STICKER_MISS_TTL = 300
+FIRELINK_SNAPSHOT_TTL = 900
+
+
+def _firelink_snapshot_key(doctype: str, name: str) -> str:
+	return f"firtrackpro:firelink_snapshot:{doctype}:{name}"
+
+
+def _firelink_sticker_lookup(sticker: str) -> tuple[str, str]:
+	"""Sticker -> (doctype, name) through a Redis hash, probing the sticker fields only on a miss."""
+	cache = frappe.cache()
+	hit = _as_str(cache.hget(FIRELINK_STICKER_INDEX_KEY, sticker))
+	if hit:
+		doctype, _, name = hit.partition("\n")
+		return doctype, name
+	miss_key = f"firtrackpro:firelink_sticker_miss:{sticker}"
+	if cache.get_value(miss_key):
+		return "", ""
+	for doctype in FIRELINK_SNAPSHOT_PROPERTY_FIELDS:
 		if not frappe.db.exists("DocType", doctype):
 			continue
 		meta = frappe.get_meta(doctype)
-		available_fields = [f for f in wanted_fields if meta.has_field(f) or f == "name"]
-		for field in sticker_fields:
+		for field in FIRELINK_STICKER_FIELDS:
 			if not meta.has_field(field):
 				continue
-			rows = frappe.get_all(
-				doctype,
-				fields=available_fields,
-				filters=[[doctype, field, "=", sticker]],
-				limit_page_length=1,
-			)
-			if rows:
-				found = rows[0]
-				break
-		if found:
-			break
-
+			name = frappe.db.get_value(doctype, {field: sticker}, "name")
+			if name:
+				cache.hset(FIRELINK_STICKER_INDEX_KEY, sticker, f"{doctype}\n{name}")
+				return doctype, _as_str(name)
+	# Unknown stickers are remembered briefly so repeated bad scans stay off the database.
+	cache.set_value(miss_key, 1, expires_in_sec=FIRELINK_STICKER_MISS_TTL)
+	return "", ""
+
+
+def _build_firelink_property_snapshot(doctype: str, name: str) -> dict[str, Any]:
+	meta = frappe.get_meta(doctype)
+	fields = [f for f in FIRELINK_SNAPSHOT_PROPERTY_FIELDS[doctype] if f == "name" or meta.has_field(f)]
+	found = frappe.db.get_value(doctype, name, fields, as_dict=True)
 	if not found:
 		return {"property": None, "jobs": [], "defects": []}
-
-	property_name = _as_str(found.get("name"))
 	jobs = []
 	defects = []
-	if property_name and frappe.db.exists("DocType", "FT Job"):
+	if frappe.db.exists("DocType", "FT Job"):
 		jobs = frappe.get_all(
 			"FT Job",
 			fields=["name", "job_title", "job_status", "job_required_date", "modified"],
-			filters=[["FT Job", "job_property", "=", property_name]],
+			filters=[["FT Job", "job_property", "=", name]],
 			order_by="modified desc",
 			limit_page_length=200,
 		)
-	if property_name and frappe.db.exists("DocType", "FT Defect"):
+	if frappe.db.exists("DocType", "FT Defect"):
 		defects = frappe.get_all(
 			"FT Defect",
 			fields=["name", "defect_description", "defect_status", "defect_severity", "modified"],
-			filters=[["FT Defect", "defect_property", "=", property_name]],
+			filters=[["FT Defect", "defect_property", "=", name]],
 			order_by="modified desc",
 			limit_page_length=200,
 		)
-
 	return {"property": found, "jobs": jobs or [], "defects": defects or []}
 
 
+def _drop_firelink_snapshots(stickers: set[str], property_names: set[str]) -> None:
+	cache = frappe.cache()
+	for sticker in stickers:
+		cache.hdel(FIRELINK_STICKER_INDEX_KEY, sticker)
+		cache.delete_value(f"firtrackpro:firelink_sticker_miss:{sticker}")
+	for name in property_names - {""}:
+		for doctype in FIRELINK_SNAPSHOT_PROPERTY_FIELDS:
+			cache.delete_value(_firelink_snapshot_key(doctype, name))
+
+
+def invalidate_firelink_snapshot(doc, method=None):
+	"""Doc event: drop cached sticker snapshots (and stale sticker index entries) touched by `doc`.
+
+	The keys are dropped after commit; dropping them earlier lets a scan in between
+	rebuild and cache the pre-change snapshot.
+	"""
+	try:
+		before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+		stickers: set[str] = set()
+		if doc.doctype in FIRELINK_SNAPSHOT_PROPERTY_FIELDS:
+			property_names = {doc.name}
+			stickers = {
+				_as_str(d.get(field)).lower()
+				for d in (doc, before)
+				if d is not None
+				for field in FIRELINK_STICKER_FIELDS
+				if _as_str(d.get(field))
+			}
+		else:
+			link_field = "job_property" if doc.doctype == "FT Job" else "defect_property"
+			property_names = {_as_str(d.get(link_field)) for d in (doc, before) if d is not None}
+		frappe.db.after_commit.add(lambda: _drop_firelink_snapshots(stickers, property_names))
+	except Exception:
+		frappe.log_error(frappe.get_traceback(), "FireLink snapshot invalidation failed")
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET", "POST"])
+def firelink_public_property_snapshot(**kwargs):
+	"""Guest-safe lookup for FireLink public sticker pages.
+
+	Snapshots are cached per property and dropped by the FT Property/Job/Defect
+	hooks. The response carries an `etag`; send it back as If-None-Match (or
+	`etag`) to get a 304 when nothing changed.
+	"""
+	sticker = _as_str(kwargs.get("propertyid") or kwargs.get("property_id") or kwargs.get("sticker_id")).lower()
+	if not sticker:
+		frappe.throw("Missing property sticker ID", frappe.ValidationError)
+
+	doctype, name = _firelink_sticker_lookup(sticker)
+	if not name:
+		return {"property": None, "jobs": [], "defects": []}
+
+	cache = frappe.cache()
+	key = _firelink_snapshot_key(doctype, name)
+	snapshot = cache.get_value(key)
+	if not isinstance(snapshot, dict):
+		snapshot = _build_firelink_property_snapshot(doctype, name)
+		if not snapshot.get("property"):
+			# Property gone or renamed; let the next scan re-resolve the sticker.
+			cache.hdel(FIRELINK_STICKER_INDEX_KEY, sticker)
+			return snapshot
+		snapshot["etag"] = http_cache.payload_etag(snapshot)
+		cache.set_value(key, snapshot, expires_in_sec=FIRELINK_SNAPSHOT_TTL)
+	return http_cache.conditional_response(snapshot, snapshot["etag"], kwargs.get("etag"))
+
+
 @frappe.whitelist(allow_guest=True, methods=["POST"])
 def firelink_admin_plans_bridge(**kwargs):
 	if not _is_valid_bridge_call():
@@ -6910,7 +7766,7 @@ def _upsert_ft_property_local(payload: dict[str, Any]) -> str:
 	return _as_str(doc.name)
 
 
-def _upsert_fl_asset_local(payload: dict[str, Any]) -> dict[str, Any]:
+def _upsert_fl_asset_local(payload: dict[str, Any], existing: set[str] | None = None) -> dict[str, Any]:
 	property_id = _as_str(payload.get("firelink_property_id"))
 	if not property_id:
 		frappe.throw("firelink_property_id is required", frappe.ValidationError)
@@ -6930,7 +7786,7 @@ def _upsert_fl_asset_local(payload: dict[str, Any]) -> dict[str, Any]:
 		"asset_photo": _as_str(payload.get("asset_photo")),
 		"additional_photos": _as_str(payload.get("additional_photos")),
 	}
-	if frappe.db.exists("FL Asset", asset_id):
+	if (asset_id in existing) if existing is not None else frappe.db.exists("FL Asset", asset_id):
 		doc = frappe.get_doc("FL Asset", asset_id)
 		for fieldname, value in values.items():
 			setattr(doc, fieldname, value)
@@ -6943,13 +7799,17 @@ def _upsert_fl_asset_local(payload: dict[str, Any]) -> dict[str, Any]:
 	return {"firelink_asset_id": doc.name, "created": created}
 
 
-def _upsert_fl_defect_local(payload: dict[str, Any]) -> dict[str, Any]:
+def _upsert_fl_defect_local(
+	payload: dict[str, Any],
+	existing: set[str] | None = None,
+	candidates: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
 	property_id = _as_str(payload.get("firelink_property_id"))
 	if not property_id:
 		frappe.throw("firelink_property_id is required", frappe.ValidationError)
 	defect_id = _as_str(payload.get("firelink_defect_id")) or _as_str(payload.get("local_defect_id"))
 	if not _as_str(payload.get("firelink_defect_id")):
-		matched_id = _find_matching_fl_defect_local(payload)
+		matched_id = _find_matching_fl_defect_local(payload, candidates)
 		if matched_id:
 			defect_id = matched_id
 	if not defect_id:
@@ -6965,7 +7825,7 @@ def _upsert_fl_defect_local(payload: dict[str, Any]) -> dict[str, Any]:
 		"defect_photo": _as_str(payload.get("defect_photo")),
 		"additional_photos": _as_str(payload.get("additional_photos")),
 	}
-	if frappe.db.exists("FL Defect", defect_id):
+	if (defect_id in existing) if existing is not None else frappe.db.exists("FL Defect", defect_id):
 		doc = frappe.get_doc("FL Defect", defect_id)
 		for fieldname, value in values.items():
 			setattr(doc, fieldname, value)
@@ -7048,14 +7908,15 @@ def firelink_property_sync(**kwargs):
 		"country": _as_str(kwargs.get("country")) or "Australia",
 		"firelink_sticker_id": _as_str(kwargs.get("firelink_sticker_id")) or None,
 		"property_front_image": _as_str(kwargs.get("property_front_image")) or None,
+		"idempotency_key": _as_str(kwargs.get("idempotency_key")) or None,
 	}
 	if _is_firelink_local_site():
-		out = _upsert_fl_property_local(payload)
+		out = _firelink_idempotent(payload.get("idempotency_key"), lambda: _upsert_fl_property_local(payload))
 	else:
 		try:
 			out = _firelink_remote_bridge_call(
 				"/api/method/firtrackpro.api.integrations.firelink_property_sync_bridge",
-				_remote_bridge_payload(payload),
+				_firelink_sync_bridge_payload(payload),
 			)
 		except Exception:
 			remote = _upsert_remote_fl_doctype(
@@ -7111,17 +7972,14 @@ def firelink_property_sync(**kwargs):
 def firelink_property_sync_bridge(**kwargs):
 	if not _is_valid_bridge_call():
 		frappe.throw("Bridge token or approved firetrackpro origin is required", frappe.PermissionError)
-	return _upsert_fl_property_local(kwargs)
+	return _firelink_idempotent(kwargs.get("idempotency_key"), lambda: _upsert_fl_property_local(kwargs))
 
 
-@frappe.whitelist(methods=["POST"])
-def firelink_asset_sync(**kwargs):
-	if frappe.session.user == "Guest":
-		frappe.throw("Login required", frappe.PermissionError)
+def _firelink_asset_payload(kwargs: dict[str, Any]) -> dict[str, Any]:
 	status = _as_str(kwargs.get("asset_status")).lower()
 	if status not in {"active", "inactive", "retired"}:
 		status = "active"
-	payload = {
+	return {
 		"firelink_property_id": _as_str(kwargs.get("firelink_property_id")),
 		"firelink_asset_id": _as_str(kwargs.get("firelink_asset_id")) or None,
 		"local_asset_id": _as_str(kwargs.get("local_asset_id")),
@@ -7135,13 +7993,21 @@ def firelink_asset_sync(**kwargs):
 		"asset_standard": _as_str(kwargs.get("asset_standard")) or None,
 		"asset_photo": _as_str(kwargs.get("asset_photo")) or None,
 		"additional_photos": _as_str(kwargs.get("additional_photos")) or None,
+		"idempotency_key": _as_str(kwargs.get("idempotency_key")) or None,
 	}
+
+
+@frappe.whitelist(methods=["POST"])
+def firelink_asset_sync(**kwargs):
+	if frappe.session.user == "Guest":
+		frappe.throw("Login required", frappe.PermissionError)
+	payload = _firelink_asset_payload(kwargs)
 	if _is_firelink_local_site():
-		return _upsert_fl_asset_local(payload)
+		return _firelink_idempotent(payload.get("idempotency_key"), lambda: _upsert_fl_asset_local(payload))
 	try:
 		result = _firelink_remote_bridge_call(
 			"/api/method/firtrackpro.api.integrations.firelink_asset_sync_bridge",
-			_remote_bridge_payload(payload),
+			_firelink_sync_bridge_payload(payload),
 		)
 		_write_back_local_asset_firelink_uid(payload, result)
 		return result
@@ -7172,7 +8038,7 @@ def firelink_asset_sync(**kwargs):
 def firelink_asset_sync_bridge(**kwargs):
 	if not _is_valid_bridge_call():
 		frappe.throw("Bridge token or approved firetrackpro origin is required", frappe.PermissionError)
-	return _upsert_fl_asset_local(kwargs)
+	return _firelink_idempotent(kwargs.get("idempotency_key"), lambda: _upsert_fl_asset_local(kwargs))
 
 
 def _write_back_local_asset_firelink_uid(payload: dict[str, Any], result: dict[str, Any] | None) -> None:
@@ -7278,21 +8144,22 @@ def _writeback_defect_firelink_uid(local_defect_id: str, firelink_defect_id: str
 		return
 
 
-def _find_matching_fl_defect_local(payload: dict[str, Any]) -> str:
+def _find_matching_fl_defect_local(payload: dict[str, Any], candidates: list[dict[str, Any]] | None = None) -> str:
 	property_id = _as_str(payload.get("firelink_property_id"))
 	asset_id = _as_str(payload.get("firelink_asset_id"))
 	summary = _as_str(payload.get("defect_summary"))[:140]
 	notes = _as_str(payload.get("defect_notes"))
 	if not property_id:
 		return ""
-	filters = {"defect_property": property_id}
-	candidates = frappe.get_all(
-		"FL Defect",
-		filters=filters,
-		fields=["name", "defect_asset", "defect_summary", "defect_notes"],
-		limit_page_length=50,
-		order_by="modified desc",
-	)
+	if candidates is None:
+		filters = {"defect_property": property_id}
+		candidates = frappe.get_all(
+			"FL Defect",
+			filters=filters,
+			fields=["name", "defect_asset", "defect_summary", "defect_notes"],
+			limit_page_length=50,
+			order_by="modified desc",
+		)
 	for row in candidates:
 		row_summary = _as_str(row.get("defect_summary"))[:140]
 		row_notes = _as_str(row.get("defect_notes"))
@@ -7304,16 +8171,13 @@ def _find_matching_fl_defect_local(payload: dict[str, Any]) -> str:
 	return ""
 
 
-@frappe.whitelist(methods=["POST"])
-def firelink_defect_sync(**kwargs):
-	if frappe.session.user == "Guest":
-		frappe.throw("Login required", frappe.PermissionError)
+def _firelink_defect_payload(kwargs: dict[str, Any]) -> dict[str, Any]:
 	local_defect_id = _as_str(kwargs.get("local_defect_id"))
 	resolved_firelink_asset_id = _resolve_defect_asset_firelink_id(
 		_as_str(kwargs.get("firelink_asset_id")),
 		local_defect_id,
 	)
-	payload = {
+	return {
 		"firelink_property_id": _as_str(kwargs.get("firelink_property_id")),
 		"firelink_defect_id": _resolve_defect_firelink_id(
 			_as_str(kwargs.get("firelink_defect_id")),
@@ -7329,15 +8193,24 @@ def firelink_defect_sync(**kwargs):
 		"defect_notes": _as_str(kwargs.get("defect_notes")) or None,
 		"defect_photo": _as_str(kwargs.get("defect_photo")) or None,
 		"additional_photos": _as_str(kwargs.get("additional_photos")) or None,
+		"idempotency_key": _as_str(kwargs.get("idempotency_key")) or None,
 	}
+
+
+@frappe.whitelist(methods=["POST"])
+def firelink_defect_sync(**kwargs):
+	if frappe.session.user == "Guest":
+		frappe.throw("Login required", frappe.PermissionError)
+	local_defect_id = _as_str(kwargs.get("local_defect_id"))
+	payload = _firelink_defect_payload(kwargs)
 	if _is_firelink_local_site():
-		out = _upsert_fl_defect_local(payload)
+		out = _firelink_idempotent(payload.get("idempotency_key"), lambda: _upsert_fl_defect_local(payload))
 		_writeback_defect_firelink_uid(local_defect_id, _as_str(out.get("firelink_defect_id")))
 		return out
 	try:
 		out = _firelink_remote_bridge_call(
 			"/api/method/firtrackpro.api.integrations.firelink_defect_sync_bridge",
-			_remote_bridge_payload(payload),
+			_firelink_sync_bridge_payload(payload),
 		)
 		_writeback_defect_firelink_uid(local_defect_id, _as_str(out.get("firelink_defect_id")))
 		return out
@@ -7366,7 +8239,247 @@ def firelink_defect_sync(**kwargs):
 def firelink_defect_sync_bridge(**kwargs):
 	if not _is_valid_bridge_call():
 		frappe.throw("Bridge token or approved firetrackpro origin is required", frappe.PermissionError)
-	return _upsert_fl_defect_local(kwargs)
+	return _firelink_idempotent(kwargs.get("idempotency_key"), lambda: _upsert_fl_defect_local(kwargs))
+
+
+FIRELINK_BULK_MAX = 500
+
+
+def _bulk_rows(raw: Any, label: str) -> list[dict[str, Any]]:
+	rows = _as_mapping_rows(raw)
+	if len(rows) > FIRELINK_BULK_MAX:
+		frappe.throw(f"At most {FIRELINK_BULK_MAX} {label} can be synced per call.", frappe.ValidationError)
+	return rows
+
+
+def _upsert_fl_assets_local_bulk(payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+	ids = [_as_str(p.get("firelink_asset_id")) or _as_str(p.get("local_asset_id")) for p in payloads]
+	existing = (
+		set(frappe.get_all("FL Asset", filters={"name": ["in", [i for i in ids if i]]}, pluck="name"))
+		if any(ids)
+		else set()
+	)
+	out: list[dict[str, Any]] = []
+	for payload in payloads:
+		row = {"local_asset_id": _as_str(payload.get("local_asset_id"))}
+		try:
+			result = _firelink_idempotent(
+				payload.get("idempotency_key"), lambda: _upsert_fl_asset_local(payload, existing)
+			)
+			existing.add(_as_str(result.get("firelink_asset_id")))
+			row.update(result)
+		except Exception as exc:
+			row["error"] = _as_str(exc)
+		out.append(row)
+	return out
+
+
+def _upsert_fl_defects_local_bulk(payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+	ids = [_as_str(p.get("firelink_defect_id")) or _as_str(p.get("local_defect_id")) for p in payloads]
+	existing = (
+		set(frappe.get_all("FL Defect", filters={"name": ["in", [i for i in ids if i]]}, pluck="name"))
+		if any(ids)
+		else set()
+	)
+	# Match candidates for every property in one query instead of one per defect.
+	property_ids = sorted(
+		{_as_str(p.get("firelink_property_id")) for p in payloads if _as_str(p.get("firelink_property_id"))}
+	)
+	candidates_by_property: dict[str, list[dict[str, Any]]] = {pid: [] for pid in property_ids}
+	if property_ids:
+		for row in frappe.get_all(
+			"FL Defect",
+			filters={"defect_property": ["in", property_ids]},
+			fields=["name", "defect_property", "defect_asset", "defect_summary", "defect_notes"],
+			order_by="modified desc",
+			limit_page_length=0,
+		):
+			candidates_by_property[_as_str(row.get("defect_property"))].append(row)
+	out: list[dict[str, Any]] = []
+	for payload in payloads:
+		row = {"local_defect_id": _as_str(payload.get("local_defect_id"))}
+		try:
+			candidates = candidates_by_property.setdefault(_as_str(payload.get("firelink_property_id")), [])
+			result = _firelink_idempotent(
+				payload.get("idempotency_key"),
+				lambda: _upsert_fl_defect_local(payload, existing, candidates),
+			)
+			defect_id = _as_str(result.get("firelink_defect_id"))
+			existing.add(defect_id)
+			# Later defects in the batch must match (and merge into) this one, as they would
+			# one call at a time; newest first, like the modified-desc query above.
+			candidates[:] = [c for c in candidates if _as_str(c.get("name")) != defect_id]
+			candidates.insert(
+				0,
+				frappe._dict(
+					name=defect_id,
+					defect_property=_as_str(payload.get("firelink_property_id")),
+					defect_asset=_as_str(payload.get("firelink_asset_id")),
+					defect_summary=_as_str(payload.get("defect_summary"))[:140],
+					defect_notes=_as_str(payload.get("defect_notes")),
+				),
+			)
+			row.update(result)
+		except Exception as exc:
+			row["error"] = _as_str(exc)
+		out.append(row)
+	return out
+
+
+def _write_back_local_firelink_uids(doctype: str, uid_field: str, local_to_uid: dict[str, str]) -> None:
+	local_to_uid = {k: v for k, v in local_to_uid.items() if k and v}
+	if not local_to_uid or not frappe.db.has_column(doctype, uid_field):
+		return
+	current = {
+		_as_str(r.name): _as_str(r.get(uid_field))
+		for r in frappe.get_all(
+			doctype, filters={"name": ["in", list(local_to_uid)]}, fields=["name", uid_field]
+		)
+	}
+	for local_id, uid in local_to_uid.items():
+		if local_id in current and current[local_id] != uid:
+			frappe.db.set_value(doctype, local_id, uid_field, uid, update_modified=False)
+
+
+FIRELINK_HTTP_ERROR_RE = re.compile(r"^FireLink request failed \((\d{3})\): (.*)$", re.S)
+# Frappe's reply when /api/method/<path> does not resolve to a function.
+FIRELINK_METHOD_MISSING_MARKERS = ("failed to get method", "method not found")
+
+
+def _firelink_bridge_missing(exc: Exception) -> bool:
+	"""True only when the remote host has no such bridge method (older FireLink deployments).
+
+	Errors raised by the bridge itself, such as a DoesNotExistError for a record
+	(also HTTP 404), are not a missing bridge.
+	"""
+	match = FIRELINK_HTTP_ERROR_RE.match(_as_str(exc))
+	if not match:
+		return False
+	status, detail = int(match.group(1)), match.group(2).lower()
+	if any(marker in detail for marker in FIRELINK_METHOD_MISSING_MARKERS):
+		return True
+	return status == 404 and "exc_type" not in detail and "doesnotexisterror" not in detail
+
+
+def _firelink_bulk_remote(
+	method: str, key: str, id_field: str, payloads: list[dict[str, Any]], single: Any
+) -> list[dict[str, Any]]:
+	"""Send `payloads` through a remote bulk bridge; one result per payload, in order.
+
+	Hosts without the bulk bridge fall back to one `single(**payload)` call per record.
+	Any other failure is reported against every payload instead of being retried one by
+	one, so a timeout does not turn into hundreds of further requests.
+	"""
+	try:
+		out = _firelink_remote_bridge_call(
+			f"/api/method/firtrackpro.api.integrations.{method}",
+			_firelink_sync_bridge_payload({key: json.dumps(payloads, default=str)}),
+		)
+	except Exception as exc:
+		if not _firelink_bridge_missing(exc):
+			return [{id_field: _as_str(p.get(id_field)), "error": _as_str(exc)} for p in payloads]
+		results = []
+		for payload in payloads:
+			try:
+				results.append({id_field: _as_str(payload.get(id_field)), **single(**payload)})
+			except Exception as single_exc:
+				results.append({id_field: _as_str(payload.get(id_field)), "error": _as_str(single_exc)})
+		return results
+	remote = out.get("results") if isinstance(out.get("results"), list) else []
+	results = []
+	for idx, payload in enumerate(payloads):
+		row = remote[idx] if idx < len(remote) and isinstance(remote[idx], dict) else None
+		if row is None:
+			row = {id_field: _as_str(payload.get(id_field)), "error": "No result from FireLink bulk sync"}
+		results.append(row)
+	return results
+
+
+@frappe.whitelist(methods=["POST"])
+def firelink_asset_sync_bulk(assets=None):
+	"""Sync many FT Assets to FireLink in one call.
+
+	`assets` is a list (or JSON list) of firelink_asset_sync payloads. Returns
+	one result per input, in order, with local_asset_id -> firelink_asset_id.
+	"""
+	if frappe.session.user == "Guest":
+		frappe.throw("Login required", frappe.PermissionError)
+	payloads = [_firelink_asset_payload(row) for row in _bulk_rows(assets, "assets")]
+	if not payloads:
+		return {"ok": True, "results": []}
+	if _is_firelink_local_site():
+		results = _upsert_fl_assets_local_bulk(payloads)
+	else:
+		results = _firelink_bulk_remote(
+			"firelink_asset_sync_bulk_bridge", "assets", "local_asset_id", payloads, firelink_asset_sync
+		)
+	_write_back_local_firelink_uids(
+		"FT Asset",
+		"asset_firelink_uid",
+		{
+			_as_str(r.get("local_asset_id")): _as_str(r.get("firelink_asset_id"))
+			for r in results
+			if isinstance(r, dict)
+		},
+	)
+	return {"ok": True, "results": results}
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+def firelink_asset_sync_bulk_bridge(**kwargs):
+	if not _is_valid_bridge_call():
+		frappe.throw("Bridge token or approved firetrackpro origin is required", frappe.PermissionError)
+	return {"ok": True, "results": _upsert_fl_assets_local_bulk(_bulk_rows(kwargs.get("assets"), "assets"))}
+
+
+@frappe.whitelist(methods=["POST"])
+def firelink_defect_sync_bulk(defects=None):
+	"""Sync many FT Defects to FireLink in one call; see firelink_asset_sync_bulk."""
+	if frappe.session.user == "Guest":
+		frappe.throw("Login required", frappe.PermissionError)
+	rows = _bulk_rows(defects, "defects")
+	if not rows:
+		return {"ok": True, "results": []}
+	results: list[dict[str, Any] | None] = [None] * len(rows)
+	positions: list[int] = []
+	payloads: list[dict[str, Any]] = []
+	for idx, row in enumerate(rows):
+		try:
+			payloads.append(_firelink_defect_payload(row))
+			positions.append(idx)
+		except Exception as exc:
+			# e.g. the linked asset has not reached FireLink yet.
+			results[idx] = {"local_defect_id": _as_str(row.get("local_defect_id")), "error": _as_str(exc)}
+	if payloads and _is_firelink_local_site():
+		synced = _upsert_fl_defects_local_bulk(payloads)
+	elif payloads:
+		synced = _firelink_bulk_remote(
+			"firelink_defect_sync_bulk_bridge", "defects", "local_defect_id", payloads, firelink_defect_sync
+		)
+	else:
+		synced = []
+	for idx, result in zip(positions, synced, strict=False):
+		results[idx] = result
+	_write_back_local_firelink_uids(
+		"FT Defect",
+		"defect_firelink_uid",
+		{
+			_as_str(r.get("local_defect_id")): _as_str(r.get("firelink_defect_id"))
+			for r in results
+			if isinstance(r, dict)
+		},
+	)
+	return {"ok": True, "results": results}
+
+
+@frappe.whitelist(allow_guest=True, methods=["POST"])
+def firelink_defect_sync_bulk_bridge(**kwargs):
+	if not _is_valid_bridge_call():
+		frappe.throw("Bridge token or approved firetrackpro origin is required", frappe.PermissionError)
+	return {
+		"ok": True,
+		"results": _upsert_fl_defects_local_bulk(_bulk_rows(kwargs.get("defects"), "defects")),
+	}
 
 
 def _xero_verify_webhook_signature(raw_body: bytes, signature_header: str, webhook_key: str) -> bool:
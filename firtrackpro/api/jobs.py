@@ -1,9 +1,16 @@
+import base64
+import hashlib
+import json
+import re
+
 import frappe
 from frappe import _
-import json
+from frappe.utils import get_datetime
+
+from firtrackpro.api import assignments, http_cache, schema_cache
 
 DOCTYPE = "FT Job"
-STORE_HANDOVERS_KEY = "firtrackpro:partner_handovers_json"
+HANDOVER_DOCTYPE = "FT Partner Handover"
 ACTIVE_OUTBOUND_HANDOVER_STATUSES = {"sent", "in_progress", "accepted"}
 
 STATUS_ALIASES = {
@@ -19,34 +26,27 @@ STATUS_ALIASES = {
 _PRIORITY_CANON = {"Low", "Normal", "High", "Urgent"}
 _STATUS_CANON = {"Open", "In Progress", "Completed", "Cancelled"}
 
-_schema_cache: dict[str, str] | None = None
-_opts_cache: dict[str, list[str]] | None = None
+SEARCH_FIELD = "job_search"
+SEARCH_FULLTEXT_INDEX = "job_search_fulltext"
+# InnoDB's default innodb_ft_min_token_size; shorter tokens fall back to LIKE.
+FULLTEXT_MIN_TOKEN = 3
+_TOKEN_SPLIT = re.compile(r"[\W_]+", re.UNICODE)
 
 
 def _get_active_outbound_handover(job_name: str) -> dict | None:
 	if not job_name:
 		return None
-	raw = str(frappe.db.get_default(STORE_HANDOVERS_KEY) or "").strip()
-	if not raw:
-		return None
-	try:
-		rows = json.loads(raw)
-	except Exception:
-		return None
-	if not isinstance(rows, list):
-		return None
-	for row in rows:
-		if not isinstance(row, dict):
-			continue
-		if str(row.get("direction") or "").strip().lower() != "outbound":
-			continue
-		if str(row.get("job_name") or "").strip() != str(job_name).strip():
-			continue
-		status = str(row.get("status") or "").strip().lower()
-		if status not in ACTIVE_OUTBOUND_HANDOVER_STATUSES:
-			continue
-		return row
-	return None
+	rows = frappe.get_all(
+		HANDOVER_DOCTYPE,
+		filters={
+			"job_name": str(job_name).strip(),
+			"direction": "outbound",
+			"status": ["in", sorted(ACTIVE_OUTBOUND_HANDOVER_STATUSES)],
+		},
+		fields=["name", "partner_label", "partner_host", "status"],
+		limit_page_length=1,
+	)
+	return rows[0] if rows else None
 
 
 def _throw_if_outbound_handover_locks_schedule(job_name: str, payload: dict):
@@ -87,12 +87,11 @@ def _fmt_dt(dt) -> str:
 
 
 def _resolve_schema() -> dict[str, str]:
-	global _schema_cache
-	if _schema_cache:
-		return _schema_cache
+	return schema_cache.get_schema(DOCTYPE).derived("jobs.schema", _build_schema)
 
-	meta = frappe.get_meta(DOCTYPE)
-	fields = meta.fields or []
+
+def _build_schema(doctype_schema) -> dict[str, str]:
+	fields = doctype_schema.fields
 
 	def find_link_to(options_name: str) -> str | None:
 		for f in fields:
@@ -168,33 +167,18 @@ def _resolve_schema() -> dict[str, str]:
 	}
 	schema["name"] = "name"
 	schema["modified"] = "modified"
-
-	_schema_cache = schema
 	return schema
 
 
 def _get_select_options(fieldname: str) -> list[str]:
-	global _opts_cache
-	if _opts_cache is None:
-		_opts_cache = {}
-	if fieldname in _opts_cache:
-		return _opts_cache[fieldname]
-	meta = frappe.get_meta(DOCTYPE)
-	f = next((x for x in meta.fields if x.fieldname == fieldname), None)
-	if not f or f.fieldtype != "Select":
-		_opts_cache[fieldname] = []
-		return []
-	opts = [o.strip() for o in (getattr(f, "options", "") or "").split("\n") if o.strip()]
-	_opts_cache[fieldname] = opts
-	return opts
+	return schema_cache.get_schema(DOCTYPE).select_options(fieldname)
 
 
 def _safe_fields(requested: list[str]) -> list[str]:
-	meta = frappe.get_meta(DOCTYPE)
-	colset = {c.fieldname for c in meta.fields}
+	doctype_schema = schema_cache.get_schema(DOCTYPE)
 	out = []
 	for c in requested:
-		if c in ("name", "modified") or c in colset or frappe.db.has_column(DOCTYPE, c):
+		if c in ("name", "modified") or doctype_schema.has_field(c) or doctype_schema.has_column(c):
 			out.append(c)
 	if "name" not in out:
 		out.append("name")
@@ -277,8 +261,101 @@ def _emit_job_event(doc, kind: str):
 	)
 
 
+def search_tokens(text) -> list[str]:
+	return [t for t in _TOKEN_SPLIT.split(str(text or "").lower()) if t]
+
+
+def build_job_search(title=None, status=None, lead_user=None, property_name=None, customer_name=None) -> str:
+	"""Normalised, de-duplicated token string kept in FT Job.job_search for list search."""
+	tokens = []
+	for value in (title, status, lead_user, property_name, customer_name):
+		for token in search_tokens(value):
+			if token not in tokens:
+				tokens.append(token)
+	return " ".join(tokens)
+
+
+def set_job_search(doc, method=None):
+	"""FT Job validate hook: refresh job_search when a searched field changes."""
+	watched = ("job_title", "job_status", "job_lead_user", "job_property", "job_customer")
+	if doc.get(SEARCH_FIELD) and not doc.is_new() and not any(doc.has_value_changed(f) for f in watched):
+		return
+	property_name = (
+		frappe.db.get_value("FT Property", doc.job_property, "property_name") if doc.job_property else None
+	)
+	customer_name = (
+		frappe.db.get_value("Customer", doc.job_customer, "customer_name") if doc.job_customer else None
+	)
+	doc.set(
+		SEARCH_FIELD,
+		build_job_search(
+			doc.job_title,
+			doc.job_status,
+			doc.job_lead_user,
+			property_name or doc.job_property,
+			customer_name or doc.job_customer,
+		),
+	)
+
+
+def _job_search_fulltext() -> bool:
+	if frappe.db.db_type != "mariadb":
+		return False
+	return bool(
+		frappe.cache().get_value(
+			"firtrackpro:job_search_fulltext",
+			generator=lambda: 1 if frappe.db.has_index(f"tab{DOCTYPE}", SEARCH_FULLTEXT_INDEX) else 0,
+		)
+	)
+
+
+def _encode_cursor(modified, name) -> str:
+	raw = json.dumps([str(modified), name], separators=(",", ":")).encode()
+	return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+	try:
+		raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+		modified, name = json.loads(raw)
+		return get_datetime(modified), name
+	except Exception:
+		frappe.throw(_("Invalid cursor"))
+
+
+def _search_conditions(q: str, sch: dict, values: dict) -> list[str]:
+	"""Every search token must match: FULLTEXT prefix match when possible, LIKE otherwise."""
+	tokens = search_tokens(q)
+	if not tokens:
+		return []
+	if not schema_cache.get_schema(DOCTYPE).has_column(SEARCH_FIELD):
+		columns = [c for c in ("name", sch.get("title"), sch.get("assignee"), sch.get("status")) if c]
+		values["like"] = f"%{q}%"
+		return ["(" + " or ".join(f"`{c}` like %(like)s" for c in columns) + ")"]
+	if _job_search_fulltext() and all(len(t) >= FULLTEXT_MIN_TOKEN for t in tokens):
+		values["match"] = " ".join(f"+{t}*" for t in tokens)
+		condition = f"match(`{SEARCH_FIELD}`) against (%(match)s in boolean mode)"
+	else:
+		parts = []
+		for i, token in enumerate(tokens):
+			values[f"token{i}"] = f"%{token}%"
+			parts.append(f"`{SEARCH_FIELD}` like %(token{i})s")
+		condition = " and ".join(parts)
+	# Job numbers are not in job_search (autoincrement names are assigned after validate).
+	if q.strip().isdigit():
+		values["job_name"] = q.strip()
+		condition = f"(`name` = %(job_name)s or ({condition}))"
+	return [condition]
+
+
 @frappe.whitelist()
-def list_jobs(q: str | None = None, limit: int = 100, start: int = 0):
+def list_jobs(q: str | None = None, limit: int = 100, start: int = 0, cursor: str | None = None):
+	"""Jobs newest-modified first, optionally filtered by search text.
+
+	Passing `cursor` (empty for the first page) switches to keyset paging on
+	(modified, name) and returns {"jobs": [...], "next_cursor": ...}; without it
+	the legacy offset paging and plain list response are kept.
+	"""
 	user = frappe.session.user
 	if user in ("Guest", None):
 		frappe.throw(_("Login required"))
@@ -294,29 +371,37 @@ def list_jobs(q: str | None = None, limit: int = 100, start: int = 0):
 		sch.get("priority"),
 	]
 	fields = _safe_fields([c for c in requested_fields if c])
-
-	or_filters = None
-	if q:
-		like = f"%{q}%"
-		searchable = [
-			c
-			for c in [sch.get("name", "name"), sch.get("title"), sch.get("assignee"), sch.get("status")]
-			if c
-		]
-		or_filters = [[DOCTYPE, col, "like", like] for col in searchable]
-
-	rows = frappe.db.get_list(
-		DOCTYPE,
-		fields=fields,
-		or_filters=or_filters,
-		order_by="modified desc",
-		limit=limit,
-		start=start,
-		ignore_permissions=True,
-		as_list=False,
+	limit = max(1, min(int(limit or 100), 500))
+
+	values: dict = {}
+	conditions = _search_conditions(q, sch, values) if q else []
+	if cursor:
+		values["cursor_modified"], values["cursor_name"] = _decode_cursor(cursor)
+		conditions.append(
+			"(`modified` < %(cursor_modified)s"
+			" or (`modified` = %(cursor_modified)s and `name` < %(cursor_name)s))"
+		)
+	where = f"where {' and '.join(conditions)}" if conditions else ""
+	values["limit"] = limit + 1 if cursor is not None else limit
+	values["start"] = 0 if cursor is not None else max(0, int(start or 0))
+	rows = frappe.db.sql(
+		f"""
+		select {", ".join(f"`{c}`" for c in fields)}
+		from `tab{DOCTYPE}`
+		{where}
+		order by `modified` desc, `name` desc
+		limit %(limit)s offset %(start)s
+		""",
+		values,
+		as_dict=True,
 	)
 
-	return [
+	next_cursor = None
+	if cursor is not None and len(rows) > limit:
+		rows = rows[:limit]
+		next_cursor = _encode_cursor(rows[-1].get("modified"), rows[-1].get("name"))
+
+	jobs = [
 		{
 			"id": r.get("name"),
 			"title": r.get(sch.get("title")),
@@ -327,6 +412,9 @@ def list_jobs(q: str | None = None, limit: int = 100, start: int = 0):
 		}
 		for r in rows
 	]
+	if cursor is None:
+		return jobs
+	return {"jobs": jobs, "next_cursor": next_cursor}
 
 
 @frappe.whitelist()
@@ -434,6 +522,67 @@ def get_schema():
 	return {"fields": sch, "status_options": status_opts, "priority_options": priority_opts}
 
 
+_QUOTE_DOCTYPES = {"Quotation", "Sales Order", "FT Quote", "FT Quotation", "FT Sales Order"}
+_INVOICE_DOCTYPES = {"Sales Invoice", "FT Invoice", "FT Sales Invoice"}
+_RELATED_ITEM_FIELDS = ["item_code", "item_name", "description", "qty", "uom", "rate", "amount"]
+
+
+def _build_related_links(schema) -> dict:
+	def find_link_to(candidates: set[str]):
+		for f in schema.fields:
+			if f.fieldtype == "Link" and f.options in candidates:
+				return f.fieldname, f.options
+		return None, None
+
+	return {"quote": find_link_to(_QUOTE_DOCTYPES), "invoice": find_link_to(_INVOICE_DOCTYPES)}
+
+
+def _related_links() -> dict:
+	"""{"quote": (link field, doctype), "invoice": (...)} on FT Job, or (None, None)."""
+	return schema_cache.get_schema(DOCTYPE).derived("jobs.related_links", _build_related_links)
+
+
+def _build_item_table(schema):
+	for f in schema.fields:
+		if f.fieldtype == "Table" and (
+			"item" in (f.fieldname or "").lower() or (f.options or "").lower().endswith(" item")
+		):
+			return f.options
+	return None
+
+
+def _related_items(parent_dt: str, parent_name: str) -> list[dict]:
+	if not parent_dt or not parent_name:
+		return []
+	child_dt = schema_cache.get_schema(parent_dt).derived("jobs.item_table", _build_item_table)
+	if not child_dt:
+		return []
+	child_schema = schema_cache.get_schema(child_dt)
+	cols = ["name", "idx"] + [c for c in _RELATED_ITEM_FIELDS if child_schema.has_column(c)]
+	children = frappe.get_all(
+		child_dt,
+		filters={"parent": parent_name, "parenttype": parent_dt},
+		fields=cols,
+		order_by="idx asc",
+		limit_page_length=0,
+	)
+	out = []
+	for c in children:
+		out.append(
+			{
+				"idx": c.get("idx"),
+				"item_code": c.get("item_code") or "",
+				"item_name": c.get("item_name") or "",
+				"description": c.get("description") or "",
+				"qty": c.get("qty"),
+				"uom": c.get("uom") or "",
+				"rate": c.get("rate"),
+				"amount": c.get("amount"),
+			}
+		)
+	return out
+
+
 @frappe.whitelist()
 def get_related(name: str):
 	user = frappe.session.user
@@ -442,20 +591,9 @@ def get_related(name: str):
 	if not frappe.db.exists("FT Job", name):
 		frappe.throw(_("Job not found"))
 
-	meta = frappe.get_meta("FT Job")
-	fields = meta.fields or []
-
-	CANDIDATE_QUOTES = {"Quotation", "Sales Order", "FT Quote", "FT Quotation", "FT Sales Order"}
-	CANDIDATE_INVS = {"Sales Invoice", "FT Invoice", "FT Sales Invoice"}
-
-	def find_link_to(candidates: set[str]):
-		for f in fields:
-			if getattr(f, "fieldtype", "") == "Link" and getattr(f, "options", "") in candidates:
-				return f.fieldname, f.options
-		return None, None
-
-	quote_link_field, quote_dt = find_link_to(CANDIDATE_QUOTES)
-	inv_link_field, inv_dt = find_link_to(CANDIDATE_INVS)
+	links = _related_links()
+	quote_link_field, quote_dt = links["quote"]
+	inv_link_field, inv_dt = links["invoice"]
 
 	row = (
 		frappe.db.get_value(
@@ -470,47 +608,8 @@ def get_related(name: str):
 	quote_name = row.get(quote_link_field) if quote_link_field else None
 	inv_name = row.get(inv_link_field) if inv_link_field else None
 
-	def pull_items(parent_dt: str, parent_name: str):
-		if not parent_dt or not parent_name or not frappe.db.exists(parent_dt, parent_name):
-			return []
-		parent_meta = frappe.get_meta(parent_dt)
-		tbl = None
-		for f in parent_meta.fields or []:
-			if f.fieldtype == "Table" and (
-				"item" in (f.fieldname or "").lower() or (f.options or "").lower().endswith(" item")
-			):
-				tbl = f
-				break
-		if not tbl:
-			return []
-		cols = ["name", "idx"]
-		for want in ["item_code", "item_name", "description", "qty", "uom", "rate", "amount"]:
-			if frappe.db.has_column(tbl.options, want):
-				cols.append(want)
-		children = frappe.get_all(
-			tbl.options,
-			filters={"parent": parent_name, "parenttype": parent_dt},
-			fields=cols,
-			order_by="idx asc",
-		)
-		out = []
-		for c in children:
-			out.append(
-				{
-					"idx": c.get("idx"),
-					"item_code": c.get("item_code") or "",
-					"item_name": c.get("item_name") or "",
-					"description": c.get("description") or "",
-					"qty": c.get("qty"),
-					"uom": c.get("uom") or "",
-					"rate": c.get("rate"),
-					"amount": c.get("amount"),
-				}
-			)
-		return out
-
-	quote_items = pull_items(quote_dt, quote_name)
-	inv_items = pull_items(inv_dt, inv_name)
+	quote_items = _related_items(quote_dt, quote_name)
+	inv_items = _related_items(inv_dt, inv_name)
 
 	return {
 		"quote_field": quote_link_field,
@@ -562,42 +661,362 @@ def attach_related(name: str, kind: str, docname: str):
 
 
 # ---------------------------------------------------------------------------
-# Assigned-to-me list: Lead User OR Job Crew (via FT Technician mapping)
+# Job bundle: everything the technician app shows for one job, in one call
 # ---------------------------------------------------------------------------
-@frappe.whitelist()
-def list_jobs_assigned(limit: int = 500, active_only: int = 0):
-	"""
-	Return jobs where the current user is:
-	  - Lead user (FT Job.job_lead_user == user), or
-	  - In FT Job Crew (job_crew_technician maps to my FT Technician), or
-	  - Scheduled via FT Schedule (schedule_technician == user)  <-- new
+BUNDLE_JOB_FIELDS = [
+	"name",
+	"modified",
+	"job_title",
+	"job_status",
+	"job_contract",
+	"job_property",
+	"job_customer",
+	"job_instance",
+	"job_required_date",
+	"job_scheduled_start",
+	"job_scheduled_end",
+	"job_lead_user",
+	"job_sla_response_due",
+	"job_sla_restore_due",
+	"job_quote",
+	"job_sales_invoice",
+	"job_report",
+	"job_office_reviewed",
+	"job_finalised_and_locked",
+	"notes",
+]
+# section -> (child doctype, default columns), read with parent = the job.
+BUNDLE_CHILD_TABLES = {
+	"tasks": (
+		"FT Job Task",
+		["name", "idx", "asset", "test_suite", "status", "required_instrument", "instrument", "comments"],
+	),
+	"results": (
+		"FT Job Result",
+		[
+			"name",
+			"idx",
+			"job_result_asset",
+			"job_result_test_item",
+			"job_result__value",
+			"job_result_pass_fail",
+			"job_result_remarks",
+			"job_result_photo",
+		],
+	),
+	"crew": ("FT Job Crew", ["name", "idx", "job_crew_technician", "job_crew_is_lead", "job_crew_role"]),
+	"parts": (
+		"FT Part Usage",
+		[
+			"name",
+			"idx",
+			"part_usage_item",
+			"part_usage_description",
+			"part_usage_qty",
+			"part_usage_rate",
+			"part_usage_serial_lot",
+			"part_usage_warranty_months",
+		],
+	),
+	"defects_created": ("FT Defect Link", ["name", "idx", "defect_link_defect"]),
+}
+BUNDLE_PROPERTY_FIELDS = [
+	"name",
+	"property_name",
+	"property_customer",
+	"property_address",
+	"property_lat",
+	"property_lng",
+	"property_as1851_edition",
+	"property_zone_root",
+	"property_access",
+	"property_front_image",
+	"property_notes",
+]
+BUNDLE_ZONE_FIELDS = [
+	"name",
+	"property_zone_title",
+	"property_zone_path",
+	"property_zone_parent_zone",
+	"is_group",
+	"lft",
+	"rgt",
+]
+BUNDLE_ASSET_FIELDS = [
+	"name",
+	"asset_label",
+	"asset_type",
+	"asset_standard",
+	"asset_make",
+	"asset_model",
+	"asset_serial",
+	"asset_identifier",
+	"asset_zone",
+	"asset_location_level",
+	"asset_location_area",
+	"asset_location_riser",
+	"asset_location_cupboard",
+	"asset_location_room",
+	"asset_location_notes",
+	"asset_status",
+	"asset_last_tested",
+	"asset_next_due",
+]
+BUNDLE_DEFECT_FIELDS = [
+	"name",
+	"defect_job",
+	"defect_asset",
+	"defect_template",
+	"defect_severity",
+	"defect_description",
+	"defect_photo",
+	"defect_status",
+	"defect_quotation",
+	"defect_notes",
+]
+BUNDLE_SCHEDULE_FIELDS = [
+	"name",
+	"schedule_required_date",
+	"schedule_required_end",
+	"schedule_scheduled_start",
+	"schedule_technician",
+	"schedule_bucket",
+	"schedule_ready",
+	"schedule_notes",
+]
+BUNDLE_SECTIONS = (
+	"job",
+	*BUNDLE_CHILD_TABLES,
+	"quote",
+	"invoice",
+	"property",
+	"zones",
+	"assets",
+	"defects",
+	"schedule",
+)
+CLOSED_DEFECT_STATUSES = ["Completed", "Closed"]
+INACTIVE_ASSET_STATUSES = ["Inactive", "Decommissioned"]
+
+
+def _parse_names(value) -> list[str]:
+	"""A JSON list or comma-separated string -> clean list of names."""
+	if not value:
+		return []
+	if isinstance(value, str):
+		value = value.strip()
+		if value.startswith("["):
+			try:
+				value = json.loads(value)
+			except Exception:
+				frappe.throw(_("Invalid list: {0}").format(value))
+		else:
+			value = value.split(",")
+	if not isinstance(value, list | tuple):
+		frappe.throw(_("Expected a list of names"))
+	return [str(v).strip() for v in value if str(v).strip()]
+
+
+def _bundle_projection(include=None, fields=None) -> tuple[set[str], dict]:
+	"""(sections to return, {section: [fields]}) from the request; both default to everything."""
+	sections = set(_parse_names(include)) or set(BUNDLE_SECTIONS)
+	if isinstance(fields, str):
+		try:
+			fields = json.loads(fields) if fields.strip() else {}
+		except Exception:
+			frappe.throw(_("fields must be a JSON object of section -> field list"))
+	if not isinstance(fields, dict | None):
+		frappe.throw(_("fields must be a JSON object of section -> field list"))
+	projection = {str(section): _parse_names(cols) for section, cols in (fields or {}).items()}
+	unknown = (sections | set(projection)) - set(BUNDLE_SECTIONS)
+	if unknown:
+		frappe.throw(_("Unknown job bundle section(s): {0}").format(", ".join(sorted(unknown))))
+	return sections, projection
+
+
+def _bundle_columns(doctype: str, defaults: list[str], requested: list[str] | None = None) -> list[str]:
+	"""`requested` (else `defaults`) narrowed to real columns of `doctype`; `name` always comes first."""
+	schema = schema_cache.get_schema(doctype)
+	return list(dict.fromkeys(["name"] + [c for c in requested or defaults if schema.has_column(c)]))
+
+
+def _bundle_rows(doctype: str, filters: dict, defaults: list[str], requested=None, order_by=None) -> list:
+	return frappe.get_all(
+		doctype,
+		filters=filters,
+		fields=_bundle_columns(doctype, defaults, requested),
+		order_by=order_by,
+		limit_page_length=0,
+	)
 
-	If active_only=1 and a status Select exists, filter to a broader active set.
+
+def _bundle_related(links: dict, kind: str, job: dict, requested=None) -> dict | None:
+	link_field, doctype = links[kind]
+	docname = job.get(link_field) if link_field else None
+	if not docname:
+		return None
+	items = _related_items(doctype, docname)
+	if requested:
+		items = [{k: v for k, v in item.items() if k in requested} for item in items]
+	return {"doctype": doctype, "name": docname, "items": items}
+
+
+def _bundle_defects(property_name, linked: list[str], requested=None) -> list:
+	"""Open defects at the property plus any defect raised on this job, whatever its status."""
+	rows = []
+	if property_name:
+		rows = _bundle_rows(
+			"FT Defect",
+			{"defect_property": property_name, "defect_status": ["not in", CLOSED_DEFECT_STATUSES]},
+			BUNDLE_DEFECT_FIELDS,
+			requested,
+			order_by="modified desc",
+		)
+	seen = {row.name for row in rows}
+	missing = [name for name in linked if name not in seen]
+	if missing:
+		rows += _bundle_rows("FT Defect", {"name": ["in", missing]}, BUNDLE_DEFECT_FIELDS, requested)
+	return rows
+
+
+def _label_tasks(tasks: list):
+	suites = {row.test_suite for row in tasks if row.get("test_suite")}
+	if not suites:
+		return
+	labels = dict(
+		frappe.get_all(
+			"FT Test Suite",
+			filters={"name": ["in", list(suites)]},
+			fields=["name", "test_suite_label"],
+			as_list=True,
+			limit_page_length=0,
+		)
+	)
+	for row in tasks:
+		if row.get("test_suite"):
+			row["test_suite_label"] = labels.get(row.test_suite)
+
+
+@frappe.whitelist()
+def get_job_bundle(name: str, include=None, fields=None, etag: str | None = None):
+	"""The job with its child tables, quote/invoice lines, property, zones, assets,
+	open defects and schedule in one response.
+
+	`include` limits the sections (list or comma-separated, see BUNDLE_SECTIONS);
+	`fields` is {section: [fields]} to narrow each section's columns. The response
+	carries an `etag`; send it back as If-None-Match (or `etag`) to get a 304 when
+	nothing changed.
 	"""
 	user = frappe.session.user
 	if user in ("Guest", None):
 		frappe.throw(_("Login required"))
+	sections, projection = _bundle_projection(include, fields)
+
+	links = _related_links()
+	job_columns = _bundle_columns(DOCTYPE, BUNDLE_JOB_FIELDS, projection.get("job"))
+	needed = ["job_property", links["quote"][0], links["invoice"][0]]
+	columns = list(dict.fromkeys(job_columns + [c for c in needed if c]))
+	row = frappe.db.get_value(DOCTYPE, name, columns, as_dict=True)
+	if not row:
+		frappe.throw(_("Job not found"))
+	job_name = str(row.name)
+
+	bundle = {"name": job_name}
+	if "job" in sections:
+		bundle["job"] = {c: row.get(c) for c in job_columns}
+
+	children = {}
+	for section, (child_dt, defaults) in BUNDLE_CHILD_TABLES.items():
+		wanted = section in sections or (section == "defects_created" and "defects" in sections)
+		if not wanted:
+			continue
+		requested = projection.get(section)
+		if section == "defects_created" and requested:
+			requested = [*requested, "defect_link_defect"]
+		children[section] = _bundle_rows(
+			child_dt,
+			{"parent": job_name, "parenttype": DOCTYPE},
+			defaults,
+			requested,
+			order_by="idx asc",
+		)
+	if "tasks" in children:
+		_label_tasks(children["tasks"])
+	for section, rows in children.items():
+		if section in sections:
+			bundle[section] = rows
+
+	if "quote" in sections:
+		bundle["quote"] = _bundle_related(links, "quote", row, projection.get("quote"))
+	if "invoice" in sections:
+		bundle["invoice"] = _bundle_related(links, "invoice", row, projection.get("invoice"))
+
+	property_name = row.get("job_property")
+	if "property" in sections:
+		bundle["property"] = (
+			frappe.db.get_value(
+				"FT Property",
+				property_name,
+				_bundle_columns("FT Property", BUNDLE_PROPERTY_FIELDS, projection.get("property")),
+				as_dict=True,
+			)
+			if property_name
+			else None
+		)
+	if "zones" in sections:
+		bundle["zones"] = (
+			_bundle_rows(
+				"FT Property Zone",
+				{"property_zone_property": property_name},
+				BUNDLE_ZONE_FIELDS,
+				projection.get("zones"),
+				order_by="lft asc, name asc",
+			)
+			if property_name
+			else []
+		)
+	if "assets" in sections:
+		bundle["assets"] = (
+			_bundle_rows(
+				"FT Asset",
+				{"asset_property": property_name, "asset_status": ["not in", INACTIVE_ASSET_STATUSES]},
+				BUNDLE_ASSET_FIELDS,
+				projection.get("assets"),
+				order_by="asset_label asc, name asc",
+			)
+			if property_name
+			else []
+		)
+	if "defects" in sections:
+		linked = [r.defect_link_defect for r in children.get("defects_created", []) if r.defect_link_defect]
+		bundle["defects"] = _bundle_defects(property_name, linked, projection.get("defects"))
+	if "schedule" in sections:
+		bundle["schedule"] = _bundle_rows(
+			"FT Schedule",
+			{"schedule_job": job_name},
+			BUNDLE_SCHEDULE_FIELDS,
+			projection.get("schedule"),
+			order_by="schedule_scheduled_start asc, name asc",
+		)
+
+	bundle["etag"] = http_cache.payload_etag(bundle)
+	return http_cache.conditional_response(bundle, bundle["etag"], etag)
+
+
+def _assigned_job_names(user: str, limit: int = 500, statuses: list[str] | None = None) -> list:
+	"""Jobs where `user` is lead, crew (via FT Technician) or the FT Schedule technician."""
+	if frappe.db.table_exists(assignments.ASSIGNMENT_DOCTYPE):
+		return assignments.assigned_job_names(user, limit, statuses)
+	return list(_scan_assigned_job_names(user, limit))
 
-	sch = _resolve_schema()
-	fields = _safe_fields(
-		[
-			sch.get("name", "name"),
-			sch.get("modified", "modified"),
-			sch.get("title"),
-			sch.get("status"),
-			sch.get("property"),
-			sch.get("due_date"),
-			sch.get("scheduled_start"),
-			sch.get("scheduled_end"),
-			sch.get("priority"),
-		]
-	)
 
+def _scan_assigned_job_names(user: str, limit: int = 500) -> set:
+	"""Pre-index fallback: union of lead, crew and schedule lookups."""
 	# A) Lead jobs
-	lead_field = "job_lead_user" if frappe.db.has_column(DOCTYPE, "job_lead_user") else None
+	job_schema = schema_cache.get_schema(DOCTYPE)
+	lead_field = "job_lead_user" if job_schema.has_column("job_lead_user") else None
 	if not lead_field:
-		meta = frappe.get_meta(DOCTYPE)
-		for f in meta.fields or []:
+		for f in job_schema.fields:
 			if (
 				getattr(f, "fieldtype", "") in ("Link", "Data")
 				and "lead" in (f.fieldname or "").lower()
@@ -612,7 +1031,10 @@ def list_jobs_assigned(limit: int = 500, active_only: int = 0):
 
 	# B) Crew jobs (via FT Technician)
 	crew_names = set()
-	tech_name = frappe.db.get_value("FT Technician", {"technician_user": user}, "name")
+	tech_user_field = (
+		"user" if schema_cache.get_schema("FT Technician").has_column("user") else "technician_user"
+	)
+	tech_name = frappe.db.get_value("FT Technician", {tech_user_field: user}, "name")
 	if tech_name and frappe.db.exists("DocType", "FT Job Crew"):
 		for r in frappe.get_all(
 			"FT Job Crew", filters={"job_crew_technician": tech_name}, fields=["parent"], limit=10000
@@ -628,23 +1050,54 @@ def list_jobs_assigned(limit: int = 500, active_only: int = 0):
 			if r.get("schedule_job"):
 				sched_names.add(r["schedule_job"])
 
-	job_names = list(lead_names | crew_names | sched_names)
-	if not job_names:
-		return []
+	return lead_names | crew_names | sched_names
 
-	filters = [[DOCTYPE, "name", "in", job_names]]
+
+# ---------------------------------------------------------------------------
+# Assigned-to-me list: Lead User OR Job Crew (via FT Technician mapping)
+# ---------------------------------------------------------------------------
+@frappe.whitelist()
+def list_jobs_assigned(limit: int = 500, active_only: int = 0):
+	"""
+	Return jobs where the current user is:
+	  - Lead user (FT Job.job_lead_user == user), or
+	  - In FT Job Crew (job_crew_technician maps to my FT Technician), or
+	  - Scheduled via FT Schedule (schedule_technician == user)  <-- new
+
+	If active_only=1 and a status Select exists, filter to a broader active set.
+	"""
+	user = frappe.session.user
+	if user in ("Guest", None):
+		frappe.throw(_("Login required"))
+
+	sch = _resolve_schema()
+	fields = _safe_fields(
+		[
+			sch.get("name", "name"),
+			sch.get("modified", "modified"),
+			sch.get("title"),
+			sch.get("status"),
+			sch.get("property"),
+			sch.get("due_date"),
+			sch.get("scheduled_start"),
+			sch.get("scheduled_end"),
+			sch.get("priority"),
+		]
+	)
 
 	# Broader active statuses, optional
 	status_field = sch.get("status")
+	active_statuses = None
 	if active_only and status_field and _get_select_options(status_field):
-		filters.append(
-			[
-				DOCTYPE,
-				status_field,
-				"in",
-				["Draft", "Planned", "Scheduled", "In Progress", "Complete", "Office Review"],
-			]
-		)
+		active_statuses = ["Draft", "Planned", "Scheduled", "In Progress", "Complete", "Office Review"]
+
+	job_names = _assigned_job_names(user, limit, active_statuses)
+	if not job_names:
+		return []
+
+	filters = [[DOCTYPE, "name", "in", job_names]]
+	if active_statuses:
+		filters.append([DOCTYPE, status_field, "in", active_statuses])
 
 	rows = frappe.db.get_list(
 		DOCTYPE,
@@ -7,10 +7,68 @@ from urllib.parse import urlparse
 import frappe
 from frappe.utils import random_string
 
+from firtrackpro.api import http_client, schema_cache
+
+LINK_DOCTYPE = "FT Partner Link"
+HANDOVER_DOCTYPE = "FT Partner Handover"
+REQUEST_DOCTYPE = "FT Partner Link Request"
+
+# Legacy JSON stores; only read by the v16_0 migration patch now.
 STORE_KEY = "firtrackpro:partner_links_json"
 STORE_HANDOVERS_KEY = "firtrackpro:partner_handovers_json"
 STORE_REQUESTS_KEY = "firtrackpro:partner_link_requests_json"
 
+LINK_FIELDS = [
+    "label",
+    "tenant_host",
+    "api_base_url",
+    "outbound_api_key",
+    "inbound_api_key",
+    "status",
+    "notes",
+    "supplier",
+    "created_at",
+    "updated_at",
+]
+HANDOVER_FIELDS = [
+    "job_name",
+    "job_title",
+    "partner_link_id",
+    "partner_label",
+    "partner_host",
+    "status",
+    "direction",
+    "partner_job_ref",
+    "accepted_job_name",
+    "notes",
+    "source_property_name",
+    "source_property_address",
+    "source_property_address_name",
+    "source_property_firelink_uid",
+    "source_property_address_firelink_uid",
+    "source_tasks",
+    "source_assets",
+    "source_items",
+    "source_defects",
+    "source_customer",
+    "source_quote_ref",
+    "linked_supplier_quote_ref",
+    "created_at",
+    "updated_at",
+]
+HANDOVER_LIST_FIELDS = {"source_tasks", "source_assets", "source_items", "source_defects"}
+REQUEST_FIELDS = [
+    "from_host",
+    "from_company",
+    "to_host",
+    "to_company",
+    "status",
+    "direction",
+    "created_at",
+    "updated_at",
+    "responded_at",
+]
+
 FIRETRACK_SUFFIX = "firetrackpro.com.au"
 
 
@@ -29,32 +87,114 @@ def _load_json_list(store_key):
     return data if isinstance(data, list) else []
 
 
-def _save_json_list(store_key, rows):
-    frappe.db.set_default(store_key, json.dumps(rows))
+def _row_from_record(record):
+    row = dict(record or {})
+    row["id"] = str(row.pop("name", "") or "")
+    for key in HANDOVER_LIST_FIELDS:
+        if key not in row:
+            continue
+        raw = row.get(key)
+        try:
+            parsed = json.loads(raw) if raw else []
+        except Exception:
+            parsed = []
+        row[key] = parsed if isinstance(parsed, list) else []
+    for key, value in list(row.items()):
+        if value is None:
+            row[key] = ""
+    return row
+
+
+def _record_values(row, fields):
+    values = {}
+    for key in fields:
+        if key not in row:
+            continue
+        value = row.get(key)
+        if key in HANDOVER_LIST_FIELDS:
+            value = json.dumps(value if isinstance(value, list) else [])
+        values[key] = "" if value is None else value
+    return values
+
+
+def _get_record(doctype, row_id, fields):
+    rid = str(row_id or "").strip()
+    if not rid:
+        return None
+    record = frappe.db.get_value(doctype, rid, ["name", *fields], as_dict=True)
+    return _row_from_record(record) if record else None
+
+
+def _find_records(doctype, fields, filters=None, order_by="updated_at desc", limit=None):
+    kwargs = {"filters": filters or {}, "fields": ["name", *fields], "order_by": order_by}
+    if limit:
+        kwargs["limit_page_length"] = limit
+    return [_row_from_record(r) for r in frappe.get_all(doctype, **kwargs)]
+
+
+def _save_record(doctype, id_field, fields, row):
+    """Insert or update one row; only the given row is written, never the whole store."""
+    row_id = str(row.get("id") or "").strip() or str(uuid.uuid4())
+    row["id"] = row_id
+    values = _record_values(row, fields)
+    if frappe.db.exists(doctype, row_id):
+        if values:
+            frappe.db.set_value(doctype, row_id, values)
+    else:
+        doc = frappe.get_doc({"doctype": doctype, id_field: row_id, **values})
+        doc.insert(ignore_permissions=True)
+    return row
 
 
 def _load_links():
-    return _load_json_list(STORE_KEY)
+    return _find_records(LINK_DOCTYPE, LINK_FIELDS, order_by="creation asc")
+
+
+def _get_link(link_id):
+    return _get_record(LINK_DOCTYPE, link_id, LINK_FIELDS)
+
 
+def _save_link(row):
+    return _save_record(LINK_DOCTYPE, "partner_link_id", LINK_FIELDS, row)
 
-def _save_links(rows):
-    _save_json_list(STORE_KEY, rows)
 
+def _delete_link(link_id):
+    rid = str(link_id or "").strip()
+    if rid and frappe.db.exists(LINK_DOCTYPE, rid):
+        frappe.delete_doc(LINK_DOCTYPE, rid, ignore_permissions=True, force=1)
 
-def _load_handovers():
-    return _load_json_list(STORE_HANDOVERS_KEY)
 
+def _get_handover(handover_id):
+    return _get_record(HANDOVER_DOCTYPE, handover_id, HANDOVER_FIELDS)
 
-def _save_handovers(rows):
-    _save_json_list(STORE_HANDOVERS_KEY, rows)
 
+def _find_handovers(filters=None, limit=None):
+    return _find_records(HANDOVER_DOCTYPE, HANDOVER_FIELDS, filters=filters, limit=limit)
 
-def _load_requests():
-    return _load_json_list(STORE_REQUESTS_KEY)
 
+def _save_handover(row):
+    return _save_record(HANDOVER_DOCTYPE, "handover_id", HANDOVER_FIELDS, row)
+
+
+def _get_request(request_id):
+    row = _get_record(REQUEST_DOCTYPE, request_id, REQUEST_FIELDS)
+    if row:
+        row["request_id"] = row["id"]
+    return row
+
+
+def _load_requests(direction=None):
+    filters = {"direction": direction} if direction else None
+    rows = _find_records(REQUEST_DOCTYPE, REQUEST_FIELDS, filters=filters)
+    for row in rows:
+        row["request_id"] = row["id"]
+    return rows
 
-def _save_requests(rows):
-    _save_json_list(STORE_REQUESTS_KEY, rows)
+
+def _save_request(row):
+    row["id"] = str(row.get("request_id") or row.get("id") or "").strip() or str(uuid.uuid4())
+    row["request_id"] = row["id"]
+    return _save_record(REQUEST_DOCTYPE, "request_id", REQUEST_FIELDS, row)
 
 
 def _normalize_host(value):
@@ -98,21 +238,10 @@ def _require_uid(label, value):
 
 
 def _existing_fields(doctype, candidates):
-    out = []
     try:
-        meta = frappe.get_meta(doctype)
+        return schema_cache.get_schema(doctype).existing(candidates)
     except Exception:
-        meta = None
-    for fieldname in candidates:
-        if fieldname == "name":
-            out.append(fieldname)
-            continue
-        try:
-            if meta and meta.has_field(fieldname):
-                out.append(fieldname)
-        except Exception:
-            continue
-    return out
+        return [fieldname for fieldname in candidates if fieldname == "name"]
 
 
 def _primary_company_name():
@@ -291,28 +420,20 @@ def _build_request_row(row):
 
 def _find_link_by_host(host):
     h = _normalize_host(host)
-    return next((r for r in _load_links() if _normalize_host(r.get("tenant_host")) == h), None)
+    if not h:
+        return None
+    rows = _find_records(LINK_DOCTYPE, LINK_FIELDS, filters={"tenant_host": h}, order_by="creation asc", limit=1)
+    return rows[0] if rows else None
 
 
 def _upsert_link(payload):
-    rows = _load_links()
     row_id = str(payload.get("id") or "").strip() or str(uuid.uuid4())
     now = _now_iso()
-    idx = -1
-    for i, row in enumerate(rows):
-        if str(row.get("id") or "") == row_id:
-            idx = i
-            break
-    if idx >= 0:
-        payload["created_at"] = str(rows[idx].get("created_at") or now)
-        payload["updated_at"] = now
-        rows[idx] = payload
-    else:
-        payload["id"] = row_id
-        payload["created_at"] = now
-        payload["updated_at"] = now
-        rows.append(payload)
-    _save_links(rows)
+    existing = _get_link(row_id)
+    payload["id"] = row_id
+    payload["created_at"] = str((existing or {}).get("created_at") or now)
+    payload["updated_at"] = now
+    _save_link(payload)
     return payload
 
 
@@ -446,15 +567,14 @@ def _suggest_suppliers_for_partner(company_name, host, query=None, limit=12):
     return ranked[: max(1, int(limit or 12))]
 
 def _mark_request_status(request_id, status):
-    rows = _load_requests()
+    row = _get_request(request_id)
+    if not row:
+        return
     now = _now_iso()
-    for row in rows:
-        if str(row.get("request_id") or row.get("id") or "") != str(request_id):
-            continue
-        row["status"] = status
-        row["updated_at"] = now
-        row["responded_at"] = now
-    _save_requests(rows)
+    row["status"] = status
+    row["updated_at"] = now
+    row["responded_at"] = now
+    _save_request(row)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -522,7 +642,7 @@ def delete_partner_link(id=None):
     row_id = str(id or "").strip()
     if not row_id:
         frappe.throw("Partner link id is required.")
-    _save_links([row for row in _load_links() if str(row.get("id") or "") != row_id])
+    _delete_link(row_id)
     return {"ok": True}
 
 
@@ -531,21 +651,19 @@ def test_partner_link(id=None):
     row_id = str(id or "").strip()
     if not row_id:
         frappe.throw("Partner link id is required.")
-    row = next((r for r in _load_links() if str(r.get("id") or "") == row_id), None)
+    row = _get_link(row_id)
     if not row:
         frappe.throw("Partner link was not found.")
 
     host = str(row.get("tenant_host") or "").strip().lower()
     base = str(row.get("api_base_url") or "").strip() or "https://{0}".format(host)
 
-    import requests
-
     for url in [
         "{0}/api/method/ping".format(base),
         "{0}/api/method/frappe.auth.get_logged_user".format(base),
     ]:
         try:
-            res = requests.get(url, timeout=8)
+            res = http_client.get(url, timeout=8)
             if res.status_code in (200, 401, 403):
                 return {"ok": True, "message": "Reachable: {0} (HTTP {1})".format(url, res.status_code)}
         except Exception:
@@ -569,12 +687,10 @@ def verify_partner_tenant(tenant=None):
     if target_host == _site_host():
         frappe.throw("Cannot verify the same tenant.")
 
-    import requests
-
     target_base = "https://{0}".format(target_host)
     meta_url = "{0}/api/method/firtrackpro.api.partner_links.partner_link_handshake_meta".format(target_base)
     try:
-        res = requests.get(meta_url, timeout=12)
+        res = http_client.get(meta_url, timeout=12)
         if res.status_code != 200:
             frappe.throw("Tenant exists check failed (HTTP {0}).".format(res.status_code))
         payload = res.json()
@@ -603,12 +719,10 @@ def create_partner_link_request(tenant=None):
     if target_host == source_host:
         frappe.throw("Cannot request connection to the same tenant.")
 
-    import requests
-
     target_base = "https://{0}".format(target_host)
     meta_url = "{0}/api/method/firtrackpro.api.partner_links.partner_link_handshake_meta".format(target_base)
     try:
-        meta_res = requests.get(meta_url, timeout=12)
+        meta_res = http_client.get(meta_url, timeout=12)
         if meta_res.status_code != 200:
             frappe.throw("Tenant exists check failed (HTTP {0}).".format(meta_res.status_code))
         meta = meta_res.json().get("message", {}) if isinstance(meta_res.json(), dict) else {}
@@ -633,9 +747,7 @@ def create_partner_link_request(tenant=None):
         "updated_at": now,
         "responded_at": "",
     }
-    requests_rows = _load_requests()
-    requests_rows.append(local_row)
-    _save_requests(requests_rows)
+    _save_request(local_row)
 
     incoming_url = "{0}/api/method/firtrackpro.api.partner_links.receive_partner_link_request".format(target_base)
     payload = {
@@ -646,7 +758,7 @@ def create_partner_link_request(tenant=None):
         "to_company": target_company,
     }
     try:
-        incoming_res = requests.post(incoming_url, json=payload, timeout=12)
+        incoming_res = http_client.post(incoming_url, json=payload, timeout=12)
         if incoming_res.status_code != 200:
             frappe.throw("Target tenant rejected request (HTTP {0}).".format(incoming_res.status_code))
     except Exception as exc:
@@ -668,8 +780,7 @@ def receive_partner_link_request(request_id=None, from_host=None, from_company=N
     if not source_host:
         frappe.throw("from_host is required.")
 
-    rows = _load_requests()
-    if any(str(r.get("request_id") or r.get("id") or "") == rid for r in rows):
+    if _get_request(rid):
         return {"ok": True, "message": "Request already exists."}
 
     row = {
@@ -685,23 +796,14 @@ def receive_partner_link_request(request_id=None, from_host=None, from_company=N
         "updated_at": now,
         "responded_at": "",
     }
-    rows.append(row)
-    _save_requests(rows)
+    _save_request(row)
     return {"ok": True}
 
 
 @frappe.whitelist(allow_guest=False)
 def list_partner_link_requests(direction=None):
     d = str(direction or "").strip().lower()
-    out = []
-    for row in _load_requests():
-        if not isinstance(row, dict):
-            continue
-        if d and str(row.get("direction") or "").strip().lower() != d:
-            continue
-        out.append(_build_request_row(row))
-    out.sort(key=lambda r: str(r.get("updated_at") or ""), reverse=True)
-    return out
+    return [_build_request_row(row) for row in _load_requests(direction=d or None)]
 
 
 @frappe.whitelist(allow_guest=False)
@@ -713,13 +815,7 @@ def respond_partner_link_request(id=None, action=None):
     if act not in {"accept", "decline", "disconnect"}:
         frappe.throw("Invalid action.")
 
-    rows = _load_requests()
-    target = None
-    for row in rows:
-        if str(row.get("id") or row.get("request_id") or "") != rid:
-            continue
-        target = row
-        break
+    target = _get_request(rid)
     if not target:
         frappe.throw("Request not found.")
 
@@ -728,8 +824,6 @@ def respond_partner_link_request(id=None, action=None):
     selected_supplier = str(frappe.form_dict.get("supplier") or "").strip()
     create_new_supplier = str(frappe.form_dict.get("create_new_supplier") or "0").strip().lower() in {"1", "true", "yes"}
 
-    import requests
-
     if act == "accept":
         incoming_key = random_string(40)
         outgoing_key = random_string(40)
@@ -764,7 +858,7 @@ def respond_partner_link_request(id=None, action=None):
             "remote_company": _primary_company_name(),
         }
         try:
-            res = requests.post(finalize_url, json=payload, timeout=12)
+            res = http_client.post(finalize_url, json=payload, timeout=12)
             if res.status_code != 200:
                 frappe.throw("Failed finalizing on remote tenant (HTTP {0}).".format(res.status_code))
         except Exception as exc:
@@ -773,18 +867,18 @@ def respond_partner_link_request(id=None, action=None):
         target["status"] = "accepted"
         target["updated_at"] = _now_iso()
         target["responded_at"] = _now_iso()
-        _save_requests(rows)
+        _save_request(target)
         return {"ok": True, "message": "Request accepted. Link activated and keys exchanged.", "supplier": supplier_name}
 
     if act == "decline":
         target["status"] = "declined"
         target["updated_at"] = _now_iso()
         target["responded_at"] = _now_iso()
-        _save_requests(rows)
+        _save_request(target)
 
         try:
             notify_url = "https://{0}/api/method/firtrackpro.api.partner_links.remote_request_status_update".format(source_host)
-            requests.post(notify_url, json={"request_id": rid, "status": "declined"}, timeout=8)
+            http_client.post(notify_url, json={"request_id": rid, "status": "declined"}, timeout=8)
         except Exception:
             pass
 
@@ -798,11 +892,11 @@ def respond_partner_link_request(id=None, action=None):
     target["status"] = "disconnected"
     target["updated_at"] = _now_iso()
     target["responded_at"] = _now_iso()
-    _save_requests(rows)
+    _save_request(target)
 
     try:
         notify_url = "https://{0}/api/method/firtrackpro.api.partner_links.remote_request_status_update".format(source_host)
-        requests.post(notify_url, json={"request_id": rid, "status": "disconnected"}, timeout=8)
+        http_client.post(notify_url, json={"request_id": rid, "status": "disconnected"}, timeout=8)
     except Exception:
         pass
 
@@ -815,12 +909,7 @@ def finalize_partner_link_request(request_id=None, remote_inbound_key=None, remo
     if not rid:
         frappe.throw("request_id is required.")
 
-    rows = _load_requests()
-    target = None
-    for row in rows:
-        if str(row.get("request_id") or row.get("id") or "") == rid:
-            target = row
-            break
+    target = _get_request(rid)
     if not target:
         frappe.throw("Request not found.")
 
@@ -835,7 +924,7 @@ def finalize_partner_link_request(request_id=None, remote_inbound_key=None, remo
     target["status"] = "accepted"
     target["updated_at"] = _now_iso()
     target["responded_at"] = _now_iso()
-    _save_requests(rows)
+    _save_request(target)
     return {"ok": True}
 
 
@@ -858,8 +947,7 @@ def get_partner_link_supplier(partner_link_id=None, ensure=1):
     link_id = str(partner_link_id or "").strip()
     if not link_id:
         frappe.throw("partner_link_id is required.")
-    links = _load_links()
-    target = next((r for r in links if str(r.get("id") or "") == link_id), None)
+    target = _get_link(link_id)
     if not target:
         frappe.throw("Partner link not found.")
 
@@ -882,8 +970,7 @@ def suggest_partner_link_suppliers(request_id=None, query=None):
     rid = str(request_id or "").strip()
     if not rid:
         frappe.throw("request_id is required.")
-    rows = _load_requests()
-    target = next((row for row in rows if str(row.get("id") or row.get("request_id") or "") == rid), None)
+    target = _get_request(rid)
     if not target:
         frappe.throw("Request not found.")
 
@@ -906,7 +993,7 @@ def create_handover_job(job_name=None, partner_link_id=None, notes=None):
     if not link_id:
         frappe.throw("partner_link_id is required.")
 
-    link = next((r for r in _load_links() if str(r.get("id") or "") == link_id), None)
+    link = _get_link(link_id)
     if not link:
         frappe.throw("Partner link was not found.")
     if str(link.get("status") or "active") == "inactive":
@@ -1245,21 +1332,9 @@ def create_handover_job(job_name=None, partner_link_id=None, notes=None):
     except Exception:
         source_defects = []
 
-    rows = _load_handovers()
-    outbound_for_job = []
-    for existing in rows:
-        if not isinstance(existing, dict):
-            continue
-        if str(existing.get("direction") or "").strip().lower() != "outbound":
-            continue
-        if str(existing.get("job_name") or "").strip() != job_id:
-            continue
-        outbound_for_job.append(existing)
+    outbound_for_job = _find_handovers({"direction": "outbound", "job_name": job_id}, limit=1)
     if outbound_for_job:
-        latest = max(
-            outbound_for_job,
-            key=lambda r: str(r.get("updated_at") or r.get("created_at") or ""),
-        )
+        latest = outbound_for_job[0]
         latest_status = str(latest.get("status") or "").strip().lower() or "sent"
         active_statuses = {"sent", "accepted", "in_progress", "cancel_requested"}
         if latest_status in active_statuses:
@@ -1295,8 +1370,7 @@ def create_handover_job(job_name=None, partner_link_id=None, notes=None):
         "updated_at": now,
     }
 
-    rows.append(row)
-    _save_handovers(rows)
+    _save_handover(row)
     _publish_handover_event("created", row)
 
     _push_handover_to_partner(link, row)
@@ -1311,8 +1385,6 @@ def _push_handover_to_partner(link, row):
     if not base:
         return
 
-    import requests
-
     headers = {"Content-Type": "application/json"}
     if outbound_api_key:
         headers["X-FireTrack-Partner-Key"] = outbound_api_key
@@ -1345,7 +1417,7 @@ def _push_handover_to_partner(link, row):
     }
 
     try:
-        res = requests.post(
+        res = http_client.post(
             "{0}/api/method/firtrackpro.api.partner_links.receive_handover_job".format(base.rstrip("/")),
             json=payload,
             headers=headers,
@@ -1358,13 +1430,12 @@ def _push_handover_to_partner(link, row):
             except Exception:
                 partner_ref = ""
             if partner_ref:
-                rows = _load_handovers()
-                for item in rows:
-                    if str(item.get("id") or "") == str(row.get("id") or ""):
-                        item["partner_job_ref"] = partner_ref
-                        item["updated_at"] = _now_iso()
-                        _publish_handover_event("partner_ack", item, {"partner_job_ref": partner_ref})
-                _save_handovers(rows)
+                item = _get_handover(row.get("id"))
+                if item:
+                    item["partner_job_ref"] = partner_ref
+                    item["updated_at"] = _now_iso()
+                    _save_handover(item)
+                    _publish_handover_event("partner_ack", item, {"partner_job_ref": partner_ref})
         else:
             body = ""
             try:
@@ -1380,15 +1451,15 @@ def _push_handover_to_partner(link, row):
 
 
 def _mark_handover_failed(handover_id, error_text):
-    rows = _load_handovers()
-    for item in rows:
-        if str(item.get("id") or "") == str(handover_id):
-            item["status"] = "failed"
-            base_notes = str(item.get("notes") or "").strip()
-            item["notes"] = (base_notes + "\n" if base_notes else "") + str(error_text or "")
-            item["updated_at"] = _now_iso()
-            _publish_handover_event("failed", item, {"error": str(error_text or "")})
-    _save_handovers(rows)
+    item = _get_handover(handover_id)
+    if not item:
+        return
+    item["status"] = "failed"
+    base_notes = str(item.get("notes") or "").strip()
+    item["notes"] = (base_notes + "\n" if base_notes else "") + str(error_text or "")
+    item["updated_at"] = _now_iso()
+    _save_handover(item)
+    _publish_handover_event("failed", item, {"error": str(error_text or "")})
 
 
 def _cancel_job_for_handover(handover_row, reason_text=None):
@@ -1439,8 +1510,6 @@ def _notify_partner_handover_cancel(link, row, reason_text=None):
     if not base:
         return
 
-    import requests
-
     headers = {"Content-Type": "application/json"}
     if outbound_api_key:
         headers["X-FireTrack-Partner-Key"] = outbound_api_key
@@ -1452,7 +1521,7 @@ def _notify_partner_handover_cancel(link, row, reason_text=None):
         "reason": str(reason_text or "").strip(),
     }
     try:
-        requests.post(
+        http_client.post(
             "{0}/api/method/firtrackpro.api.partner_links.receive_handover_cancellation".format(
                 base.rstrip("/")
             ),
@@ -1766,7 +1835,7 @@ def _append_handover_items(job, row):
 
 def _auto_create_supplier_quote_and_po(row, created_job_name):
     link_id = str(row.get("partner_link_id") or "").strip()
-    link = next((r for r in _load_links() if str(r.get("id") or "").strip() == link_id), None)
+    link = _get_link(link_id)
     if not link:
         return {"linked_supplier_quote_ref": "", "created_purchase_order_ref": "", "note": "partner link not found"}
 
@@ -1942,12 +2011,10 @@ def receive_handover_job(
     provided_key = frappe.get_request_header("X-FireTrack-Partner-Key") or ""
     link = None
 
-    all_links = _load_links()
     if partner_link_id:
-        link = next((r for r in all_links if str(r.get("id") or "") == str(partner_link_id)), None)
+        link = _get_link(partner_link_id)
     if not link and source_tenant_host:
-        host = _normalize_host(source_tenant_host)
-        link = next((r for r in all_links if str(r.get("tenant_host") or "") == host), None)
+        link = _find_link_by_host(source_tenant_host)
     if not link:
         frappe.throw("Partner link not found.")
 
@@ -2024,10 +2091,8 @@ def receive_handover_job(
         "updated_at": now,
     }
 
-    rows = _load_handovers()
-    if not any(str(r.get("id") or "") == incoming["id"] for r in rows):
-        rows.append(incoming)
-        _save_handovers(rows)
+    if not frappe.db.exists(HANDOVER_DOCTYPE, incoming["id"]):
+        _save_handover(incoming)
         _publish_handover_event("received", incoming)
 
     return {"ok": True, "partner_job_ref": incoming["id"]}
@@ -2039,20 +2104,14 @@ def list_handover_jobs(direction=None, status=None, job_name=None):
     status_filter = str(status or "").strip().lower()
     job_filter = str(job_name or "").strip()
 
-    out = []
-    for row in _load_handovers():
-        if not isinstance(row, dict):
-            continue
-        if direction_filter and str(row.get("direction") or "").strip().lower() != direction_filter:
-            continue
-        if status_filter and str(row.get("status") or "").strip().lower() != status_filter:
-            continue
-        if job_filter and str(row.get("job_name") or "").strip() != job_filter:
-            continue
-        out.append(_build_handover_row(row))
-
-    out.sort(key=lambda r: str(r.get("updated_at") or ""), reverse=True)
-    return out
+    filters = {}
+    if direction_filter:
+        filters["direction"] = direction_filter
+    if status_filter:
+        filters["status"] = status_filter
+    if job_filter:
+        filters["job_name"] = job_filter
+    return [_build_handover_row(row) for row in _find_handovers(filters)]
 
 
 @frappe.whitelist(allow_guest=False)
@@ -2064,21 +2123,13 @@ def update_handover_job_status(id=None, status=None, notes=None):
     if next_status not in {"accepted", "rejected", "in_progress", "completed", "cancelled"}:
         frappe.throw("Invalid handover status.")
 
-    rows = _load_handovers()
-    target = None
-    now = _now_iso()
-    for row in rows:
-        if str(row.get("id") or "") != row_id:
-            continue
-        row["status"] = next_status
-        row["updated_at"] = now
-        if notes is not None:
-            row["notes"] = str(notes or "").strip()
-        target = row
-        break
-
+    target = _get_handover(row_id)
     if not target:
         frappe.throw("Handover was not found.")
+    target["status"] = next_status
+    target["updated_at"] = _now_iso()
+    if notes is not None:
+        target["notes"] = str(notes or "").strip()
 
     auto_docs = {"linked_supplier_quote_ref": "", "created_purchase_order_ref": "", "note": ""}
     if next_status == "accepted":
@@ -2100,19 +2151,12 @@ def update_handover_job_status(id=None, status=None, notes=None):
         cancel_reason = str(notes or "").strip() or "Cancelled by handover participant."
         _cancel_job_for_handover(target, cancel_reason)
 
-    _save_handovers(rows)
+    _save_handover(target)
     _publish_handover_event("status_changed", target, {"status": next_status})
     if next_status == "accepted":
         _publish_job_event("created_from_handover", target.get("accepted_job_name"))
     elif next_status == "cancelled":
-        link = next(
-            (
-                r
-                for r in _load_links()
-                if str(r.get("id") or "").strip() == str(target.get("partner_link_id") or "").strip()
-            ),
-            None,
-        )
+        link = _get_link(target.get("partner_link_id"))
         if link:
             _notify_partner_handover_cancel(link, target, str(notes or "").strip())
     out = _build_handover_row(target)
@@ -2140,80 +2184,53 @@ def receive_handover_cancellation(
 ):
     provided_key = frappe.get_request_header("X-FireTrack-Partner-Key") or ""
     link = None
-    all_links = _load_links()
     link_id = str(partner_link_id or "").strip()
     if link_id:
-        link = next((r for r in all_links if str(r.get("id") or "").strip() == link_id), None)
-    if source_tenant_host:
-        host = _normalize_host(source_tenant_host)
-        if not link:
-            link = next((r for r in all_links if str(r.get("tenant_host") or "").strip().lower() == host), None)
+        link = _get_link(link_id)
+    if source_tenant_host and not link:
+        link = _find_link_by_host(source_tenant_host)
     if not link and partner_job_ref:
-        target_host = ""
-        for row in _load_handovers():
-            if str(row.get("partner_job_ref") or "").strip() == str(partner_job_ref or "").strip():
-                target_host = str(row.get("partner_host") or "").strip()
-                break
+        by_ref = _find_handovers({"partner_job_ref": str(partner_job_ref or "").strip()}, limit=1)
+        target_host = str((by_ref[0] if by_ref else {}).get("partner_host") or "").strip()
         if target_host:
-            link = next(
-                (r for r in all_links if str(r.get("tenant_host") or "").strip().lower() == target_host.lower()),
-                None,
-            )
+            link = _find_link_by_host(target_host)
     hid = str(handover_id or "").strip()
     pref = str(partner_job_ref or "").strip()
     if not hid and not pref:
         frappe.throw("handover_id or partner_job_ref is required.")
 
-    rows = _load_handovers()
-    target = None
-    now = _now_iso()
-    for row in rows:
-        row_id = str(row.get("id") or "").strip()
-        row_ref = str(row.get("partner_job_ref") or "").strip()
-        if hid and row_id == hid:
-            target = row
-        elif pref and (row_ref == pref or row_id == pref):
-            target = row
-        if target:
-            row["status"] = "cancelled"
-            row["updated_at"] = now
-            source_host = str(source_tenant_host or "").strip()
-            base_reason = str(reason or "").strip()
-            cancel_reason = (
-                "Cancelled by partner tenant"
-                + (f" ({source_host})" if source_host else "")
-                + (f": {base_reason}" if base_reason else ".")
-            )
-            base = str(row.get("notes") or "").strip()
-            row["notes"] = (base + "\n" if base else "") + cancel_reason
-            _cancel_job_for_handover(row, cancel_reason)
-            break
-
+    target = _get_handover(hid) if hid else None
+    if not target and pref:
+        by_ref = _find_handovers({"partner_job_ref": pref}, limit=1)
+        target = by_ref[0] if by_ref else _get_handover(pref)
     if not target:
         return {"ok": True, "updated": False}
 
+    target["status"] = "cancelled"
+    target["updated_at"] = _now_iso()
+    source_host = str(source_tenant_host or "").strip()
+    base_reason = str(reason or "").strip()
+    cancel_reason = (
+        "Cancelled by partner tenant"
+        + (f" ({source_host})" if source_host else "")
+        + (f": {base_reason}" if base_reason else ".")
+    )
+    base = str(target.get("notes") or "").strip()
+    target["notes"] = (base + "\n" if base else "") + cancel_reason
+    _cancel_job_for_handover(target, cancel_reason)
+
     if not link:
         target_host = str(target.get("partner_host") or "").strip().lower()
         if target_host:
-            link = next(
-                (r for r in all_links if str(r.get("tenant_host") or "").strip().lower() == target_host),
-                None,
-            )
+            link = _find_link_by_host(target_host)
     if not link:
-        link = next(
-            (
-                r
-                for r in all_links
-                if str(r.get("id") or "").strip() == str(target.get("partner_link_id") or "").strip()
-            ),
-            None,
-        )
+        link = _get_link(target.get("partner_link_id"))
 
     inbound_key = str((link or {}).get("inbound_api_key") or "").strip()
     if inbound_key and inbound_key != str(provided_key or "").strip():
         frappe.throw("Unauthorized partner key.")
 
-    _save_handovers(rows)
+    _save_handover(target)
     _publish_handover_event("cancelled_by_partner", target, {"status": "cancelled"})
     return {"ok": True, "updated": True}
 
@@ -2230,23 +2247,14 @@ def link_handover_supplier_quote(id=None, supplier_quote_ref=None, source_quote_
     if not frappe.db.exists("Supplier Quotation", supplier_ref):
         frappe.throw(f"Supplier Quotation {supplier_ref} was not found.")
 
-    rows = _load_handovers()
-    target = None
-    now = _now_iso()
-    for row in rows:
-        if str(row.get("id") or "") != row_id:
-            continue
-        row["linked_supplier_quote_ref"] = supplier_ref
-        if source_ref:
-            row["source_quote_ref"] = source_ref
-        row["updated_at"] = now
-        target = row
-        break
-
+    target = _get_handover(row_id)
     if not target:
         frappe.throw("Handover was not found.")
-
-    _save_handovers(rows)
+    target["linked_supplier_quote_ref"] = supplier_ref
+    if source_ref:
+        target["source_quote_ref"] = source_ref
+    target["updated_at"] = _now_iso()
+    _save_handover(target)
     _publish_handover_event(
         "supplier_quote_linked",
         target,
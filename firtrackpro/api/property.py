@@ -4,7 +4,9 @@ from datetime import datetime
 
 import frappe
 from frappe import _
-from frappe.utils import add_months, get_datetime
+from frappe.utils import get_datetime
+
+from firtrackpro.api import recurrence
 
 
 def _slug_code(s: str) -> str:
@@ -535,20 +537,20 @@ def _parse_when(when: str):
 		return (None, None)
 
 
-def _next_from_anchor(anchor: str | None, freq: str | None):
-	if not anchor or not freq:
+def _next_from_anchor(anchor: str | None, freq: str | None, rrule: str | None = None):
+	if not anchor or not (freq or rrule):
 		return None
+	rule = frappe._dict(
+		anchor_date=anchor,
+		schedule_rule_frequency=freq,
+		frequency_title=frappe.db.get_value("FT Frequency", freq, "frequency_title") if freq else None,
+		schedule_rule_rrule=rrule,
+	)
 	try:
-		dt = get_datetime(anchor)
+		return recurrence.first_occurrence(rule)
 	except Exception:
+		# Left empty; the nightly expansion seeds it from anchor_date.
 		return None
-	f = (freq or "").lower()
-	months = {"monthly": 1, "quarterly": 3, "six_monthly": 6, "annual": 12}.get(f)
-	if months:
-		return add_months(dt, months)
-	if f == "one_off":
-		return dt
-	return None
 
 
 @frappe.whitelist(methods=["POST"])
@@ -576,11 +578,12 @@ def add_schedule_rule(
 		"doctype": "FT Schedule Rule",
 		"schedule_rule_property": prop.name,
 		"schedule_rule_frequency": frequency,
-		"schedule_rule_anchor_date": anchor_date,
-		"schedule_rule_next_occurrence": _next_from_anchor(anchor_date, frequency),
+		"anchor_date": anchor_date,
+		"schedule_rule_next_occurrence": _next_from_anchor(anchor_date, frequency, rrule),
+		"schedule_rule_active": 1,
 	}
 	if contract_name:
-		payload["schedule_rule_contract"] = contract_name
+		payload["contract"] = contract_name
 	if timezone:
 		payload["schedule_rule_timezone"] = timezone
 	if rrule:
@@ -0,0 +1,150 @@
+"""Shared per-tenant token buckets for accounting APIs (Xero, QuickBooks).
+
+Buckets live in Redis so every worker draws from the same budget. A 429 or an
+exhausted X-MinLimit-Remaining header parks the whole tenant until the
+provider's Retry-After has passed, instead of each worker finding out on its own.
+Calls per UTC day are counted too (and resynced from X-DayLimit-Remaining).
+Waits too long to sleep through raise RateLimitDeferred so the caller can retry
+the work later instead of failing it.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import frappe
+
+# provider -> (tokens per second, burst capacity). Kept a little under the
+# published limits so a full burst plus steady refill stays inside one window.
+PROFILES: dict[str, tuple[float, float]] = {
+	"xero": (55 / 60.0, 5),  # 60 calls/min per tenant
+	"quickbooks": (480 / 60.0, 20),  # 500 calls/min per realm
+}
+# provider -> calls per tenant per day, a little under the published limit.
+DAILY_LIMITS: dict[str, int] = {
+	"xero": 4900,  # 5000 calls/day per tenant
+}
+MAX_INLINE_WAIT = 120.0
+MAX_ATTEMPTS = 5
+
+# Atomically refill and take one token; returns seconds to wait when empty.
+_TAKE_TOKEN = """
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+	tokens = tokens - 1
+else
+	wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+def _bucket_key(provider: str, tenant: str) -> str:
+	return frappe.cache().make_key(f"firtrackpro:ratelimit:{provider}:{tenant}")
+
+
+def _blocked_key(provider: str, tenant: str) -> str:
+	return frappe.cache().make_key(f"firtrackpro:ratelimit:{provider}:{tenant}:blocked_until")
+
+
+def _day_key(provider: str, tenant: str) -> str:
+	day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+	return frappe.cache().make_key(f"firtrackpro:ratelimit:{provider}:{tenant}:day:{day}")
+
+
+def _seconds_to_day_reset() -> float:
+	now = datetime.now(timezone.utc)
+	midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+	return (midnight - now).total_seconds()
+
+
+class RateLimitDeferred(frappe.ValidationError):
+	"""The throttle is too long to wait inline; retry the work after `retry_after` seconds."""
+
+	def __init__(self, message: str = "", retry_after: float = 0.0):
+		super().__init__(message)
+		self.retry_after = retry_after
+
+
+def wait(seconds: float) -> None:
+	"""Sleep inline for short throttles; defer waits longer than MAX_INLINE_WAIT to the caller."""
+	if seconds > MAX_INLINE_WAIT:
+		raise RateLimitDeferred(f"Rate limit reached; provider asked to wait {int(seconds)}s.", seconds)
+	time.sleep(seconds)
+
+
+def _take_daily(provider: str, tenant: str) -> None:
+	limit = DAILY_LIMITS.get(provider)
+	if not limit:
+		return
+	cache = frappe.cache()
+	key = _day_key(provider, tenant)
+	used = cache.incr(key)
+	if used == 1:
+		cache.expire(key, 2 * 86400)
+	if used > limit:
+		raise RateLimitDeferred(
+			f"Daily {provider} API limit reached for this organisation; retrying after the daily reset.",
+			_seconds_to_day_reset(),
+		)
+
+
+def acquire(provider: str, tenant: str) -> None:
+	"""Block until the tenant's bucket has a token; raise RateLimitDeferred if the wait is unreasonable."""
+	rate, capacity = PROFILES.get(provider) or (0, 0)
+	if not rate or not tenant:
+		return
+	cache = frappe.cache()
+	blocked_until = float(cache.get(_blocked_key(provider, tenant)) or 0)
+	if blocked_until > time.time():
+		wait(blocked_until - time.time())
+	_take_daily(provider, tenant)
+	while True:
+		needed = float(cache.eval(_TAKE_TOKEN, 1, _bucket_key(provider, tenant), rate, capacity, time.time()))
+		if needed <= 0:
+			return
+		wait(needed + random.uniform(0, 0.25))
+
+
+def _header_float(resp, name: str) -> float | None:
+	try:
+		value = resp.headers.get(name)
+		return float(value) if value not in (None, "") else None
+	except Exception:
+		return None
+
+
+def observe(provider: str, tenant: str, resp) -> None:
+	"""Park the tenant when the response says the budget is spent; resync the daily count."""
+	if not tenant or provider not in PROFILES:
+		return
+	retry_after = _header_float(resp, "Retry-After")
+	day_remaining = _header_float(resp, "X-DayLimit-Remaining")
+	if day_remaining is not None and provider in DAILY_LIMITS:
+		used = max(0, DAILY_LIMITS[provider] - int(day_remaining))
+		frappe.cache().set(_day_key(provider, tenant), str(used), ex=2 * 86400)
+		if resp.status_code != 429 and day_remaining <= 0:
+			retry_after = retry_after or _seconds_to_day_reset()
+	if resp.status_code != 429 and _header_float(resp, "X-MinLimit-Remaining") == 0:
+		retry_after = retry_after or 60.0
+	if resp.status_code != 429 and retry_after is None:
+		return
+	until = time.time() + (retry_after if retry_after is not None else 1.0)
+	frappe.cache().set(_blocked_key(provider, tenant), str(until), ex=int(max(1, until - time.time())) + 1)
+
+
+def backoff(resp, attempt: int) -> float:
+	"""Seconds to wait before retrying a 429: Retry-After if given, else exponential with jitter."""
+	retry_after = _header_float(resp, "Retry-After")
+	if retry_after is not None:
+		return retry_after + random.uniform(0, 1.0)
+	return min(60.0, 2**attempt) + random.uniform(0, 1.0)
@@ -0,0 +1,387 @@
+"""Expand FT Schedule Rules into recurring service jobs.
+
+A nightly pass picks active rules whose `schedule_rule_next_occurrence` falls
+inside the planning horizon (an indexed range scan) or has not been seeded from
+`anchor_date` yet, expands each RRULE (or
+the plain frequency when no RRULE is set) up to the horizon, and creates one
+FT Job + FT Schedule per occurrence with FT Job Task rows for the property's
+assets. Rules are processed in chunks with a commit per chunk; a rule that
+fails is rolled back to its own savepoint and logged without holding back the
+rest of its chunk.
+
+Expansion is idempotent: jobs carry `job_schedule_rule` and are skipped when
+one already exists for the rule on that date, and `next_occurrence` is moved to
+the first occurrence after the horizon in the same transaction.
+"""
+
+import functools
+from datetime import datetime, time, timedelta
+
+import frappe
+from frappe.utils import cint, get_datetime, getdate, now_datetime
+
+try:
+	from dateutil.rrule import MONTHLY, WEEKLY, YEARLY, rrule, rrulestr
+except Exception:  # pragma: no cover
+	rrule = rrulestr = None
+	MONTHLY = WEEKLY = YEARLY = None
+
+DEFAULT_HORIZON_DAYS = 60
+RULE_CHUNK_SIZE = 500
+# Guards against a mistyped RRULE (e.g. FREQ=MINUTELY) flooding the job list.
+MAX_OCCURRENCES_PER_RULE = 60
+JOB_TITLE = "Service"
+JOB_STATUS = "Planned"
+SCHEDULE_BUCKET = "Unassigned"
+RULE_SAVEPOINT = "ft_schedule_rule_expansion"
+
+# Normalised FT Frequency title -> (dateutil freq, interval). "one_off" is handled separately.
+FREQUENCY_RULES = {
+	"weekly": ("WEEKLY", 1),
+	"fortnightly": ("WEEKLY", 2),
+	"monthly": ("MONTHLY", 1),
+	"quarterly": ("MONTHLY", 3),
+	"six_monthly": ("MONTHLY", 6),
+	"annual": ("YEARLY", 1),
+	"yearly": ("YEARLY", 1),
+	"five_yearly": ("YEARLY", 5),
+	"ten_yearly": ("YEARLY", 10),
+	"twenty_five_yearly": ("YEARLY", 25),
+}
+
+
+def _norm_frequency(value):
+	return "_".join(str(value or "").strip().lower().replace("-", " ").split())
+
+
+def _horizon_days():
+	return cint(frappe.conf.get("firtrackpro_schedule_horizon_days")) or DEFAULT_HORIZON_DAYS
+
+
+@functools.lru_cache(maxsize=256)
+def _parsed_rrule(text):
+	"""Parse once per distinct RRULE string; most rules share a handful of patterns."""
+	return rrulestr(text, dtstart=datetime(2000, 1, 1), forceset=False)
+
+
+def _rule_recurrence(rule, anchor):
+	"""A dateutil rrule/rruleset for the rule anchored at `anchor`, or None for one-off/unknown."""
+	if rrule is None:
+		frappe.throw("Schedule rule expansion needs python-dateutil")
+	text = (rule.schedule_rule_rrule or "").strip()
+	if text:
+		if "DTSTART" in text.upper():
+			return _parsed_rrule(text)
+		parsed = _parsed_rrule(text)
+		if hasattr(parsed, "replace"):
+			return parsed.replace(dtstart=anchor)
+		return rrulestr(text, dtstart=anchor, forceset=True)
+	freq = FREQUENCY_RULES.get(_norm_frequency(rule.frequency_title or rule.schedule_rule_frequency))
+	if not freq:
+		return None
+	dateutil_freq = {"WEEKLY": WEEKLY, "MONTHLY": MONTHLY, "YEARLY": YEARLY}[freq[0]]
+	return rrule(dateutil_freq, interval=freq[1], dtstart=anchor)
+
+
+def first_occurrence(rule):
+	"""Where a rule starts: the first recurrence after its anchor_date (the anchor itself for one-off)."""
+	if not rule.anchor_date:
+		return None
+	anchor = datetime.combine(getdate(rule.anchor_date), time.min)
+	recurrence = _rule_recurrence(rule, anchor)
+	if recurrence is None:
+		return (
+			anchor
+			if _norm_frequency(rule.frequency_title or rule.schedule_rule_frequency) == "one_off"
+			else None
+		)
+	return recurrence.after(anchor)
+
+
+def expand_rule(rule, horizon_end):
+	"""(occurrences from next_occurrence through horizon_end, first occurrence after the horizon).
+
+	A rule without next_occurrence starts from first_occurrence(). An unknown
+	frequency raises, so the rule stays active until it is fixed.
+	"""
+	next_occ = (
+		get_datetime(rule.schedule_rule_next_occurrence) if rule.schedule_rule_next_occurrence else None
+	)
+	anchor = datetime.combine(getdate(rule.anchor_date), time.min) if rule.anchor_date else next_occ
+	if not anchor:
+		return [], None
+	recurrence = _rule_recurrence(rule, anchor)
+	if recurrence is None:
+		frequency = rule.frequency_title or rule.schedule_rule_frequency
+		if _norm_frequency(frequency) != "one_off":
+			frappe.throw(f"Unknown schedule rule frequency: {frequency}")
+		next_occ = next_occ or anchor
+		return ([next_occ], None) if next_occ <= horizon_end else ([], next_occ)
+	if next_occ is None:
+		next_occ = recurrence.after(anchor)
+		if next_occ is None:
+			return [], None
+	occurrences = []
+	for occ in recurrence.xafter(next_occ - timedelta(seconds=1), count=MAX_OCCURRENCES_PER_RULE + 1):
+		if occ > horizon_end or len(occurrences) == MAX_OCCURRENCES_PER_RULE:
+			return occurrences, occ
+		occurrences.append(occ)
+	return occurrences, None
+
+
+def _due_rules(cutoff, after_name, limit):
+	"""One keyset page of due rules; the range on schedule_rule_next_occurrence uses its index.
+
+	Rules that were never seeded (no next_occurrence yet, but an anchor_date) are due too.
+	"""
+	rule = frappe.qb.DocType("FT Schedule Rule")
+	frequency = frappe.qb.DocType("FT Frequency")
+	query = (
+		frappe.qb.from_(rule)
+		.left_join(frequency)
+		.on(frequency.name == rule.schedule_rule_frequency)
+		.select(
+			rule.name,
+			rule.contract,
+			rule.schedule_rule_property,
+			rule.schedule_rule_frequency,
+			rule.anchor_date,
+			rule.schedule_rule_rrule,
+			rule.schedule_rule_next_occurrence,
+			frequency.frequency_title,
+		)
+		.where(rule.schedule_rule_active == 1)
+		.where(
+			(rule.schedule_rule_next_occurrence <= cutoff)
+			| (rule.schedule_rule_next_occurrence.isnull() & rule.anchor_date.isnotnull())
+		)
+		.orderby(rule.name)
+		.limit(limit)
+	)
+	if after_name:
+		query = query.where(rule.name > after_name)
+	return query.run(as_dict=True)
+
+
+def _existing_occurrences(rule_names):
+	"""{(rule, required date)} already generated, so a re-run never duplicates jobs."""
+	out = set()
+	if not rule_names:
+		return out
+	for row in frappe.get_all(
+		"FT Job",
+		filters={"job_schedule_rule": ["in", list(rule_names)]},
+		fields=["job_schedule_rule", "job_required_date"],
+		limit_page_length=0,
+	):
+		if row.job_required_date:
+			out.add((row.job_schedule_rule, getdate(row.job_required_date)))
+	return out
+
+
+def _task_plan(rules):
+	"""rule name -> [(asset, test suite)] from the contract scope, falling back to asset type defaults."""
+	property_ids = {r.schedule_rule_property for r in rules if r.schedule_rule_property}
+	if not property_ids:
+		return {}
+	assets_by_property = {}
+	for row in frappe.get_all(
+		"FT Asset",
+		filters={
+			"asset_property": ["in", list(property_ids)],
+			"asset_status": ["not in", ["Inactive", "Decommissioned"]],
+		},
+		fields=["name", "asset_property", "asset_type"],
+		order_by="name asc",
+		limit_page_length=0,
+	):
+		assets_by_property.setdefault(row.asset_property, []).append(row)
+
+	type_defaults = {
+		row.name: (row.asset_type_default_suite, _norm_frequency(row.asset_type_default_frequency))
+		for row in frappe.get_all(
+			"FT Asset Type",
+			fields=["name", "asset_type_default_suite", "asset_type_default_frequency"],
+			limit_page_length=0,
+		)
+	}
+	contracts = {r.contract for r in rules if r.contract}
+	scope = {}
+	if contracts:
+		for row in frappe.get_all(
+			"FT Contract Service Scope",
+			filters={"parenttype": "FT Contract", "parent": ["in", list(contracts)]},
+			fields=[
+				"parent",
+				"contract_service_scope__asset_type",
+				"contract_service_scope_frequency",
+				"contract_service_scope_suite",
+			],
+			limit_page_length=0,
+		):
+			if row.contract_service_scope_suite:
+				key = (
+					row.parent,
+					row.contract_service_scope__asset_type,
+					row.contract_service_scope_frequency,
+				)
+				scope[key] = row.contract_service_scope_suite
+
+	plan = {}
+	for rule in rules:
+		tasks = []
+		frequency = _norm_frequency(rule.frequency_title or rule.schedule_rule_frequency)
+		for asset in assets_by_property.get(rule.schedule_rule_property, []):
+			suite = None
+			if rule.contract:
+				suite = scope.get(
+					(rule.contract, asset.asset_type, rule.schedule_rule_frequency)
+				) or scope.get((rule.contract, None, rule.schedule_rule_frequency))
+			if not suite:
+				default_suite, default_frequency = type_defaults.get(asset.asset_type) or (None, None)
+				if default_suite and default_frequency == frequency:
+					suite = default_suite
+			if suite:
+				tasks.append((asset.name, suite))
+		plan[rule.name] = tasks
+	return plan
+
+
+def _insert_schedules(rows):
+	if not rows:
+		return
+	now = now_datetime()
+	user = frappe.session.user
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"docstatus",
+		"schedule_job",
+		"schedule_property",
+		"schedule_required_date",
+		"schedule_bucket",
+	]
+	values = [
+		(frappe.generate_hash(length=10), now, now, user, user, 0, job, prop, required, SCHEDULE_BUCKET)
+		for job, prop, required in rows
+	]
+	frappe.db.bulk_insert("FT Schedule", fields, values)
+
+
+def _expand_chunk(rules, horizon_end, customers):
+	"""Create the chunk's jobs; returns (jobs created, rules that failed).
+
+	Jobs go through insert() rather than bulk_insert: FT Job is autoincrement-named, so the
+	new names (needed for the task rows and schedules) are only known per insert, and its
+	validate/after_insert hooks build job_search and the SLA and assignment state.
+	"""
+	seen = _existing_occurrences([r.name for r in rules])
+	plan = _task_plan(rules)
+	schedules = []
+	created = failed = 0
+	for rule in rules:
+		try:
+			occurrences, following = expand_rule(rule, horizon_end)
+		except Exception:
+			# A malformed RRULE or unknown frequency only holds back its own rule, which stays
+			# active with its next_occurrence untouched until it is fixed.
+			frappe.log_error(frappe.get_traceback(), f"Schedule rule {rule.name}: expansion failed")
+			failed += 1
+			continue
+		# Same for a rule whose jobs fail to insert: undo just its writes, keep the rest of the chunk.
+		frappe.db.savepoint(RULE_SAVEPOINT)
+		rule_schedules = []
+		try:
+			for occ in occurrences:
+				required = getdate(occ)
+				if (rule.name, required) in seen:
+					continue
+				job = frappe.get_doc(
+					{
+						"doctype": "FT Job",
+						"job_title": JOB_TITLE,
+						"job_status": JOB_STATUS,
+						"job_property": rule.schedule_rule_property,
+						"job_customer": customers.get(rule.schedule_rule_property),
+						"job_contract": rule.contract,
+						"job_instance": rule.schedule_rule_frequency,
+						"job_schedule_rule": rule.name,
+						"job_required_date": required,
+						"job_tasks": [
+							{"asset": asset, "test_suite": suite, "status": "pending"}
+							for asset, suite in plan.get(rule.name, [])
+						],
+					}
+				)
+				job.flags.ignore_links = True
+				job.insert(ignore_permissions=True)
+				seen.add((rule.name, required))
+				rule_schedules.append((str(job.name), rule.schedule_rule_property, required))
+			values = {"schedule_rule_next_occurrence": following}
+			if occurrences:
+				values["schedule_rule_last_occurrence"] = occurrences[-1]
+			if following is None:
+				values["schedule_rule_active"] = 0
+			frappe.db.set_value("FT Schedule Rule", rule.name, values, update_modified=False)
+		except Exception:
+			frappe.db.rollback(save_point=RULE_SAVEPOINT)
+			frappe.log_error(frappe.get_traceback(), f"Schedule rule {rule.name}: job creation failed")
+			failed += 1
+			continue
+		schedules.extend(rule_schedules)
+		created += len(rule_schedules)
+	_insert_schedules(schedules)
+	return created, failed
+
+
+def expand_schedule_rules(horizon_days=None, chunk_size=RULE_CHUNK_SIZE):
+	"""Generate jobs for every due rule up to the horizon; commits after each chunk of rules."""
+	horizon_end = datetime.combine(
+		getdate() + timedelta(days=cint(horizon_days) or _horizon_days()), time.max
+	)
+	after_name = None
+	totals = {"rules": 0, "jobs": 0, "failed": 0}
+	frappe.flags.in_bulk_schedule_update = True
+	try:
+		while True:
+			rules = _due_rules(horizon_end, after_name, chunk_size)
+			if not rules:
+				break
+			after_name = rules[-1].name
+			property_ids = list({r.schedule_rule_property for r in rules if r.schedule_rule_property})
+			customers = dict(
+				frappe.get_all(
+					"FT Property",
+					filters={"name": ["in", property_ids]},
+					fields=["name", "property_customer"],
+					as_list=True,
+					limit_page_length=0,
+				)
+			)
+			try:
+				jobs, failed = _expand_chunk(rules, horizon_end, customers)
+				frappe.db.commit()
+				totals["jobs"] += jobs
+				totals["rules"] += len(rules) - failed
+				totals["failed"] += failed
+			except Exception:
+				frappe.db.rollback()
+				totals["failed"] += len(rules)
+				frappe.log_error(frappe.get_traceback(), "Schedule rule expansion failed")
+	finally:
+		frappe.flags.in_bulk_schedule_update = False
+	if totals["jobs"]:
+		frappe.publish_realtime(
+			"ft_schedule_updated", {"doctype": "FT Schedule", "action": "bulk", "generated": totals["jobs"]}
+		)
+	return totals
+
+
+@frappe.whitelist()
+def run_schedule_rule_expansion(horizon_days=None):
+	"""Run the nightly expansion now (System Manager)."""
+	frappe.only_for("System Manager")
+	return expand_schedule_rules(horizon_days=horizon_days)
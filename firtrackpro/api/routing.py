@@ -0,0 +1,250 @@
+"""Daily route sequencing for one technician.
+
+Orders a technician's jobs for a day by drive time: nearest-neighbour from the
+latest FT Technician Location fix, then 2-opt. Jobs with a scheduled slot are
+soft time windows: arriving after the slot ends is penalised, arriving early
+waits. The property-to-property matrix is cached per property set, so
+re-planning the same day (e.g. after each job) only costs the start leg.
+"""
+
+import hashlib
+from datetime import datetime, time, timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, get_datetime, getdate, now_datetime
+
+from firtrackpro.api import assignments, jobs, scheduler
+from firtrackpro.api.dispatch import travel_minutes
+
+MATRIX_CACHE_TTL = 24 * 3600
+DAY_START_HOUR = 7
+# Minutes of travel one minute of lateness past a scheduled slot is worth.
+LATE_WEIGHT = 5.0
+MAX_TWO_OPT_PASSES = 50
+
+
+def _property_coords(property_ids):
+	coords = {}
+	if not property_ids:
+		return coords
+	for row in frappe.get_all(
+		"FT Property",
+		filters={"name": ["in", list(property_ids)]},
+		fields=["name", "property_lat", "property_lng"],
+		limit_page_length=0,
+	):
+		if row.property_lat or row.property_lng:
+			coords[row.name] = (flt(row.property_lat), flt(row.property_lng))
+	return coords
+
+
+def _travel_matrix(property_ids, coords):
+	"""Travel minutes between every pair of properties, cached by the (sorted) property set."""
+	ids = sorted(property_ids)
+	digest = hashlib.sha1(repr([(pid, coords.get(pid)) for pid in ids]).encode("utf-8")).hexdigest()
+	key = f"firtrackpro:route_matrix:{digest}"
+	cache = frappe.cache()
+	cached = cache.get_value(key)
+	if isinstance(cached, dict) and cached.get("ids") == ids:
+		matrix = cached["matrix"]
+	else:
+		matrix = [[0.0 if a == b else travel_minutes(coords.get(a), coords.get(b)) for b in ids] for a in ids]
+		cache.set_value(key, {"ids": ids, "matrix": matrix}, expires_in_sec=MATRIX_CACHE_TTL)
+	index = {pid: i for i, pid in enumerate(ids)}
+	return lambda a, b: matrix[index[a]][index[b]]
+
+
+def _last_fix(user):
+	technician = frappe.db.get_value("FT Technician", {"user": user}, "name")
+	filters = {"technician": technician} if technician else {"user": user}
+	filters["timestamp"] = [">=", now_datetime() - timedelta(hours=12)]
+	rows = frappe.get_all(
+		"FT Technician Location",
+		filters=filters,
+		fields=["latitude", "longitude"],
+		order_by="timestamp desc",
+		limit_page_length=1,
+	)
+	if rows and (rows[0].latitude or rows[0].longitude):
+		return flt(rows[0].latitude), flt(rows[0].longitude)
+	return None
+
+
+def _day_job_names(user, day):
+	"""Jobs of `user` scheduled on `day`, or unscheduled with `day` as their required date.
+
+	Both are lookups on FT Job Assignment's (user, scheduled_start) index: a range over the
+	day, and the user's unscheduled rows joined to FT Job on job_required_date.
+	"""
+	if not frappe.db.table_exists(assignments.ASSIGNMENT_DOCTYPE):
+		# Pre-index sites: every assigned job, narrowed to the day by _day_jobs.
+		return list(jobs._assigned_job_names(user, limit=0))
+	day_start = datetime.combine(day, time.min)
+	assignment = frappe.qb.DocType(assignments.ASSIGNMENT_DOCTYPE)
+	job = frappe.qb.DocType("FT Job")
+	scheduled = (
+		frappe.qb.from_(assignment)
+		.select(assignment.job)
+		.distinct()
+		.where(assignment.user == user)
+		.where(assignment.scheduled_start >= day_start)
+		.where(assignment.scheduled_start < day_start + timedelta(days=1))
+		.run(pluck=True)
+	)
+	unscheduled = (
+		frappe.qb.from_(assignment)
+		.join(job)
+		.on(job.name == assignment.job)
+		.select(assignment.job)
+		.distinct()
+		.where(assignment.user == user)
+		.where(assignment.scheduled_start.isnull())
+		.where(job.job_required_date == day)
+		.run(pluck=True)
+	)
+	return list(dict.fromkeys([*scheduled, *unscheduled]))
+
+
+def _day_jobs(user, day):
+	names = _day_job_names(user, day)
+	if not names:
+		return []
+	job_rows = frappe.get_all(
+		"FT Job", filters={"name": ["in", names]}, fields=scheduler.JOB_FIELDS, limit_page_length=0
+	)
+	schedules = frappe.get_all(
+		"FT Schedule",
+		filters={"schedule_job": ["in", [str(n) for n in names]]},
+		fields=scheduler._schedule_fields(),
+		limit_page_length=0,
+	)
+	out = []
+	for row in scheduler._build_schedule_rows(job_rows, schedules):
+		start = row.get("scheduled_start")
+		if start:
+			if getdate(start) == day:
+				out.append(row)
+		elif row.get("required_date") and getdate(row["required_date"]) == day:
+			out.append(row)
+	return out
+
+
+class _Route:
+	def __init__(self, rows, travel, leg_from_origin, day_start):
+		self.rows = rows
+		self.travel = travel
+		self.leg_from_origin = leg_from_origin
+		self.day_start = day_start
+
+	def leg(self, prev, ji):
+		pid = self.rows[ji].get("property_id")
+		if prev is None:
+			return self.leg_from_origin(pid)
+		return self.travel(self.rows[prev].get("property_id"), pid)
+
+	def simulate(self, order):
+		"""(cost, [(job index, eta, travel minutes, late minutes)]) for visiting jobs in `order`."""
+		clock = self.day_start
+		prev = None
+		cost = 0.0
+		stops = []
+		for ji in order:
+			row = self.rows[ji]
+			leg = self.leg(prev, ji)
+			clock += timedelta(minutes=leg)
+			slot_start = get_datetime(row["scheduled_start"]) if row.get("scheduled_start") else None
+			slot_end = get_datetime(row["scheduled_end"]) if row.get("scheduled_end") else None
+			if slot_start and clock < slot_start:
+				clock = slot_start
+			late = max(0.0, (clock - slot_end).total_seconds() / 60.0) if slot_end else 0.0
+			cost += leg + LATE_WEIGHT * late
+			stops.append((ji, clock, leg, late))
+			clock += timedelta(minutes=cint(row.get("duration_minutes")) or 90)
+			prev = ji
+		return cost, stops
+
+	def nearest_neighbour(self):
+		remaining = set(range(len(self.rows)))
+		order = []
+		prev = None
+		while remaining:
+			ji = min(remaining, key=lambda j: (self.leg(prev, j), str(self.rows[j]["id"])))
+			order.append(ji)
+			remaining.remove(ji)
+			prev = ji
+		return order
+
+	def two_opt(self, order):
+		best_cost, _ = self.simulate(order)
+		for _ in range(MAX_TWO_OPT_PASSES):
+			improved = False
+			for i in range(len(order) - 1):
+				for k in range(i + 1, len(order)):
+					trial = order[:i] + order[i : k + 1][::-1] + order[k + 1 :]
+					cost, _ = self.simulate(trial)
+					if cost < best_cost - 1e-6:
+						order, best_cost, improved = trial, cost, True
+			if not improved:
+				break
+		return order
+
+
+@frappe.whitelist()
+def get_day_route(date=None, technician=None):
+	"""Jobs for one technician's day in suggested visiting order with estimated arrival times.
+
+	Defaults to the current user and today. Planning for another technician
+	needs System Manager.
+	"""
+	user = frappe.session.user
+	if user in ("Guest", None):
+		frappe.throw(_("Login required"))
+	if technician and technician != user:
+		frappe.only_for("System Manager")
+		user = technician
+	day = getdate(date) if date else getdate()
+	rows = _day_jobs(user, day)
+	if not rows:
+		return {"date": str(day), "technician": user, "jobs": []}
+
+	property_ids = {r.get("property_id") for r in rows if r.get("property_id")}
+	coords = _property_coords(property_ids)
+	travel = _travel_matrix(property_ids, coords)
+	origin = _last_fix(user)
+
+	def leg_from_origin(pid):
+		if origin is None:
+			return 0.0
+		return travel_minutes(origin, coords.get(pid))
+
+	def pair(a, b):
+		if not a or not b:
+			return travel_minutes(None, None)
+		return travel(a, b)
+
+	day_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=DAY_START_HOUR)
+	if day == getdate():
+		day_start = max(day_start, now_datetime())
+	route = _Route(rows, pair, leg_from_origin, day_start)
+	order = route.two_opt(route.nearest_neighbour())
+	_cost, stops = route.simulate(order)
+
+	out = []
+	for position, (ji, eta, leg, late) in enumerate(stops, start=1):
+		out.append(
+			{
+				**rows[ji],
+				"route_position": position,
+				"eta": eta,
+				"travel_minutes": round(leg),
+				"late_minutes": round(late),
+			}
+		)
+	return {
+		"date": str(day),
+		"technician": user,
+		"start_from_location": origin is not None,
+		"total_travel_minutes": round(sum(stop[2] for stop in stops)),
+		"jobs": out,
+	}
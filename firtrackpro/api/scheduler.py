@@ -1,35 +1,53 @@
-import frappe
-from frappe.utils import get_datetime
 import json
+from datetime import timedelta
+
+import frappe
+from frappe.utils import get_datetime, getdate, now_datetime
 
-STORE_HANDOVERS_KEY = "firtrackpro:partner_handovers_json"
+from firtrackpro.api import assignments, conflicts
+from firtrackpro.events import jobs as job_events
+
+HANDOVER_DOCTYPE = "FT Partner Handover"
 ACTIVE_OUTBOUND_HANDOVER_STATUSES = {"sent", "in_progress", "accepted"}
+JOB_FIELDS = [
+	"name",
+	"job_title",
+	"job_status",
+	"job_property",
+	"job_scheduled_start",
+	"job_scheduled_end",
+	"job_lead_user",
+	"job_required_date",
+]
+SCHEDULE_FIELDS = [
+	"name",
+	"schedule_job",
+	"schedule_property",
+	"schedule_required_date",
+	"schedule_scheduled_start",
+	"schedule_technician",
+	"schedule_bucket",
+	"schedule_ready",
+]
+# Windowed queries range-scan the start index back this far so multi-day jobs that
+# began before the visible range still show.
+WINDOW_LOOKBACK_DAYS = 14
 
 
 def _get_active_outbound_handover(job_name: str) -> dict | None:
 	if not job_name:
 		return None
-	raw = str(frappe.db.get_default(STORE_HANDOVERS_KEY) or "").strip()
-	if not raw:
-		return None
-	try:
-		rows = json.loads(raw)
-	except Exception:
-		return None
-	if not isinstance(rows, list):
-		return None
-	for row in rows:
-		if not isinstance(row, dict):
-			continue
-		if str(row.get("direction") or "").strip().lower() != "outbound":
-			continue
-		if str(row.get("job_name") or "").strip() != str(job_name).strip():
-			continue
-		status = str(row.get("status") or "").strip().lower()
-		if status not in ACTIVE_OUTBOUND_HANDOVER_STATUSES:
-			continue
-		return row
-	return None
+	rows = frappe.get_all(
+		HANDOVER_DOCTYPE,
+		filters={
+			"job_name": str(job_name).strip(),
+			"direction": "outbound",
+			"status": ["in", sorted(ACTIVE_OUTBOUND_HANDOVER_STATUSES)],
+		},
+		fields=["name", "partner_label", "partner_host", "status"],
+		limit_page_length=1,
+	)
+	return rows[0] if rows else None
 
 
 def _throw_if_outbound_handover_locks_schedule(job_name: str):
@@ -116,19 +134,20 @@ def _get_technicians():
 	return technicians
 
 
+def _schedule_fields():
+	"""SCHEDULE_FIELDS plus schedule_scheduled_end on sites whose FT Schedule has it.
+
+	Selecting a missing column fails the whole query, which _safe_get_all turns into no schedules.
+	"""
+	if frappe.db.has_column("FT Schedule", "schedule_scheduled_end"):
+		return [*SCHEDULE_FIELDS, "schedule_scheduled_end"]
+	return SCHEDULE_FIELDS
+
+
 def _get_jobs_with_schedule():
 	jobs = _safe_get_all(
 		"FT Job",
-		fields=[
-			"name",
-			"job_title",
-			"job_status",
-			"job_property",
-			"job_scheduled_start",
-			"job_scheduled_end",
-			"job_lead_user",
-			"job_required_date",
-		],
+		fields=JOB_FIELDS,
 		order_by="modified desc",
 		limit_page_length=500,
 	)
@@ -136,30 +155,24 @@ def _get_jobs_with_schedule():
 		return []
 
 	job_ids = [j["name"] for j in jobs]
-	property_ids = list({j["job_property"] for j in jobs if j.get("job_property")})
-
+	schedule_fields = _schedule_fields()
 	schedules = _safe_get_all(
 		"FT Schedule",
 		filters={"schedule_job": ["in", job_ids]},
-		fields=[
-			"name",
-			"schedule_job",
-			"schedule_property",
-			"schedule_required_date",
-			"schedule_scheduled_start",
-			"schedule_scheduled_end",
-			"schedule_technician",
-			"schedule_bucket",
-			"schedule_ready",
-		],
+		fields=schedule_fields,
 		limit_page_length=1000,
 	)
+	return _build_schedule_rows(jobs, schedules)
+
+
+def _build_schedule_rows(jobs, schedules):
+	property_ids = list({j["job_property"] for j in jobs if j.get("job_property")})
 
 	schedule_by_job = {}
 	for s in schedules:
 		key = s.get("schedule_job")
-		if key and key not in schedule_by_job:
-			schedule_by_job[key] = s
+		if key and str(key) not in schedule_by_job:
+			schedule_by_job[str(key)] = s
 
 	property_name_by_id = {}
 	if property_ids:
@@ -172,7 +185,7 @@ def _get_jobs_with_schedule():
 
 	result = []
 	for j in jobs:
-		sched = schedule_by_job.get(j["name"])
+		sched = schedule_by_job.get(str(j["name"]))
 
 		if sched:
 			scheduled_start = sched.get("schedule_scheduled_start")
@@ -216,6 +229,7 @@ def _get_jobs_with_schedule():
 				"title": j.get("job_title") or j["name"],
 				"status": raw_status,  # real FT Job status: Planned / Finalised / Closed / etc.
 				"scheduler_status": scheduler_status,  # Planned / Scheduled for the calendar logic
+				"property_id": property_id,
 				"property_name": property_name,
 				"technician_id": technician_id,
 				"scheduled_start": scheduled_start,
@@ -229,13 +243,147 @@ def _get_jobs_with_schedule():
 	return result
 
 
+def _in_window(row, start_dt, end_dt):
+	scheduled_start = row.get("scheduled_start")
+	if scheduled_start:
+		scheduled_start = get_datetime(scheduled_start)
+		scheduled_end = get_datetime(row.get("scheduled_end") or scheduled_start)
+		return scheduled_start < end_dt and max(scheduled_end, scheduled_start) >= start_dt
+	required = row.get("required_date")
+	return bool(required) and start_dt.date() <= getdate(required) < end_dt.date() + timedelta(days=1)
+
+
+def _window_job_ids(start_dt, end_dt):
+	lookback = start_dt - timedelta(days=WINDOW_LOOKBACK_DAYS)
+	job_ids = set()
+	for s in _safe_get_all(
+		"FT Schedule",
+		filters=[
+			["schedule_scheduled_start", ">=", lookback],
+			["schedule_scheduled_start", "<", end_dt],
+		],
+		pluck="schedule_job",
+		limit_page_length=0,
+	):
+		if s:
+			job_ids.add(str(s))
+	job_ids.update(
+		str(name)
+		for name in _safe_get_all(
+			"FT Job",
+			filters=[["job_scheduled_start", ">=", lookback], ["job_scheduled_start", "<", end_dt]],
+			pluck="name",
+			limit_page_length=0,
+		)
+	)
+	# Unscheduled jobs due inside the range feed the calendar's planning lane.
+	job_ids.update(
+		str(name)
+		for name in _safe_get_all(
+			"FT Job",
+			filters=[
+				["job_required_date", ">=", start_dt.date()],
+				["job_required_date", "<=", end_dt.date()],
+				["job_scheduled_start", "is", "not set"],
+			],
+			pluck="name",
+			limit_page_length=0,
+		)
+	)
+	return job_ids
+
+
+def _changed_job_ids(since_dt):
+	job_ids = {
+		str(name)
+		for name in _safe_get_all(
+			"FT Job", filters=[["modified", ">", since_dt]], pluck="name", limit_page_length=0
+		)
+	}
+	job_ids.update(
+		str(s)
+		for s in _safe_get_all(
+			"FT Schedule", filters=[["modified", ">", since_dt]], pluck="schedule_job", limit_page_length=0
+		)
+		if s
+	)
+	deleted_jobs = set()
+	for d in _safe_get_all(
+		"Deleted Document",
+		filters=[["deleted_doctype", "in", ["FT Job", "FT Schedule"]], ["creation", ">", since_dt]],
+		fields=["deleted_doctype", "deleted_name", "data"],
+		limit_page_length=0,
+	):
+		if d.get("deleted_doctype") == "FT Job":
+			deleted_jobs.add(str(d.get("deleted_name")))
+			continue
+		try:
+			schedule_job = (json.loads(d.get("data") or "{}") or {}).get("schedule_job")
+		except Exception:
+			schedule_job = None
+		if schedule_job:
+			job_ids.add(str(schedule_job))
+	return job_ids, deleted_jobs
+
+
+def _get_jobs_in_window(start_dt, end_dt, since_dt=None):
+	"""Calendar rows for [start, end); with `since`, only rows changed after it plus removed ids."""
+	deleted = set()
+	if since_dt:
+		job_ids, deleted = _changed_job_ids(since_dt)
+	else:
+		job_ids = _window_job_ids(start_dt, end_dt)
+	job_ids = sorted(job_ids - deleted)
+	schedule_fields = _schedule_fields()
+	jobs = []
+	schedules = []
+	for i in range(0, len(job_ids), 500):
+		chunk = job_ids[i : i + 500]
+		jobs += _safe_get_all(
+			"FT Job", filters={"name": ["in", chunk]}, fields=JOB_FIELDS, limit_page_length=0
+		)
+		schedules += _safe_get_all(
+			"FT Schedule",
+			filters={"schedule_job": ["in", chunk]},
+			fields=schedule_fields,
+			limit_page_length=0,
+		)
+	rows = _build_schedule_rows(jobs, schedules) if jobs else []
+	visible = [r for r in rows if _in_window(r, start_dt, end_dt)]
+	# Changed rows that left the range (or were deleted) are tombstones for the client.
+	if not since_dt:
+		return visible, []
+	removed = deleted | (set(job_ids) - {str(r["id"]) for r in visible})
+	return visible, sorted(removed)
+
+
 @frappe.whitelist()
-def get_schedule():
+def get_schedule(start=None, end=None, since=None):
+	"""Technicians plus calendar jobs.
+
+	With `start`/`end` only jobs overlapping that range are returned. Adding
+	`since` (the `server_time` of a previous response) returns just the jobs
+	changed after it, and `removed` lists job ids the client should drop.
+	Without a range the legacy "500 most recent jobs" payload is returned.
+	"""
+	server_time = now_datetime()
 	technicians = _get_technicians()
-	jobs = _get_jobs_with_schedule()
+	if not start or not end:
+		return {
+			"technicians": technicians,
+			"jobs": _get_jobs_with_schedule(),
+		}
+	start_dt = get_datetime(start)
+	end_dt = get_datetime(end)
+	if end_dt <= start_dt:
+		frappe.throw("end must be after start")
+	since_dt = get_datetime(since) if since else None
+	jobs, removed = _get_jobs_in_window(start_dt, end_dt, since_dt)
 	return {
 		"technicians": technicians,
 		"jobs": jobs,
+		"removed": removed,
+		"server_time": server_time,
 	}
 
 
@@ -352,6 +500,18 @@ def update_job_schedule(job_id, start=None, end=None, technician_id=None, bucket
 		except Exception:
 			pass
 
+	# Double-bookings are flagged for the calendar, not blocked.
+	try:
+		clashes = conflicts.conflicts_for_move(
+			job_id,
+			sched.schedule_scheduled_start,
+			sched.get("schedule_scheduled_end"),
+			sched.schedule_technician,
+		)
+	except Exception:
+		clashes = []
+		frappe.log_error(frappe.get_traceback(), f"Scheduler: conflict check failed for job {job_id}")
+
 	return {
 		"status": "ok",
 		"job_id": job_id,
@@ -360,4 +520,196 @@ def update_job_schedule(job_id, start=None, end=None, technician_id=None, bucket
 		"scheduled_end": sched.schedule_scheduled_end,
 		"technician_id": sched.schedule_technician,
 		"bucket": sched.schedule_bucket,
+		"conflicts": clashes,
+	}
+
+
+BULK_SCHEDULE_MAX = 500
+
+
+def _parse_bulk_changes(changes):
+	if isinstance(changes, str):
+		try:
+			changes = json.loads(changes or "[]")
+		except Exception:
+			frappe.throw("changes must be a JSON list")
+	if not isinstance(changes, list):
+		frappe.throw("changes must be a list")
+	if len(changes) > BULK_SCHEDULE_MAX:
+		frappe.throw(f"At most {BULK_SCHEDULE_MAX} schedule changes can be applied at once")
+	out = {}
+	for row in changes:
+		if not isinstance(row, dict) or not row.get("job_id"):
+			frappe.throw("Each change needs a job_id")
+		start = row.get("start")
+		end = row.get("end")
+		start_dt = get_datetime(start) if start not in (None, "") else None
+		end_dt = get_datetime(end) if end not in (None, "") else None
+		if start_dt and end_dt and end_dt <= start_dt:
+			frappe.throw(f"Job {row['job_id']}: end must be after start")
+		# A later change for the same job wins, like sequential update_job_schedule calls.
+		out[str(row["job_id"])] = {
+			"start": start_dt,
+			"end": end_dt,
+			"set_technician": "technician_id" in row,
+			"technician_id": row.get("technician_id") or None,
+			"bucket": row.get("bucket"),
+		}
+	return out
+
+
+def _validate_bulk_changes(changes):
+	job_ids = list(changes)
+	jobs = {
+		str(j.name): j
+		for j in frappe.get_all(
+			"FT Job", filters={"name": ["in", job_ids]}, fields=["name", "job_property"], limit_page_length=0
+		)
 	}
+	missing = [job_id for job_id in job_ids if job_id not in jobs]
+	if missing:
+		frappe.throw("Unknown jobs: {0}".format(", ".join(missing[:20])))
+	for job_id in job_ids:
+		frappe.has_permission("FT Job", "write", job_id, throw=True)
+
+	locked = frappe.get_all(
+		HANDOVER_DOCTYPE,
+		filters={
+			"job_name": ["in", job_ids],
+			"direction": "outbound",
+			"status": ["in", sorted(ACTIVE_OUTBOUND_HANDOVER_STATUSES)],
+		},
+		pluck="job_name",
+		limit_page_length=0,
+	)
+	if locked:
+		frappe.throw(
+			"Scheduling is locked while these jobs are handed over to a partner: {0}".format(
+				", ".join(sorted(set(locked))[:20])
+			)
+		)
+
+	technicians = {c["technician_id"] for c in changes.values() if c["technician_id"]}
+	if technicians:
+		known = set(frappe.get_all("User", filters={"name": ["in", list(technicians)]}, pluck="name"))
+		unknown = sorted(technicians - known)
+		if unknown:
+			frappe.throw("Unknown technicians: {0}".format(", ".join(unknown[:20])))
+	return jobs
+
+
+@frappe.whitelist()
+def bulk_update_job_schedule(changes=None):
+	"""Apply many calendar moves at once.
+
+	`changes` is a list of {job_id, start, end, technician_id, bucket} with the
+	same meaning as update_job_schedule (no start and no end unschedules).
+	Every change, including write permission on each job, is validated before
+	anything is written. Existing rows are updated column-wise in a single
+	transaction, and one aggregated `ft_schedule_updated` event replaces the
+	per-job realtime fan-out.
+	"""
+	changes = _parse_bulk_changes(changes)
+	if not changes:
+		return {"status": "ok", "jobs": [], "conflicts": []}
+	jobs = _validate_bulk_changes(changes)
+
+	has_end = frappe.db.has_column("FT Schedule", "schedule_scheduled_end")
+	schedule_fields = ["name", "schedule_job", "schedule_scheduled_start", "schedule_technician"]
+	if has_end:
+		schedule_fields.append("schedule_scheduled_end")
+	existing = {}
+	for row in frappe.get_all(
+		"FT Schedule",
+		filters={"schedule_job": ["in", list(changes)]},
+		fields=schedule_fields,
+		order_by="creation asc",
+		limit_page_length=0,
+	):
+		existing.setdefault(str(row.schedule_job), row)
+
+	results = []
+	frappe.flags.in_bulk_schedule_update = True
+	try:
+		for job_id, change in changes.items():
+			sched = existing.get(job_id)
+			if not change["start"] and not change["end"]:
+				if sched:
+					frappe.db.delete("FT Schedule", {"name": sched.name})
+				job_values = {"job_scheduled_start": None, "job_scheduled_end": None}
+				if change["set_technician"]:
+					job_values["job_lead_user"] = None
+				frappe.db.set_value("FT Job", job_id, job_values)
+				results.append({"job_id": job_id, "schedule_id": None})
+				continue
+
+			values = {}
+			if change["start"]:
+				values["schedule_scheduled_start"] = change["start"]
+			if change["end"] and has_end:
+				values["schedule_scheduled_end"] = change["end"]
+			if change["set_technician"]:
+				values["schedule_technician"] = change["technician_id"]
+			if change["bucket"]:
+				values["schedule_bucket"] = change["bucket"]
+
+			if sched:
+				frappe.db.set_value("FT Schedule", sched.name, values)
+				schedule_id = sched.name
+				start = change["start"] or sched.schedule_scheduled_start
+				end = change["end"] or sched.get("schedule_scheduled_end")
+				technician = (
+					change["technician_id"] if change["set_technician"] else sched.schedule_technician
+				)
+			else:
+				doc = frappe.get_doc(
+					{
+						"doctype": "FT Schedule",
+						"schedule_job": job_id,
+						"schedule_property": jobs[job_id].job_property,
+						**values,
+					}
+				).insert()
+				schedule_id = doc.name
+				start, end, technician = change["start"], change["end"], change["technician_id"]
+
+			job_values = {"job_scheduled_start": start, "job_scheduled_end": end}
+			if change["set_technician"]:
+				job_values["job_lead_user"] = change["technician_id"]
+			frappe.db.set_value("FT Job", job_id, job_values)
+			results.append(
+				{
+					"job_id": job_id,
+					"schedule_id": schedule_id,
+					"scheduled_start": start,
+					"scheduled_end": end,
+					"technician_id": technician,
+					"bucket": change["bucket"],
+				}
+			)
+		assignments.refresh_jobs([r["job_id"] for r in results])
+	finally:
+		frappe.flags.in_bulk_schedule_update = False
+
+	job_events._emit(
+		"ft_schedule_updated",
+		{"doctype": "FT Schedule", "action": "bulk", "jobs": [r["job_id"] for r in results]},
+		doctype="FT Schedule",
+	)
+
+	clashes = []
+	slots = [(get_datetime(r["scheduled_start"]), r) for r in results if r.get("scheduled_start")]
+	if slots:
+		try:
+			window_start = min(start for start, _ in slots)
+			window_end = max(
+				get_datetime(r["scheduled_end"])
+				if r.get("scheduled_end")
+				else start + conflicts.DEFAULT_DURATION
+				for start, r in slots
+			)
+			clashes = conflicts.conflicts_for_jobs([r["job_id"] for _, r in slots], window_start, window_end)
+		except Exception:
+			frappe.log_error(frappe.get_traceback(), "Scheduler: bulk conflict check failed")
+
+	return {"status": "ok", "jobs": results, "conflicts": clashes}
@@ -0,0 +1,150 @@
+"""Per-site DocType schema cache for code that adapts to optional fields.
+
+Several endpoints introspect doctypes on every call (which fields exist, which
+columns are in the table, Select options) so they keep working across ERPNext
+versions and customisations. This keeps one snapshot per doctype in Redis
+(site-scoped) plus a small in-process LRU keyed by (site, doctype), versioned by
+the latest DocType / Custom Field / Property Setter `modified`. Saving any of
+those (once the change commits), or migrating, drops the cached version so
+every worker rebuilds.
+"""
+
+import threading
+from collections import OrderedDict
+
+import frappe
+
+CACHE_KEY = "firtrackpro:schema"
+VERSION_KEY = "firtrackpro:schema_version"
+# Bumped on every invalidation so a rebuild never reuses a stale local copy, even
+# when a change (e.g. deleting a custom field) leaves the modified stamps equal.
+GENERATION_KEY = "firtrackpro:schema_generation"
+LOCAL_MAX = 64
+
+_local: "OrderedDict[tuple[str, str], DocTypeSchema]" = OrderedDict()
+_lock = threading.Lock()
+
+
+class DocTypeSchema:
+	"""Cached fields/columns of one doctype; `derived` memoises results computed from them."""
+
+	def __init__(self, doctype: str, entry: dict):
+		self.doctype = doctype
+		self.version = entry.get("version")
+		self.exists = bool(entry.get("exists"))
+		self.fields = [frappe._dict(f) for f in entry.get("fields") or []]
+		self._by_name = {f.fieldname: f for f in self.fields}
+		self.columns = set(entry.get("columns") or [])
+		self._derived: dict = {}
+
+	def field(self, fieldname: str):
+		return self._by_name.get(fieldname)
+
+	def has_field(self, fieldname: str) -> bool:
+		return fieldname in self._by_name
+
+	def has_column(self, column: str) -> bool:
+		return column in self.columns
+
+	def existing(self, candidates) -> list[str]:
+		"""`candidates` that are fields (or `name`), in the given order."""
+		return [c for c in candidates if c == "name" or c in self._by_name]
+
+	def select_options(self, fieldname: str) -> list[str]:
+		f = self._by_name.get(fieldname)
+		if not f or f.fieldtype != "Select":
+			return []
+		return [o.strip() for o in (f.options or "").split("\n") if o.strip()]
+
+	def derived(self, key: str, builder):
+		"""`builder(self)` computed once per schema version and process."""
+		if key not in self._derived:
+			self._derived[key] = builder(self)
+		return self._derived[key]
+
+
+def _version(doctype: str) -> str:
+	cache = frappe.cache()
+	version = cache.hget(VERSION_KEY, doctype)
+	if version is None:
+		stamps = [
+			frappe.db.get_value("DocType", doctype, "modified"),
+			frappe.db.get_value("Custom Field", {"dt": doctype}, "max(modified)"),
+			frappe.db.get_value("Property Setter", {"doc_type": doctype}, "max(modified)"),
+		]
+		generation = cache.get_value(GENERATION_KEY) or 0
+		version = "|".join(str(s or "") for s in [generation, *stamps])
+		cache.hset(VERSION_KEY, doctype, version)
+	return version
+
+
+def _build(doctype: str, version: str) -> dict:
+	if not frappe.db.exists("DocType", doctype):
+		return {"version": version, "exists": False}
+	meta = frappe.get_meta(doctype)
+	fields = [
+		{"fieldname": f.fieldname, "fieldtype": f.fieldtype, "options": f.options or ""}
+		for f in meta.fields or []
+		if f.fieldname
+	]
+	try:
+		columns = list(frappe.db.get_table_columns(doctype))
+	except Exception:
+		columns = []
+	return {"version": version, "exists": True, "fields": fields, "columns": columns}
+
+
+def get_schema(doctype: str) -> DocTypeSchema:
+	version = _version(doctype)
+	local_key = (getattr(frappe.local, "site", None) or "", doctype)
+	with _lock:
+		schema = _local.get(local_key)
+		if schema is not None and schema.version == version:
+			_local.move_to_end(local_key)
+			return schema
+
+	cache = frappe.cache()
+	entry = cache.hget(CACHE_KEY, doctype)
+	if not entry or entry.get("version") != version:
+		entry = _build(doctype, version)
+		cache.hset(CACHE_KEY, doctype, entry)
+	schema = DocTypeSchema(doctype, entry)
+	with _lock:
+		_local[local_key] = schema
+		_local.move_to_end(local_key)
+		while len(_local) > LOCAL_MAX:
+			_local.popitem(last=False)
+	return schema
+
+
+def invalidate(doctype: str | None = None):
+	cache = frappe.cache()
+	cache.set_value(GENERATION_KEY, (cache.get_value(GENERATION_KEY) or 0) + 1)
+	if doctype:
+		cache.hdel(VERSION_KEY, doctype)
+		cache.hdel(CACHE_KEY, doctype)
+	else:
+		cache.delete_value(VERSION_KEY)
+		cache.delete_value(CACHE_KEY)
+
+
+def on_schema_change(doc, method=None):
+	"""DocType / Custom Field / Property Setter hook.
+
+	Runs after commit: invalidating earlier lets another worker rebuild from the
+	pre-change rows and cache them under the new generation.
+	"""
+	if doc.doctype == "DocType":
+		doctype = doc.name
+	elif doc.doctype == "Custom Field":
+		doctype = doc.dt
+	elif doc.doctype == "Property Setter":
+		doctype = doc.doc_type
+	else:
+		return
+	frappe.db.after_commit.add(lambda: invalidate(doctype))
+
+
+def clear():
+	"""after_migrate: fields and columns may have changed on any doctype."""
+	invalidate()
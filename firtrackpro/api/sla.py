@@ -0,0 +1,293 @@
+"""SLA deadlines and escalations for FT Jobs.
+
+When a job is created (or its status changes) the matching FT SLA Policy's
+response/restore minutes are turned into deadlines in business time, using the
+policy's work calendar (else the lead technician's). Every pending deadline and
+escalation step is a member of one Redis sorted set scored by its due time, so
+the per-minute tick only pops what has expired instead of scanning open jobs.
+
+Members are "<job>|response", "<job>|restore" and "<job>|step|<FT SLA Event>".
+Escalation delays count from when the job was raised, in the same business time.
+Timers that are already overdue when a job is (re)planned are queued for the next
+tick, and members that have fired are remembered per job so a re-plan never sends
+the same notification twice.
+"""
+
+from datetime import datetime
+
+import frappe
+from frappe.utils import cint, get_datetime, now_datetime
+
+from firtrackpro.api import work_calendar
+
+QUEUE_KEY = "firtrackpro:sla:queue"
+MEMBERS_KEY = "firtrackpro:sla:members"
+FIRED_KEY = "firtrackpro:sla:fired"
+POP_BATCH = 500
+RESPONDED_STATUSES = {"In Progress", "Complete", "Office Review", "Invoiced", "Closed", "Finalised"}
+RESTORED_STATUSES = {"Complete", "Office Review", "Invoiced", "Closed", "Finalised"}
+
+# Atomically take up to ARGV[2] members due by ARGV[1].
+_POP_DUE = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+	redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+def _queue_key():
+	return frappe.cache().make_key(QUEUE_KEY)
+
+
+def _policy_for(job):
+	"""Property-specific policy first, then the contract's general one."""
+	if job.get("job_property"):
+		name = frappe.db.get_value("FT SLA Policy", {"sla_policy_property": job.job_property}, "name")
+		if name:
+			return name
+	if job.get("job_contract"):
+		return frappe.db.get_value(
+			"FT SLA Policy",
+			{"sla_policy_contract": job.job_contract, "sla_policy_property": ["in", ["", None]]},
+			"name",
+		)
+	return None
+
+
+def _calendar_for(policy, job):
+	name = policy.get("sla_policy_work_calendar")
+	if not name and job.get("job_lead_user"):
+		name = frappe.db.get_value("FT Technician", {"user": job.job_lead_user}, "work_calendar")
+	return work_calendar.get_calendar(name)
+
+
+def _escalation_steps(policy_name):
+	return frappe.get_all(
+		"FT SLA Event",
+		filters={"parenttype": "FT SLA Policy", "parent": policy_name},
+		fields=["name", "sla_event_step", "sla_event_delay_mins"],
+		order_by="sla_event_step asc, idx asc",
+		limit_page_length=0,
+	)
+
+
+def _timers(job, policy_name):
+	"""[(member, due)] for every deadline and escalation step of the job under the policy."""
+	policy = frappe.db.get_value(
+		"FT SLA Policy",
+		policy_name,
+		["sla_policy_response_mins", "sla_policy_restore_mins", "sla_policy_work_calendar"],
+		as_dict=True,
+	)
+	if not policy:
+		return [], None, None
+	calendar = _calendar_for(policy, job)
+	start = get_datetime(job.get("creation")) or now_datetime()
+	response_due = restore_due = None
+	timers = []
+	if cint(policy.sla_policy_response_mins) > 0:
+		response_due = calendar.add_minutes(start, cint(policy.sla_policy_response_mins))
+		timers.append((f"{job.name}|response", response_due))
+	if cint(policy.sla_policy_restore_mins) > 0:
+		restore_due = calendar.add_minutes(start, cint(policy.sla_policy_restore_mins))
+		timers.append((f"{job.name}|restore", restore_due))
+	for step in _escalation_steps(policy_name):
+		due = calendar.add_minutes(start, max(0, cint(step.sla_event_delay_mins)))
+		timers.append((f"{job.name}|step|{step.name}", due))
+	return timers, response_due, restore_due
+
+
+def _fired(job_name):
+	return set(frappe.cache().hget(FIRED_KEY, str(job_name)) or [])
+
+
+def _pending(timers, status, fired=()):
+	"""Timers still to fire; overdue ones are due now rather than dropped."""
+	if status in RESTORED_STATUSES:
+		return []
+	now = now_datetime()
+	out = []
+	for member, due in timers:
+		if member in fired:
+			continue
+		if member.endswith("|response") and status in RESPONDED_STATUSES:
+			continue
+		out.append((member, max(due, now)))
+	return out
+
+
+def _replace_timers(job_name, timers):
+	cache = frappe.cache()
+	key = _queue_key()
+	old = cache.hget(MEMBERS_KEY, str(job_name)) or []
+	if old:
+		cache.zrem(key, *old)
+	if timers:
+		cache.zadd(key, {member: get_datetime(due).timestamp() for member, due in timers})
+		cache.hset(MEMBERS_KEY, str(job_name), [member for member, _ in timers])
+	else:
+		cache.hdel(MEMBERS_KEY, str(job_name))
+
+
+def schedule_job(job):
+	"""(Re)compute the job's deadlines and queue its still-pending timers after commit."""
+	policy_name = job.get("job_sla_policy") or _policy_for(job)
+	if not policy_name:
+		return
+	timers, response_due, restore_due = _timers(job, policy_name)
+	values = {
+		"job_sla_policy": policy_name,
+		"job_sla_response_due": response_due,
+		"job_sla_restore_due": restore_due,
+	}
+	if any(job.get(field) != value for field, value in values.items()):
+		frappe.db.set_value("FT Job", job.name, values, update_modified=False)
+		job.update(values)
+	pending = _pending(timers, job.get("job_status"), _fired(job.name))
+	frappe.db.after_commit.add(lambda: _replace_timers(job.name, pending))
+
+
+def on_job_change(doc, method=None):
+	"""FT Job on_update: new jobs and status changes re-plan the job's SLA timers."""
+	before = doc.get_doc_before_save()
+	if before is not None and not doc.has_value_changed("job_status"):
+		return
+	try:
+		schedule_job(doc)
+	except Exception:
+		frappe.log_error(frappe.get_traceback(), f"SLA scheduling failed for FT Job {doc.name}")
+
+
+def _forget_job(job_name):
+	_replace_timers(job_name, [])
+	frappe.cache().hdel(FIRED_KEY, str(job_name))
+
+
+def on_job_trash(doc, method=None):
+	frappe.db.after_commit.add(lambda: _forget_job(doc.name))
+
+
+def _role_users(role):
+	return frappe.get_all(
+		"Has Role", filters={"parenttype": "User", "role": role}, pluck="parent", limit_page_length=0
+	)
+
+
+def _notify(users, job, subject, message):
+	for user in sorted({u for u in users if u and u not in ("Guest", "Administrator")}):
+		frappe.get_doc(
+			{
+				"doctype": "Notification Log",
+				"for_user": user,
+				"type": "Alert",
+				"document_type": "FT Job",
+				"document_name": str(job.name),
+				"subject": subject,
+				"email_content": message,
+			}
+		).insert(ignore_permissions=True)
+		frappe.publish_realtime(
+			"ft_sla_escalation",
+			{"job": job.name, "subject": subject, "message": message},
+			user=user,
+			after_commit=True,
+		)
+
+
+def _fire(member, job, steps):
+	_, kind, *rest = member.split("|")
+	status = job.job_status
+	if status in RESTORED_STATUSES:
+		return False
+	if kind == "response":
+		if status in RESPONDED_STATUSES:
+			return False
+		_notify([job.job_lead_user], job, f"Job {job.name}: response SLA breached", "")
+	elif kind == "restore":
+		_notify([job.job_lead_user], job, f"Job {job.name}: restore SLA breached", "")
+	elif kind == "step":
+		step = steps.get(rest[0]) if rest else None
+		if not step:
+			return False
+		users = [step.sla_event_user]
+		if step.sla_event_role:
+			users.extend(_role_users(step.sla_event_role))
+		subject = f"Job {job.name}: SLA escalation step {cint(step.sla_event_step)}"
+		_notify(users, job, subject, step.sla_event_message or "")
+	else:
+		return False
+	return True
+
+
+def fire_due_escalations():
+	"""Scheduler tick: pop expired SLA timers and send their notifications."""
+	cache = frappe.cache()
+	due = cache.eval(_POP_DUE, 1, _queue_key(), now_datetime().timestamp(), POP_BATCH) or []
+	members = [m.decode() if isinstance(m, bytes) else m for m in due]
+	if not members:
+		return 0
+	job_ids = {m.split("|", 1)[0] for m in members}
+	jobs = {
+		str(row.name): row
+		for row in frappe.get_all(
+			"FT Job",
+			filters={"name": ["in", list(job_ids)]},
+			fields=["name", "job_status", "job_lead_user"],
+			limit_page_length=0,
+		)
+	}
+	step_names = [m.split("|")[2] for m in members if m.count("|") == 2]
+	steps = {
+		row.name: row
+		for row in frappe.get_all(
+			"FT SLA Event",
+			filters={"name": ["in", step_names or [""]]},
+			fields=["name", "sla_event_step", "sla_event_role", "sla_event_user", "sla_event_message"],
+			limit_page_length=0,
+		)
+	}
+	fired = {}
+	for member in members:
+		job = jobs.get(member.split("|", 1)[0])
+		if not job:
+			continue
+		try:
+			if _fire(member, job, steps):
+				fired.setdefault(str(job.name), []).append(member)
+		except Exception:
+			frappe.log_error(frappe.get_traceback(), f"SLA escalation failed ({member})")
+	frappe.db.commit()
+	for job_name, job_members in fired.items():
+		cache.hset(FIRED_KEY, job_name, sorted(_fired(job_name).union(job_members)))
+	return sum(len(job_members) for job_members in fired.values())
+
+
+def rebuild_sla_timers():
+	"""Re-queue timers for every open job with a policy (e.g. after Redis was flushed)."""
+	cache = frappe.cache()
+	cache.delete(_queue_key())
+	cache.delete_value(MEMBERS_KEY)
+	for job in frappe.get_all(
+		"FT Job",
+		filters={"job_sla_policy": ["is", "set"], "job_status": ["not in", sorted(RESTORED_STATUSES)]},
+		fields=["name", "creation", "job_status", "job_lead_user", "job_sla_policy"],
+		limit_page_length=0,
+	):
+		timers, _, _ = _timers(job, job.job_sla_policy)
+		_replace_timers(job.name, _pending(timers, job.job_status, _fired(job.name)))
+
+
+@frappe.whitelist()
+def get_sla_queue(limit=50):
+	"""The next pending SLA timers with their due times (System Manager)."""
+	frappe.only_for("System Manager")
+	rows = frappe.cache().zrange(_queue_key(), 0, max(0, cint(limit) - 1), withscores=True)
+	return [
+		{
+			"member": member.decode() if isinstance(member, bytes) else member,
+			"due": datetime.fromtimestamp(score),
+		}
+		for member, score in rows
+	]
@@ -3,6 +3,8 @@ import json
 import frappe
 from frappe import _
 
+from firtrackpro.api import schema_cache
+
 # -----------------------------
 # Helpers
 # -----------------------------
@@ -28,22 +30,19 @@ def _coerce_bool(v):
 
 
 def _select_options_from_meta(doctype: str, fieldname: str) -> list[str]:
-	df = frappe.get_meta(doctype).get_field(fieldname)
-	if not df or df.fieldtype != "Select":
-		return []
-	return [o.strip() for o in (df.options or "").split("\n") if o.strip()]
+	return schema_cache.get_schema(doctype).select_options(fieldname)
 
 
 def _has_field(doctype: str, fieldname: str) -> bool:
 	try:
-		return bool(frappe.get_meta(doctype).get_field(fieldname))
+		return schema_cache.get_schema(doctype).has_field(fieldname)
 	except Exception:
 		return False
 
 
 def _doctype_exists(doctype: str) -> bool:
 	try:
-		return bool(frappe.db.exists("DocType", doctype))
+		return schema_cache.get_schema(doctype).exists
 	except Exception:
 		return False
 
@@ -3,6 +3,8 @@ from urllib.parse import urlparse
 
 import frappe
 
+from firtrackpro.api import http_client
+
 try:
 	import requests
 except Exception:
@@ -357,7 +359,7 @@ def _get_firelink_limit():
 						}
 						if bridge_token:
 							form["bridge_token"] = bridge_token
-						response = requests.post(
+						response = http_client.post(
 							url,
 							headers=bridge_headers,
 							data=form,
@@ -405,7 +407,7 @@ def _get_firelink_limit():
 						reasons.append(f"{url} {bridge_error}")
 						continue
 				else:
-					response = requests.get(url, headers=headers, params=params, timeout=8, allow_redirects=True)
+					response = http_client.get(url, headers=headers, params=params, timeout=8, allow_redirects=True)
 				if response.status_code >= 400:
 					detail = _extract_firelink_error(response)
 					reasons.append(f"{url} HTTP {response.status_code}" + (f" ({detail})" if detail else ""))
@@ -0,0 +1,239 @@
+"""Compiled FT Work Calendars for business-time arithmetic.
+
+`work_calendar_hours_json` / `work_calendar_holidays_json` are parsed once into
+per-weekday interval arrays with prefix sums plus a sorted holiday list with
+cumulative lost minutes. Every question ("is open at", "business minutes
+between", "add N business minutes") is then a few bisects instead of a walk
+over the days in between. Parsed calendars are cached in Redis per calendar
+and dropped when the calendar is saved.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+import frappe
+from frappe.utils import flt, get_datetime, getdate
+
+# Mon-Fri 07:00-15:30 when a technician/customer has no FT Work Calendar.
+DEFAULT_HOURS = {day: [(7 * 60, 15 * 60 + 30)] for day in range(5)}
+CACHE_KEY = "firtrackpro:work_calendar"
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+
+def _clock_minutes(value):
+	try:
+		hours, _, minutes = str(value).strip().partition(":")
+		return int(hours) * 60 + int(minutes or 0)
+	except Exception:
+		return None
+
+
+def parse_hours(raw):
+	"""{"mon": [["07:00", "15:30"]], ...} (or {"day", "start", "end"} rows) -> {weekday: [(start, end)]}."""
+	try:
+		data = json.loads(raw) if isinstance(raw, str) else raw
+	except Exception:
+		return None
+	if isinstance(data, list):
+		data = {row.get("day"): row for row in data if isinstance(row, dict)}
+	if not isinstance(data, dict):
+		return None
+	out = {}
+	for day, spans in data.items():
+		key = str(day).strip().lower()
+		weekday = int(key) if key.isdigit() else _WEEKDAYS.get(key[:3])
+		if weekday is None:
+			continue
+		if isinstance(spans, dict) or (isinstance(spans, list) and spans and isinstance(spans[0], str)):
+			spans = [spans]
+		for span in spans or []:
+			if isinstance(span, dict):
+				start, end = span.get("start") or span.get("open"), span.get("end") or span.get("close")
+			elif isinstance(span, list | tuple) and len(span) == 2:
+				start, end = span
+			else:
+				continue
+			start, end = _clock_minutes(start), _clock_minutes(end)
+			if start is not None and end is not None and end > start:
+				out.setdefault(weekday % 7, []).append((start, end))
+	return {day: sorted(spans) for day, spans in out.items()} or None
+
+
+def parse_holidays(raw):
+	try:
+		data = json.loads(raw) if isinstance(raw, str) else raw
+	except Exception:
+		return set()
+	out = set()
+	for row in data or []:
+		value = row.get("date") if isinstance(row, dict) else row
+		try:
+			out.add(getdate(value))
+		except Exception:
+			continue
+	return out
+
+
+def _merge(spans):
+	out = []
+	for start, end in sorted(spans):
+		start, end = max(0, start), min(24 * 60, end)
+		if end <= start:
+			continue
+		if out and start <= out[-1][1]:
+			out[-1] = (out[-1][0], max(out[-1][1], end))
+		else:
+			out.append((start, end))
+	return out
+
+
+class CompiledCalendar:
+	"""Opening hours and holidays laid out for O(log n) business-time queries.
+
+	Times are naive datetimes in the calendar's local time. Days are counted by
+	`date.toordinal()`; ordinal 1 (0001-01-01) is a Monday, so whole weeks line
+	up with the weekday arrays.
+	"""
+
+	def __init__(self, hours=None, holidays=None):
+		hours = hours or DEFAULT_HOURS
+		self.spans = [_merge(hours.get(day, [])) for day in range(7)]
+		self.starts = [[start for start, _ in spans] for spans in self.spans]
+		# cum[day][i] = open minutes in that day's spans before span i.
+		self.cum = []
+		for spans in self.spans:
+			running = [0]
+			for start, end in spans:
+				running.append(running[-1] + end - start)
+			self.cum.append(running)
+		self.day_minutes = [running[-1] for running in self.cum]
+		self.week_minutes = sum(self.day_minutes)
+		self.week_prefix = [0]
+		for minutes in self.day_minutes:
+			self.week_prefix.append(self.week_prefix[-1] + minutes)
+		self.holidays = sorted({getdate(day).toordinal() for day in holidays or ()})
+		self._holiday_set = set(self.holidays)
+		self.holiday_cum = [0]
+		for ordinal in self.holidays:
+			self.holiday_cum.append(self.holiday_cum[-1] + self.day_minutes[(ordinal - 1) % 7])
+
+	@classmethod
+	def from_json(cls, hours_json=None, holidays_json=None):
+		return cls(parse_hours(hours_json), parse_holidays(holidays_json))
+
+	def is_holiday(self, day):
+		return getdate(day).toordinal() in self._holiday_set
+
+	def windows(self, day):
+		"""Open (start, end) minute-of-day spans for `day`; empty on holidays and closed days."""
+		day = getdate(day)
+		if day.toordinal() in self._holiday_set:
+			return []
+		return list(self.spans[day.weekday()])
+
+	def is_open(self, when):
+		when = get_datetime(when)
+		if when.toordinal() in self._holiday_set:
+			return False
+		weekday = when.weekday()
+		minute = when.hour * 60 + when.minute + when.second / 60.0
+		i = bisect_right(self.starts[weekday], minute) - 1
+		return i >= 0 and minute < self.spans[weekday][i][1]
+
+	def _minutes_to_midnight(self, ordinal):
+		"""Business minutes from the ordinal epoch up to 00:00 of `ordinal`."""
+		weeks, weekday = divmod(ordinal - 1, 7)
+		lost = self.holiday_cum[bisect_left(self.holidays, ordinal)]
+		return weeks * self.week_minutes + self.week_prefix[weekday] - lost
+
+	def _minutes_into_day(self, weekday, minute):
+		spans = self.spans[weekday]
+		i = bisect_right(self.starts[weekday], minute) - 1
+		if i < 0:
+			return 0.0
+		return self.cum[weekday][i] + min(minute, spans[i][1]) - spans[i][0]
+
+	def _position(self, when):
+		ordinal = when.toordinal()
+		base = self._minutes_to_midnight(ordinal)
+		if ordinal in self._holiday_set:
+			return base
+		minute = when.hour * 60 + when.minute + when.second / 60.0 + when.microsecond / 60e6
+		return base + self._minutes_into_day(when.weekday(), minute)
+
+	def minutes_between(self, start, end):
+		"""Business minutes in [start, end); negative when end is before start."""
+		return self._position(get_datetime(end)) - self._position(get_datetime(start))
+
+	def add_minutes(self, start, minutes):
+		"""The datetime `minutes` business minutes after `start`; an exact fit ends at the span close."""
+		start = get_datetime(start)
+		minutes = flt(minutes)
+		if minutes == 0:
+			return start
+		if minutes < 0:
+			frappe.throw("Business minutes to add must not be negative")
+		if not self.week_minutes:
+			frappe.throw("Work calendar has no opening hours")
+		target = self._position(start) + minutes
+		# Smallest day whose close reaches the target. Each holiday can push the
+		# answer out by at most a week, which bounds the search.
+		lo = start.toordinal()
+		hi = lo + 7 * (int(minutes // self.week_minutes) + 2 + len(self.holidays))
+		while lo < hi:
+			mid = (lo + hi) // 2
+			if self._minutes_to_midnight(mid + 1) >= target:
+				hi = mid
+			else:
+				lo = mid + 1
+		remaining = target - self._minutes_to_midnight(lo)
+		weekday = (lo - 1) % 7
+		running = self.cum[weekday]
+		i = max(0, bisect_left(running, remaining) - 1)
+		i = min(i, len(self.spans[weekday]) - 1)
+		span_start = self.spans[weekday][i][0]
+		midnight = datetime.combine(date.fromordinal(lo), datetime.min.time())
+		return midnight + timedelta(minutes=span_start + remaining - running[i])
+
+
+def _cache_entry(name):
+	row = frappe.db.get_value(
+		"FT Work Calendar", name, ["work_calendar_hours_json", "work_calendar_holidays_json"], as_dict=True
+	)
+	if not row:
+		return None
+	hours = parse_hours(row.work_calendar_hours_json) or DEFAULT_HOURS
+	holidays = sorted(str(day) for day in parse_holidays(row.work_calendar_holidays_json))
+	return {"hours": {str(day): spans for day, spans in hours.items()}, "holidays": holidays}
+
+
+def _load_calendar(name):
+	cache = frappe.cache()
+	entry = cache.hget(CACHE_KEY, name)
+	if entry is None:
+		entry = _cache_entry(name) or {}
+		cache.hset(CACHE_KEY, name, entry)
+	return CompiledCalendar(
+		{int(day): [tuple(span) for span in spans] for day, spans in (entry.get("hours") or {}).items()},
+		entry.get("holidays") or (),
+	)
+
+
+def get_calendar(name=None):
+	"""Compiled calendar for `name` (the default calendar when empty or missing)."""
+	if not name:
+		return CompiledCalendar()
+	return frappe.local_cache(CACHE_KEY, name, lambda: _load_calendar(name))
+
+
+def get_calendars(names=None):
+	"""{name: CompiledCalendar} for `names`, or every FT Work Calendar."""
+	if names is None:
+		names = frappe.get_all("FT Work Calendar", pluck="name", limit_page_length=0)
+	return {name: get_calendar(name) for name in names if name}
+
+
+def invalidate(name):
+	frappe.cache().hdel(CACHE_KEY, name)
+	(getattr(frappe.local, "cache", None) or {}).get(CACHE_KEY, {}).pop(name, None)
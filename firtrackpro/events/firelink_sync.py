@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any
 
 import frappe
@@ -53,10 +55,11 @@ def _address_payload_for_property(prop_doc) -> dict[str, Any]:
 	}
 
 
-def _ensure_property_link(prop_doc) -> str:
+def _ensure_property_link(prop_doc, idempotency_key: str | None = None) -> str:
 	payload = _address_payload_for_property(prop_doc)
 	if not _safe_str(payload.get("address_line1")):
 		return ""
+	payload["idempotency_key"] = idempotency_key
 	result = integrations.firelink_property_sync(**payload) or {}
 	firelink_property_id = _safe_str(result.get("firelink_property_id"))
 	if firelink_property_id and firelink_property_id != _safe_str(getattr(prop_doc, "firelink_uid", "")):
@@ -66,81 +69,381 @@ def _ensure_property_link(prop_doc) -> str:
 	return firelink_property_id
 
 
-def sync_property_after_save(doc, method=None):
+def _push_property(doc, idempotency_key: str | None = None) -> None:
+	_ensure_property_link(doc, idempotency_key)
+
+
+def _firelink_property_id_for(property_id: str) -> str:
+	if not property_id or not frappe.db.exists("FT Property", property_id):
+		return ""
+	prop_doc = frappe.get_doc("FT Property", property_id)
+	return _safe_str(getattr(prop_doc, "firelink_uid", "")) or _ensure_property_link(prop_doc)
+
+
+def _asset_payload(doc) -> dict[str, Any] | None:
+	firelink_property_id = _firelink_property_id_for(_safe_str(getattr(doc, "asset_property", "")))
+	if not firelink_property_id:
+		return None
+	return {
+		"local_asset_id": _safe_str(doc.name),
+		"firelink_property_id": firelink_property_id,
+		"asset_label": _safe_str(getattr(doc, "asset_label", "")),
+		"asset_type_code": _safe_str(getattr(doc, "asset_type", "")),
+		"asset_serial": _safe_str(getattr(doc, "asset_serial", "")),
+		"asset_identifier": _safe_str(getattr(doc, "asset_identifier", "")),
+		"asset_status": _safe_str(getattr(doc, "asset_status", "")),
+	}
+
+
+def _push_asset(doc, idempotency_key: str | None = None) -> None:
+	payload = _asset_payload(doc)
+	if not payload:
+		return
+	payload["idempotency_key"] = idempotency_key
+	result = integrations.firelink_asset_sync(**payload) or {}
+	firelink_asset_id = _safe_str(result.get("firelink_asset_id"))
+	if firelink_asset_id and firelink_asset_id != _safe_str(getattr(doc, "asset_firelink_uid", "")):
+		frappe.db.set_value(
+			"FT Asset", doc.name, "asset_firelink_uid", firelink_asset_id, update_modified=False
+		)
+
+
+def _defect_payload(doc) -> dict[str, Any] | None:
+	firelink_property_id = _firelink_property_id_for(_safe_str(getattr(doc, "defect_property", "")))
+	if not firelink_property_id:
+		return None
+
+	firelink_asset_id = ""
+	linked_asset_id = _safe_str(getattr(doc, "defect_asset", ""))
+	if linked_asset_id and frappe.db.exists("FT Asset", linked_asset_id):
+		firelink_asset_id = _safe_str(frappe.db.get_value("FT Asset", linked_asset_id, "asset_firelink_uid"))
+
+	return {
+		"local_defect_id": _safe_str(doc.name),
+		"firelink_property_id": firelink_property_id,
+		"firelink_asset_id": firelink_asset_id or None,
+		"defect_template_code": _safe_str(getattr(doc, "defect_template", "")),
+		"defect_severity": _safe_str(getattr(doc, "defect_severity", "")),
+		"defect_status": _safe_str(getattr(doc, "defect_status", "")),
+		"defect_summary": _safe_str(getattr(doc, "defect_description", ""))[:140],
+	}
+
+
+def _push_defect(doc, idempotency_key: str | None = None) -> None:
+	payload = _defect_payload(doc)
+	if not payload:
+		return
+	payload["idempotency_key"] = idempotency_key
+	result = integrations.firelink_defect_sync(**payload) or {}
+	firelink_defect_id = _safe_str(result.get("firelink_defect_id"))
+	if firelink_defect_id and firelink_defect_id != _safe_str(getattr(doc, "defect_firelink_uid", "")):
+		frappe.db.set_value(
+			"FT Defect", doc.name, "defect_firelink_uid", firelink_defect_id, update_modified=False
+		)
+
+
+OUTBOX_DOCTYPE = "FL Sync Outbox"
+# Drained in this order so assets/defects find their property already linked.
+OUTBOX_PUSHERS = {
+	"FT Property": _push_property,
+	"FT Asset": _push_asset,
+	"FT Defect": _push_defect,
+}
+# Assets and defects in a batch go up in one bulk call; the bulk endpoint writes the uids back.
+OUTBOX_BULK = {
+	"FT Asset": (_asset_payload, integrations.firelink_asset_sync_bulk, "assets", "local_asset_id"),
+	"FT Defect": (_defect_payload, integrations.firelink_defect_sync_bulk, "defects", "local_defect_id"),
+}
+# Fields each pusher actually sends. Saves that touch nothing here (notes, next-due
+# dates, zones, the uid write-backs) don't queue a push.
+SYNC_FIELDS = {
+	"FT Property": (
+		"property_name",
+		"property_address",
+		"property_lat",
+		"property_lng",
+		"ft_property_address_line1",
+		"ftp_property_address_line1",
+	),
+	"FT Asset": (
+		"asset_property",
+		"asset_label",
+		"asset_type",
+		"asset_serial",
+		"asset_identifier",
+		"asset_status",
+	),
+	"FT Defect": (
+		"defect_property",
+		"defect_asset",
+		"defect_template",
+		"defect_severity",
+		"defect_status",
+		"defect_description",
+	),
+}
+OUTBOX_BATCH_SIZE = 100
+# Whatever is left after this many batches waits for the next scheduler tick.
+OUTBOX_MAX_BATCHES = 20
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_DRAIN_JOB_ID = "firelink_outbox_drain"
+# A claimed ("Sending") row whose drainer died is claimable again after this long.
+OUTBOX_CLAIM_SECONDS = 600
+
+
+def _fingerprint(doc) -> str:
+	"""Hash of the FireLink-relevant values; equal fingerprints mean nothing worth pushing changed."""
+	values = {field: _safe_str(getattr(doc, field, "")) for field in SYNC_FIELDS.get(doc.doctype, ())}
+	if doc.doctype == "FT Property":
+		# The pushed address comes from the linked Address, not just the link itself.
+		values["address"] = _address_payload_for_property(doc)
+	raw = f"{doc.doctype}:{doc.name}:{json.dumps(values, sort_keys=True, default=str)}"
+	return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _count(doctype: str, outcome: str) -> None:
 	try:
-		_ensure_property_link(doc)
+		cache = frappe.cache()
+		cache.incr(cache.make_key(f"firtrackpro:firelink_sync:{doctype}:{outcome}"))
 	except Exception:
-		frappe.log_error(frappe.get_traceback(), f"FireLink property sync failed: {doc.doctype} {doc.name}")
+		pass
 
 
-def sync_asset_after_save(doc, method=None):
+@frappe.whitelist()
+def get_sync_stats(reset=False):
+	"""Per-doctype counts of FireLink pushes queued, skipped as unchanged, sent and failed."""
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	out: dict[str, dict[str, int]] = {}
+	for doctype in OUTBOX_PUSHERS:
+		out[doctype] = {}
+		for outcome in ("queued", "skipped", "sent", "failed"):
+			key = cache.make_key(f"firtrackpro:firelink_sync:{doctype}:{outcome}")
+			out[doctype][outcome] = int(cache.get(key) or 0)
+			if frappe.utils.cint(reset):
+				cache.delete(key)
+	return out
+
+
+def _enqueue_drain() -> None:
+	frappe.enqueue(
+		"firtrackpro.events.firelink_sync.drain_outbox",
+		queue="short",
+		job_id=OUTBOX_DRAIN_JOB_ID,
+		deduplicate=True,
+		enqueue_after_commit=True,
+	)
+
+
+def queue_firelink_sync(doc, method=None):
+	"""Doc event: record that `doc` needs pushing to FireLink; the drainer does the HTTP.
+
+	There is one outbox row per document. Repeated saves before the drainer
+	runs collapse into that row, and a save that leaves the fingerprint as it
+	was at the last queued/successful push is ignored. Every push that is
+	queued gets a fresh idempotency key, kept across its retries.
+	"""
 	try:
-		property_id = _safe_str(getattr(doc, "asset_property", ""))
-		if not property_id or not frappe.db.exists("FT Property", property_id):
-			return
-		prop_doc = frappe.get_doc("FT Property", property_id)
-		firelink_property_id = _safe_str(getattr(prop_doc, "firelink_uid", "")) or _ensure_property_link(
-			prop_doc
+		fingerprint = _fingerprint(doc)
+		row = frappe.db.get_value(
+			OUTBOX_DOCTYPE,
+			{"sync_outbox_reference_doctype": doc.doctype, "sync_outbox_reference_name": doc.name},
+			["name", "sync_outbox_status", "sync_outbox_fingerprint"],
+			as_dict=True,
 		)
-		if not firelink_property_id:
+		if (
+			row
+			and _safe_str(row.sync_outbox_fingerprint) == fingerprint
+			and row.sync_outbox_status in {"Pending", "Sending", "Sent"}
+		):
+			_count(doc.doctype, "skipped")
 			return
-
-		result = (
-			integrations.firelink_asset_sync(
-				local_asset_id=_safe_str(doc.name),
-				firelink_property_id=firelink_property_id,
-				asset_label=_safe_str(getattr(doc, "asset_label", "")),
-				asset_type_code=_safe_str(getattr(doc, "asset_type", "")),
-				asset_serial=_safe_str(getattr(doc, "asset_serial", "")),
-				asset_identifier=_safe_str(getattr(doc, "asset_identifier", "")),
-				asset_status=_safe_str(getattr(doc, "asset_status", "")),
-			)
-			or {}
-		)
-		firelink_asset_id = _safe_str(result.get("firelink_asset_id"))
-		if firelink_asset_id and firelink_asset_id != _safe_str(getattr(doc, "asset_firelink_uid", "")):
-			frappe.db.set_value(
-				"FT Asset", doc.name, "asset_firelink_uid", firelink_asset_id, update_modified=False
-			)
+		values = {
+			"sync_outbox_status": "Pending",
+			"sync_outbox_fingerprint": fingerprint,
+			"sync_outbox_idempotency_key": frappe.generate_hash(length=32),
+			"sync_outbox_attempts": 0,
+			"sync_outbox_next_attempt_at": frappe.utils.now_datetime(),
+			"sync_outbox_last_error": "",
+		}
+		if row:
+			frappe.db.set_value(OUTBOX_DOCTYPE, row.name, values, update_modified=False)
+		else:
+			frappe.get_doc(
+				{
+					"doctype": OUTBOX_DOCTYPE,
+					"sync_outbox_reference_doctype": doc.doctype,
+					"sync_outbox_reference_name": doc.name,
+					"sync_outbox_payload": json.dumps({"doctype": doc.doctype, "name": doc.name}),
+					**values,
+				}
+			).insert(ignore_permissions=True)
+		_count(doc.doctype, "queued")
+		_enqueue_drain()
 	except Exception:
-		frappe.log_error(frappe.get_traceback(), f"FireLink asset sync failed: {doc.doctype} {doc.name}")
+		frappe.log_error(frappe.get_traceback(), f"FireLink outbox enqueue failed: {doc.doctype} {doc.name}")
+
+
+def queue_address_properties(doc, method=None):
+	"""Address on_update: re-check the FT Properties using this address (their fingerprint includes it)."""
+	for name in frappe.get_all("FT Property", filters={"property_address": doc.name}, pluck="name"):
+		queue_firelink_sync(frappe.get_doc("FT Property", name))
+
 
+def _retry_delay_seconds(attempts: int) -> int:
+	return min(3600, 30 * (2 ** max(0, attempts - 1)))
 
-def sync_defect_after_save(doc, method=None):
+
+def _drain_row(row) -> None:
+	doctype = _safe_str(row.sync_outbox_reference_doctype)
+	docname = _safe_str(row.sync_outbox_reference_name)
+	pusher = OUTBOX_PUSHERS.get(doctype)
+	if not pusher or not frappe.db.exists(doctype, docname):
+		frappe.delete_doc(OUTBOX_DOCTYPE, row.name, ignore_permissions=True, force=True)
+		return
 	try:
-		property_id = _safe_str(getattr(doc, "defect_property", ""))
-		if not property_id or not frappe.db.exists("FT Property", property_id):
-			return
-		prop_doc = frappe.get_doc("FT Property", property_id)
-		firelink_property_id = _safe_str(getattr(prop_doc, "firelink_uid", "")) or _ensure_property_link(
-			prop_doc
+		pusher(frappe.get_doc(doctype, docname), row.sync_outbox_idempotency_key)
+	except Exception as exc:
+		frappe.db.rollback()
+		_mark_failed(row, exc)
+		return
+	_mark_sent(row)
+
+
+def _mark_failed(row, exc) -> None:
+	_count(row.sync_outbox_reference_doctype, "failed")
+	attempts = int(row.sync_outbox_attempts or 0) + 1
+	give_up = attempts >= OUTBOX_MAX_ATTEMPTS
+	frappe.db.set_value(
+		OUTBOX_DOCTYPE,
+		row.name,
+		{
+			"sync_outbox_status": "Error" if give_up else "Pending",
+			"sync_outbox_attempts": attempts,
+			"sync_outbox_next_attempt_at": frappe.utils.add_to_date(
+				frappe.utils.now_datetime(), seconds=_retry_delay_seconds(attempts)
+			),
+			"sync_outbox_last_error": _safe_str(exc)[:1000],
+		},
+		update_modified=False,
+	)
+	if give_up:
+		frappe.log_error(
+			_safe_str(exc),
+			f"FireLink sync failed: {row.sync_outbox_reference_doctype} {row.sync_outbox_reference_name}",
 		)
-		if not firelink_property_id:
-			return
 
-		firelink_asset_id = ""
-		linked_asset_id = _safe_str(getattr(doc, "defect_asset", ""))
-		if linked_asset_id and frappe.db.exists("FT Asset", linked_asset_id):
-			firelink_asset_id = _safe_str(
-				frappe.db.get_value("FT Asset", linked_asset_id, "asset_firelink_uid")
-			)
-
-		result = (
-			integrations.firelink_defect_sync(
-				local_defect_id=_safe_str(doc.name),
-				firelink_property_id=firelink_property_id,
-				firelink_asset_id=firelink_asset_id or None,
-				defect_template_code=_safe_str(getattr(doc, "defect_template", "")),
-				defect_severity=_safe_str(getattr(doc, "defect_severity", "")),
-				defect_status=_safe_str(getattr(doc, "defect_status", "")),
-				defect_summary=_safe_str(getattr(doc, "defect_description", ""))[:140],
-			)
-			or {}
+
+def _mark_sent(row) -> None:
+	_count(row.sync_outbox_reference_doctype, "sent")
+	# Only mark Sent if nobody re-queued the row (new idempotency key) while we were pushing.
+	frappe.db.sql(
+		"""
+		update `tabFL Sync Outbox`
+		set sync_outbox_status = 'Sent', sync_outbox_sent_at = %s, sync_outbox_last_error = ''
+		where name = %s and sync_outbox_idempotency_key = %s
+		""",
+		(frappe.utils.now_datetime(), row.name, row.sync_outbox_idempotency_key),
+	)
+
+
+def _drain_bulk(doctype: str, rows: list) -> None:
+	"""Push a group of same-doctype rows through the FireLink bulk endpoint."""
+	build_payload, bulk_sync, key, id_field = OUTBOX_BULK[doctype]
+	payloads: list[dict[str, Any]] = []
+	by_docname: dict[str, Any] = {}
+	for row in rows:
+		docname = _safe_str(row.sync_outbox_reference_name)
+		try:
+			if not frappe.db.exists(doctype, docname):
+				frappe.delete_doc(OUTBOX_DOCTYPE, row.name, ignore_permissions=True, force=True)
+				continue
+			payload = build_payload(frappe.get_doc(doctype, docname))
+		except Exception as exc:
+			frappe.db.rollback()
+			_mark_failed(row, exc)
+			continue
+		if payload is None:
+			# Nothing FireLink can accept yet (no linked property); same as a no-op push.
+			_mark_sent(row)
+			continue
+		payload["idempotency_key"] = row.sync_outbox_idempotency_key
+		payloads.append(payload)
+		by_docname[docname] = row
+	frappe.db.commit()
+	if not payloads:
+		return
+	try:
+		results = (bulk_sync(**{key: payloads}) or {}).get("results") or []
+	except Exception as exc:
+		frappe.db.rollback()
+		for row in by_docname.values():
+			_mark_failed(row, exc)
+		frappe.db.commit()
+		return
+	by_id = {_safe_str(r.get(id_field)): r for r in results if isinstance(r, dict)}
+	for docname, row in by_docname.items():
+		result = by_id.get(docname)
+		if result is None:
+			_mark_failed(row, "No result from FireLink bulk sync")
+		elif _safe_str(result.get("error")):
+			_mark_failed(row, _safe_str(result.get("error")))
+		else:
+			_mark_sent(row)
+	frappe.db.commit()
+
+
+def _claim_batch(doctypes: list[str]) -> list:
+	"""Lock a batch of due rows, mark them Sending and commit, so concurrent drainers never share rows.
+
+	Sending rows get a lease in sync_outbox_next_attempt_at; if this drainer dies
+	they become due again once it expires.
+	"""
+	now = frappe.utils.now_datetime()
+	rows = frappe.db.sql(
+		"""
+		select name, sync_outbox_reference_doctype, sync_outbox_reference_name,
+			sync_outbox_idempotency_key, sync_outbox_attempts
+		from `tabFL Sync Outbox`
+		where sync_outbox_status in ('Pending', 'Sending')
+			and sync_outbox_next_attempt_at <= %(now)s
+			and sync_outbox_reference_doctype in %(doctypes)s
+		order by sync_outbox_next_attempt_at asc
+		limit %(limit)s
+		for update skip locked
+		""",
+		{"now": now, "doctypes": tuple(doctypes), "limit": OUTBOX_BATCH_SIZE},
+		as_dict=True,
+	)
+	if rows:
+		frappe.db.sql(
+			"""
+			update `tabFL Sync Outbox`
+			set sync_outbox_status = 'Sending', sync_outbox_next_attempt_at = %s
+			where name in %s
+			""",
+			(
+				frappe.utils.add_to_date(now, seconds=OUTBOX_CLAIM_SECONDS),
+				tuple(row.name for row in rows),
+			),
 		)
-		firelink_defect_id = _safe_str(result.get("firelink_defect_id"))
-		if firelink_defect_id and firelink_defect_id != _safe_str(getattr(doc, "defect_firelink_uid", "")):
-			frappe.db.set_value(
-				"FT Defect", doc.name, "defect_firelink_uid", firelink_defect_id, update_modified=False
-			)
-	except Exception:
-		frappe.log_error(frappe.get_traceback(), f"FireLink defect sync failed: {doc.doctype} {doc.name}")
+	frappe.db.commit()
+	return rows
+
+
+def drain_outbox():
+	"""Background job / scheduler: push due FireLink outbox rows in batches."""
+	order = list(OUTBOX_PUSHERS)
+	for _ in range(OUTBOX_MAX_BATCHES):
+		rows = _claim_batch(order)
+		rows.sort(key=lambda r: order.index(r.sync_outbox_reference_doctype))
+		for doctype in order:
+			group = [r for r in rows if r.sync_outbox_reference_doctype == doctype]
+			if doctype in OUTBOX_BULK:
+				_drain_bulk(doctype, group)
+				continue
+			for row in group:
+				_drain_row(row)
+				frappe.db.commit()
+		if len(rows) < OUTBOX_BATCH_SIZE:
+			return
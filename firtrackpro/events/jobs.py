@@ -3,6 +3,9 @@ import frappe
 
 
 def _emit(event, payload, doctype=None, docname=None):
+	# Bulk scheduler writes send one aggregated event themselves.
+	if frappe.flags.in_bulk_schedule_update:
+		return
 	if doctype:
 		frappe.publish_realtime(event, payload, doctype=doctype, after_commit=True)
 	if doctype and docname:
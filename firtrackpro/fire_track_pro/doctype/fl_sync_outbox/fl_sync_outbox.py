@@ -1,9 +1,15 @@
 # Copyright (c) 2025, SJK and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class FLSyncOutbox(Document):
 	pass
+
+
+def on_doctype_update():
+	# The FireLink drainer polls due Pending rows every minute.
+	frappe.db.add_index("FL Sync Outbox", ["sync_outbox_status", "sync_outbox_next_attempt_at"])
+	frappe.db.add_index("FL Sync Outbox", ["sync_outbox_reference_doctype", "sync_outbox_reference_name"])
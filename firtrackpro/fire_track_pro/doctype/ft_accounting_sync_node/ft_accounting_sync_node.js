@@ -0,0 +1 @@
+frappe.ui.form.on("FT Accounting Sync Node", {});
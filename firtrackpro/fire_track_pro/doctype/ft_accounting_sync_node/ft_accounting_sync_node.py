@@ -0,0 +1,14 @@
+# Copyright (c) 2026, SJK and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class FTAccountingSyncNode(Document):
+	pass
+
+
+def on_doctype_update():
+	# Each finished node scans its run/provider siblings to enqueue newly ready dependents.
+	frappe.db.add_index("FT Accounting Sync Node", ["run_id", "provider"])
@@ -1,9 +1,35 @@
 # Copyright (c) 2025, SJK and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from firtrackpro.api.conflicts import INACTIVE_INSTRUMENT_STATUSES, instrument_booking_clashes
+
+# Changing any of these can create a new double booking; other edits only warn about existing ones.
+SLOT_FIELDS = (
+	"instrument_booking_instrument",
+	"instrument_booking_start",
+	"instrument_booking_end",
+	"instrument_booking_status",
+)
+
 
 class FTInstrumentBooking(Document):
-	pass
+	def validate(self):
+		if self.instrument_booking_status in INACTIVE_INSTRUMENT_STATUSES:
+			return
+		clashes = instrument_booking_clashes(
+			self.instrument_booking_instrument,
+			self.instrument_booking_start,
+			self.instrument_booking_end,
+			ignore_booking=self.name if not self.is_new() else None,
+		)
+		if not clashes:
+			return
+		message = (
+			f"{self.instrument_booking_instrument} is already booked for this time ({', '.join(clashes)})."
+		)
+		if self.is_new() or any(self.has_value_changed(field) for field in SLOT_FIELDS):
+			frappe.throw(message)
+		frappe.msgprint(message, indicator="orange", alert=True)
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, SJK and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class FTJobAssignment(Document):
+	pass
+
+
+def on_doctype_update():
+	# "My jobs" is a range scan over one technician's rows in schedule order.
+	frappe.db.add_index("FT Job Assignment", ["user", "scheduled_start"])
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, SJK and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class FTPartnerHandover(Document):
+	pass
+
+
+def on_doctype_update():
+	# Schedule locks look up the active outbound handover for a job on every drag.
+	frappe.db.add_index("FT Partner Handover", ["job_name", "direction", "status"])
@@ -0,0 +1 @@
+frappe.ui.form.on("FT Partner Link Request", {});
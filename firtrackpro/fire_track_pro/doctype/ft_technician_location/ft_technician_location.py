@@ -1,9 +1,14 @@
 # Copyright (c) 2026, SJK and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class FTTechnicianLocation(Document):
 	pass
+
+
+def on_doctype_update():
+	# Latest fix per technician (dispatch origins, route start) reads the top of this index.
+	frappe.db.add_index("FT Technician Location", ["technician", "timestamp"])
@@ -1,9 +1,21 @@
 # Copyright (c) 2025, SJK and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from firtrackpro.api import work_calendar
+
 
 class FTWorkCalendar(Document):
-	pass
+	def validate(self):
+		if (self.work_calendar_hours_json or "").strip() and not work_calendar.parse_hours(
+			self.work_calendar_hours_json
+		):
+			frappe.throw('Opening hours must be JSON like {"mon": [["07:00", "15:30"]]}.')
+
+	def on_update(self):
+		work_calendar.invalidate(self.name)
+
+	def on_trash(self):
+		work_calendar.invalidate(self.name)
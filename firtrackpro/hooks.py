@@ -12,7 +12,10 @@ app_include_css = "assets/firtrackpro/css/brand.css"
 home_page = "index"
 get_website_user_home_page = "firtrackpro.portal_utils.get_website_user_home_page"
 after_install = "firtrackpro.api.site_info.apply_portal_site_defaults"
-after_migrate = "firtrackpro.api.site_info.apply_portal_site_defaults"
+after_migrate = [
+	"firtrackpro.api.site_info.apply_portal_site_defaults",
+	"firtrackpro.api.schema_cache.clear",
+]
 
 on_session_creation = [
 	"firtrackpro.api.site_info.force_portal_home_on_session_creation",
@@ -33,30 +36,89 @@ website_route_rules = [
 
 
 doc_events = {
+	"DocType": {
+		"on_update": "firtrackpro.api.schema_cache.on_schema_change",
+		"on_trash": "firtrackpro.api.schema_cache.on_schema_change",
+	},
+	"Custom Field": {
+		"on_update": "firtrackpro.api.schema_cache.on_schema_change",
+		"on_trash": "firtrackpro.api.schema_cache.on_schema_change",
+	},
+	"Property Setter": {
+		"on_update": "firtrackpro.api.schema_cache.on_schema_change",
+		"on_trash": "firtrackpro.api.schema_cache.on_schema_change",
+	},
 	"User": {
 		"validate": "firtrackpro.api.users.enforce_user_seat_limit",
 	},
 	"FT Job": {
-		"after_insert": "firtrackpro.events.jobs.emit_job_inserted",
-		"on_update": "firtrackpro.events.jobs.emit_job_updated",
-		"on_trash": "firtrackpro.events.jobs.emit_job_deleted",
+		"validate": "firtrackpro.api.jobs.set_job_search",
+		"after_insert": [
+			"firtrackpro.events.jobs.emit_job_inserted",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		],
+		"on_update": [
+			"firtrackpro.events.jobs.emit_job_updated",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+			"firtrackpro.api.sla.on_job_change",
+			"firtrackpro.api.assignments.on_job_update",
+		],
+		"on_trash": [
+			"firtrackpro.events.jobs.emit_job_deleted",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+			"firtrackpro.api.sla.on_job_trash",
+			"firtrackpro.api.assignments.on_job_trash",
+		],
 		"after_delete": "firtrackpro.events.jobs.emit_job_deleted",  # optional safety
 	},
 	"FT Schedule": {
-		"after_insert": "firtrackpro.events.jobs.emit_schedule_inserted",
-		"on_update": "firtrackpro.events.jobs.emit_schedule_updated",
+		"after_insert": [
+			"firtrackpro.events.jobs.emit_schedule_inserted",
+			"firtrackpro.api.assignments.on_schedule_change",
+		],
+		"on_update": [
+			"firtrackpro.events.jobs.emit_schedule_updated",
+			"firtrackpro.api.assignments.on_schedule_change",
+		],
+		"after_delete": "firtrackpro.api.assignments.on_schedule_change",
 	},
 	"FT Property": {
-		"after_insert": "firtrackpro.events.firelink_sync.sync_property_after_save",
-		"on_update": "firtrackpro.events.firelink_sync.sync_property_after_save",
+		"after_insert": [
+			"firtrackpro.events.firelink_sync.queue_firelink_sync",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		],
+		"on_update": [
+			"firtrackpro.events.firelink_sync.queue_firelink_sync",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		],
+		"on_trash": "firtrackpro.api.integrations.invalidate_firelink_snapshot",
 	},
 	"FT Asset": {
-		"after_insert": "firtrackpro.events.firelink_sync.sync_asset_after_save",
-		"on_update": "firtrackpro.events.firelink_sync.sync_asset_after_save",
+		"after_insert": "firtrackpro.events.firelink_sync.queue_firelink_sync",
+		"on_update": "firtrackpro.events.firelink_sync.queue_firelink_sync",
 	},
 	"FT Defect": {
-		"after_insert": "firtrackpro.events.firelink_sync.sync_defect_after_save",
-		"on_update": "firtrackpro.events.firelink_sync.sync_defect_after_save",
+		"after_insert": [
+			"firtrackpro.events.firelink_sync.queue_firelink_sync",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		],
+		"on_update": [
+			"firtrackpro.events.firelink_sync.queue_firelink_sync",
+			"firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		],
+		"on_trash": "firtrackpro.api.integrations.invalidate_firelink_snapshot",
+	},
+	"Address": {
+		"validate": "firtrackpro.api.integrations.set_address_keys",
+		"on_update": "firtrackpro.events.firelink_sync.queue_address_properties",
+	},
+	"FL Address": {
+		"validate": "firtrackpro.api.integrations.set_address_keys",
+	},
+	"FL Property": {
+		"after_insert": "firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		"on_update": "firtrackpro.api.integrations.invalidate_firelink_snapshot",
+		"on_trash": "firtrackpro.api.integrations.invalidate_firelink_snapshot",
 	},
 }
 
@@ -65,5 +127,16 @@ scheduler_events = {
 		"0 1 * * *": [
 			"firtrackpro.api.integrations.run_accounting_auto_sync",
 		],
+		"30 2 * * *": [
+			"firtrackpro.api.recurrence.expand_schedule_rules",
+		],
+		"*/5 * * * *": [
+			"firtrackpro.api.integrations.refresh_oauth_tokens",
+			"firtrackpro.api.integrations.resume_deferred_accounting_nodes",
+		],
+		"* * * * *": [
+			"firtrackpro.events.firelink_sync.drain_outbox",
+			"firtrackpro.api.sla.fire_due_escalations",
+		],
 	},
 }
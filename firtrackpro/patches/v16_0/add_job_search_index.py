@@ -0,0 +1,59 @@
+import frappe
+
+from firtrackpro.api.jobs import DOCTYPE, SEARCH_FIELD, SEARCH_FULLTEXT_INDEX, build_job_search
+
+PAGE_SIZE = 1000
+
+
+def _names(doctype, field, names):
+	if not names:
+		return {}
+	rows = frappe.get_all(
+		doctype,
+		filters={"name": ["in", list(names)]},
+		fields=["name", field],
+		as_list=True,
+		limit_page_length=0,
+	)
+	return dict(rows)
+
+
+def execute():
+	if not frappe.db.has_column(DOCTYPE, SEARCH_FIELD):
+		return
+	# Backs keyset paging in list_jobs (order by modified desc, name desc).
+	frappe.db.add_index(DOCTYPE, ["modified", "name"], "modified_name_index")
+	if frappe.db.db_type == "mariadb" and not frappe.db.has_index(f"tab{DOCTYPE}", SEARCH_FULLTEXT_INDEX):
+		frappe.db.sql_ddl(
+			f"alter table `tab{DOCTYPE}` add fulltext index `{SEARCH_FULLTEXT_INDEX}` (`{SEARCH_FIELD}`)"
+		)
+	frappe.cache().delete_value("firtrackpro:job_search_fulltext")
+
+	last_name = 0
+	while True:
+		rows = frappe.get_all(
+			DOCTYPE,
+			filters={"name": [">", last_name]},
+			fields=["name", "job_title", "job_status", "job_lead_user", "job_property", "job_customer"],
+			order_by="name asc",
+			limit_page_length=PAGE_SIZE,
+		)
+		if not rows:
+			break
+		properties = _names("FT Property", "property_name", {r.job_property for r in rows if r.job_property})
+		customers = _names("Customer", "customer_name", {r.job_customer for r in rows if r.job_customer})
+		updates = {
+			row.name: {
+				SEARCH_FIELD: build_job_search(
+					row.job_title,
+					row.job_status,
+					row.job_lead_user,
+					properties.get(row.job_property) or row.job_property,
+					customers.get(row.job_customer) or row.job_customer,
+				)
+			}
+			for row in rows
+		}
+		frappe.db.bulk_update(DOCTYPE, updates, update_modified=False)
+		frappe.db.commit()
+		last_name = rows[-1].name
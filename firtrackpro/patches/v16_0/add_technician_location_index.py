@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+	# Backs the latest-fix-per-technician lookups in dispatch and routing.
+	frappe.db.add_index("FT Technician Location", ["technician", "timestamp"])
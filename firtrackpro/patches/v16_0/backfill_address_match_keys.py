@@ -0,0 +1,48 @@
+import frappe
+
+from firtrackpro.api.integrations import (
+	ADDRESS_KEY_FIELD,
+	ADDRESS_MATCH_KEY_FIELD,
+	FIRELINK_ADDRESS_DOCTYPES,
+	_address_field_mapping,
+	_address_key,
+	_address_match_key,
+	_ensure_address_key_fields,
+)
+
+PAGE_SIZE = 1000
+
+
+def execute():
+	_ensure_address_key_fields()
+	for doctype in FIRELINK_ADDRESS_DOCTYPES:
+		if not frappe.db.exists("DocType", doctype) or not frappe.db.has_column(doctype, ADDRESS_KEY_FIELD):
+			continue
+		mapping = _address_field_mapping(
+			{d.fieldname for d in frappe.get_meta(doctype).fields if d.fieldname}
+		)
+		if not mapping:
+			continue
+		fields = ["name", mapping["line1"]] + ([mapping["post"]] if mapping["post"] else [])
+		last_name = ""
+		while True:
+			rows = frappe.get_all(
+				doctype,
+				filters={"name": [">", last_name]},
+				fields=fields,
+				order_by="name asc",
+				limit_page_length=PAGE_SIZE,
+			)
+			if not rows:
+				break
+			updates = {}
+			for row in rows:
+				line1 = row.get(mapping["line1"])
+				post = row.get(mapping["post"]) if mapping["post"] else ""
+				updates[row.name] = {
+					ADDRESS_KEY_FIELD: _address_key(line1) or None,
+					ADDRESS_MATCH_KEY_FIELD: _address_match_key(line1, post) or None,
+				}
+			frappe.db.bulk_update(doctype, updates, update_modified=False)
+			frappe.db.commit()
+			last_name = rows[-1].name
@@ -0,0 +1,24 @@
+import frappe
+
+from firtrackpro.api.assignments import ASSIGNMENT_DOCTYPE, refresh_jobs
+
+PAGE_SIZE = 1000
+
+
+def execute():
+	if not frappe.db.table_exists(ASSIGNMENT_DOCTYPE):
+		return
+	last_name = 0
+	while True:
+		names = frappe.get_all(
+			"FT Job",
+			filters={"name": [">", last_name]},
+			order_by="name asc",
+			pluck="name",
+			limit_page_length=PAGE_SIZE,
+		)
+		if not names:
+			break
+		refresh_jobs(names)
+		frappe.db.commit()
+		last_name = names[-1]
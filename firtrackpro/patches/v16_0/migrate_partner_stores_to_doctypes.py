@@ -0,0 +1,42 @@
+import uuid
+
+import frappe
+
+from firtrackpro.api import partner_links
+
+
+def _migrate(store_key, doctype, save_row, id_keys):
+	rows = partner_links._load_json_list(store_key)
+	for row in rows:
+		if not isinstance(row, dict):
+			continue
+		row_id = next((str(row.get(k) or "").strip() for k in id_keys if str(row.get(k) or "").strip()), "")
+		row["id"] = row_id or str(uuid.uuid4())
+		if frappe.db.exists(doctype, row["id"]):
+			continue
+		save_row(row)
+	if rows:
+		frappe.defaults.clear_default(key=store_key)
+
+
+def execute():
+	for doctype in (
+		partner_links.LINK_DOCTYPE,
+		partner_links.HANDOVER_DOCTYPE,
+		partner_links.REQUEST_DOCTYPE,
+	):
+		frappe.reload_doc("fire_track_pro", "doctype", frappe.scrub(doctype))
+
+	_migrate(partner_links.STORE_KEY, partner_links.LINK_DOCTYPE, partner_links._save_link, ["id"])
+	_migrate(
+		partner_links.STORE_HANDOVERS_KEY,
+		partner_links.HANDOVER_DOCTYPE,
+		partner_links._save_handover,
+		["id"],
+	)
+	_migrate(
+		partner_links.STORE_REQUESTS_KEY,
+		partner_links.REQUEST_DOCTYPE,
+		partner_links._save_request,
+		["request_id", "id"],
+	)
@@ -0,0 +1,51 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+import random
+from datetime import datetime, timedelta
+
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import conflicts
+
+BASE = datetime(2026, 10, 19, 7)
+
+
+def _brute_force(intervals, start, end):
+	return sorted(item for row_start, row_end, item in intervals if row_start < end and row_end > start)
+
+
+class UnitTestIntervalTree(UnitTestCase):
+	def test_matches_brute_force(self):
+		rng = random.Random(42)
+		intervals = []
+		for i in range(300):
+			start = BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 14, 15))
+			intervals.append((start, start + timedelta(minutes=rng.randrange(15, 600, 15)), f"JOB-{i}"))
+		tree = conflicts.IntervalTree(intervals)
+		self.assertEqual(len(tree), len(intervals))
+		for _ in range(200):
+			start = BASE + timedelta(minutes=rng.randrange(-600, 60 * 24 * 15, 5))
+			end = start + timedelta(minutes=rng.randrange(1, 900))
+			self.assertEqual(sorted(tree.overlapping(start, end)), _brute_force(intervals, start, end))
+
+	def test_half_open_edges(self):
+		tree = conflicts.IntervalTree([(BASE, BASE + timedelta(hours=2), "A")])
+		self.assertEqual(tree.overlapping(BASE + timedelta(hours=2), BASE + timedelta(hours=3)), [])
+		self.assertEqual(tree.overlapping(BASE - timedelta(hours=1), BASE), [])
+		self.assertEqual(
+			tree.overlapping(BASE + timedelta(hours=1), BASE + timedelta(hours=1, minutes=1)), ["A"]
+		)
+
+	def test_long_interval_under_later_starts(self):
+		# A long booking must still be found when many short ones start after it.
+		rows = [(BASE, BASE + timedelta(days=3), "LONG")]
+		rows += [
+			(BASE + timedelta(hours=h), BASE + timedelta(hours=h, minutes=30), f"S{h}") for h in range(1, 40)
+		]
+		tree = conflicts.IntervalTree(rows)
+		hits = tree.overlapping(BASE + timedelta(hours=50), BASE + timedelta(hours=51))
+		self.assertEqual(hits, ["LONG"])
+
+	def test_empty_tree(self):
+		self.assertEqual(conflicts.IntervalTree([]).overlapping(BASE, BASE + timedelta(hours=1)), [])
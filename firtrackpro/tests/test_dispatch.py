@@ -0,0 +1,67 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+from datetime import date
+
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import dispatch, work_calendar
+
+MONDAY = date(2026, 10, 19)
+
+
+def _tech(name, origin=None, clearances=()):
+	return {
+		"name": name,
+		"user": f"{name}@example.com",
+		"calendar": "default",
+		"competencies": set(),
+		"licences": [],
+		"clearances": list(clearances),
+		"inductions": [],
+		"origin": origin,
+	}
+
+
+def _problem(jobs, techs, coords=None, credentials=None, busy=None, days=(MONDAY,)):
+	calendars = {"default": work_calendar.CompiledCalendar()}
+	return dispatch._Problem(
+		jobs, techs, list(days), calendars, coords or {}, credentials or {}, {}, {}, busy
+	)
+
+
+class UnitTestDispatch(UnitTestCase):
+	def test_free_spans_removes_bookings(self):
+		spans = [(420, 720), (780, 930)]
+		busy = [(600, 800), (400, 450)]
+		self.assertEqual(dispatch._free_spans(spans, busy), [(450, 600), (800, 930)])
+		self.assertEqual(dispatch._free_spans(spans, []), spans)
+
+	def test_solve_places_every_job_once_within_capacity(self):
+		coords = {f"P{i}": (-33.8 + i * 0.01, 151.2 + (i % 3) * 0.01) for i in range(8)}
+		jobs = [{"id": f"JOB-{i}", "property_id": f"P{i}", "duration_minutes": 60} for i in range(8)]
+		techs = [_tech("a", origin=(-33.8, 151.2)), _tech("b", origin=(-33.75, 151.22))]
+		problem = _problem(jobs, techs, coords=coords)
+		routes, _ = dispatch._solve(problem, 0.05, seed=7)
+
+		placed = [ji for route in routes.values() for ji in route]
+		self.assertCountEqual(placed, range(len(jobs)))
+		for key, route in routes.items():
+			_, load = problem.route_cost(key, route)
+			self.assertLessEqual(load, problem.capacity[key] + 1e-6)
+
+	def test_solve_respects_blocking_credentials(self):
+		jobs = [{"id": "JOB-1", "property_id": "SITE", "duration_minutes": 60}]
+		techs = [_tech("a"), _tech("b", clearances=[("police check", None)])]
+		problem = _problem(jobs, techs, credentials={"SITE": ["police check"]})
+		routes, _ = dispatch._solve(problem, 0.0, seed=1)
+		self.assertEqual({key for key, route in routes.items() if route}, {(1, 0)})
+
+	def test_booked_time_reduces_capacity(self):
+		jobs = [{"id": "JOB-1", "property_id": "P1", "duration_minutes": 120}]
+		techs = [_tech("a")]
+		# Default day is 07:00-15:30; leave only 90 free minutes.
+		problem = _problem(jobs, techs, busy={(0, 0): [(420, 840)]})
+		self.assertEqual(problem.windows[(0, 0)], [(840, 930)])
+		routes, _ = dispatch._solve(problem, 0.0, seed=1)
+		self.assertFalse(any(routes.values()))
@@ -0,0 +1,42 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import http_cache
+
+
+class UnitTestHttpCache(UnitTestCase):
+	def _respond(self, if_none_match=None, fallback=None):
+		headers = {"If-None-Match": if_none_match} if if_none_match else {}
+		local = SimpleNamespace(request=SimpleNamespace(headers=headers), response_headers={}, response={})
+		payload = {"value": 1}
+		with patch.object(frappe, "local", local, create=True):
+			body = http_cache.conditional_response(payload, http_cache.payload_etag(payload), fallback)
+		return body, local
+
+	def test_etag_is_stable(self):
+		self.assertEqual(http_cache.payload_etag({"a": 1, "b": 2}), http_cache.payload_etag({"b": 2, "a": 1}))
+
+	def test_fresh_client_gets_payload_and_header(self):
+		body, local = self._respond()
+		self.assertEqual(body, {"value": 1})
+		self.assertEqual(local.response_headers["ETag"], f'"{http_cache.payload_etag(body)}"')
+		self.assertNotIn("http_status_code", local.response)
+
+	def test_matching_tag_is_not_modified(self):
+		etag = http_cache.payload_etag({"value": 1})
+		for header in (f'"{etag}"', f'W/"{etag}"', f'"other", W/"{etag}"', "*"):
+			body, local = self._respond(header)
+			self.assertEqual(body, {"not_modified": True, "etag": etag})
+			self.assertEqual(local.response["http_status_code"], 304)
+		body, local = self._respond(fallback=etag)
+		self.assertTrue(body["not_modified"])
+
+	def test_other_tag_gets_payload(self):
+		body, local = self._respond('"stale"')
+		self.assertEqual(body, {"value": 1})
@@ -0,0 +1,30 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+from datetime import datetime
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import jobs
+
+
+class UnitTestJobCursor(UnitTestCase):
+	def test_round_trip(self):
+		for modified, name in (
+			(datetime(2026, 10, 18, 9, 30, 15, 123456), "JOB-00001"),
+			(datetime(2026, 1, 1), "job/with spaces & ünïcode"),
+			(datetime(2026, 2, 28, 23, 59, 59, 999999), "=+/"),
+		):
+			cursor = jobs._encode_cursor(modified, name)
+			self.assertNotIn("=", cursor)
+			self.assertEqual(jobs._decode_cursor(cursor), (modified, name))
+
+	def test_string_modified(self):
+		cursor = jobs._encode_cursor("2026-10-18 09:30:15.000001", "JOB-2")
+		self.assertEqual(jobs._decode_cursor(cursor), (datetime(2026, 10, 18, 9, 30, 15, 1), "JOB-2"))
+
+	def test_invalid_cursor(self):
+		for cursor in ("not-a-cursor", "W10", jobs._encode_cursor("not a date", "JOB-1")):
+			with self.assertRaises(frappe.ValidationError):
+				jobs._decode_cursor(cursor)
@@ -0,0 +1,99 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import recurrence
+
+
+def _rule(frequency=None, anchor="2026-01-15", next_occurrence=None, rrule=None):
+	return frappe._dict(
+		name="RULE-1",
+		schedule_rule_frequency=frequency,
+		frequency_title=frequency,
+		anchor_date=anchor,
+		schedule_rule_next_occurrence=next_occurrence,
+		schedule_rule_rrule=rrule,
+	)
+
+
+class UnitTestRecurrence(UnitTestCase):
+	def test_monthly_from_next_occurrence(self):
+		occurrences, following = recurrence.expand_rule(
+			_rule("Monthly", next_occurrence="2026-03-15"), datetime(2026, 6, 30, 23, 59)
+		)
+		self.assertEqual(
+			[o.date().isoformat() for o in occurrences],
+			["2026-03-15", "2026-04-15", "2026-05-15", "2026-06-15"],
+		)
+		self.assertEqual(following, datetime(2026, 7, 15))
+
+	def test_unseeded_rule_starts_after_anchor(self):
+		occurrences, following = recurrence.expand_rule(_rule("Fortnightly"), datetime(2026, 2, 28))
+		self.assertEqual(
+			[o.date().isoformat() for o in occurrences], ["2026-01-29", "2026-02-12", "2026-02-26"]
+		)
+		self.assertEqual(following, datetime(2026, 3, 12))
+		self.assertEqual(recurrence.first_occurrence(_rule("Weekly")), datetime(2026, 1, 22))
+
+	def test_rrule_only(self):
+		rule = _rule(rrule="FREQ=MONTHLY;BYMONTHDAY=1")
+		self.assertEqual(recurrence.first_occurrence(rule), datetime(2026, 2, 1))
+		occurrences, following = recurrence.expand_rule(rule, datetime(2026, 4, 15))
+		self.assertEqual(len(occurrences), 3)
+		self.assertEqual(following, datetime(2026, 5, 1))
+
+	def test_one_off(self):
+		rule = _rule("One-off", anchor="2026-05-01")
+		self.assertEqual(recurrence.expand_rule(rule, datetime(2026, 6, 1)), ([datetime(2026, 5, 1)], None))
+		self.assertEqual(recurrence.expand_rule(rule, datetime(2026, 4, 1)), ([], datetime(2026, 5, 1)))
+
+	def test_occurrence_cap(self):
+		rule = _rule("Weekly", next_occurrence="2026-01-22")
+		occurrences, following = recurrence.expand_rule(rule, datetime(2030, 1, 1))
+		self.assertEqual(len(occurrences), recurrence.MAX_OCCURRENCES_PER_RULE)
+		self.assertGreater(following, occurrences[-1])
+
+	def test_unknown_frequency_raises(self):
+		with self.assertRaises(frappe.ValidationError):
+			recurrence.expand_rule(_rule("Whenever"), datetime(2026, 6, 1))
+
+
+class UnitTestExpandChunk(UnitTestCase):
+	def test_failing_rule_rolls_back_alone(self):
+		rules = [
+			frappe._dict(
+				_rule("Monthly", next_occurrence="2026-03-15"), name=name, schedule_rule_property=name
+			)
+			for name in ("RULE-1", "RULE-2")
+		]
+
+		def get_doc(values):
+			if values["job_schedule_rule"] == "RULE-2":
+				raise frappe.ValidationError("bad job")
+			return SimpleNamespace(
+				name=values["job_required_date"].day, flags=SimpleNamespace(), insert=MagicMock()
+			)
+
+		db = MagicMock()
+		with (
+			patch.object(frappe, "db", db, create=True),
+			patch.object(frappe, "get_doc", get_doc, create=True),
+			patch.object(frappe, "log_error", MagicMock(), create=True),
+			patch.object(frappe, "get_traceback", MagicMock(return_value=""), create=True),
+			patch.object(recurrence, "_existing_occurrences", return_value=set()),
+			patch.object(recurrence, "_task_plan", return_value={}),
+			patch.object(recurrence, "_insert_schedules") as insert_schedules,
+		):
+			created, failed = recurrence._expand_chunk(rules, datetime(2026, 4, 30), {})
+
+		self.assertEqual((created, failed), (2, 1))
+		db.rollback.assert_called_once_with(save_point=recurrence.RULE_SAVEPOINT)
+		db.set_value.assert_called_once()
+		self.assertEqual(db.set_value.call_args.args[1], "RULE-1")
+		self.assertEqual([row[1] for row in insert_schedules.call_args.args[0]], ["RULE-1", "RULE-1"])
@@ -0,0 +1,159 @@
+# Copyright (c) 2026, SJK and Contributors
+# See license.txt
+
+import json
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from firtrackpro.api import work_calendar
+
+# Split shifts on weekdays, a short Saturday, Sunday closed.
+HOURS = {
+	0: [(7 * 60, 12 * 60), (12 * 60 + 30, 15 * 60 + 30)],
+	1: [(7 * 60, 12 * 60), (12 * 60 + 30, 15 * 60 + 30)],
+	2: [(6 * 60, 10 * 60), (11 * 60, 14 * 60), (18 * 60, 22 * 60)],
+	3: [(7 * 60, 12 * 60), (12 * 60 + 30, 15 * 60 + 30)],
+	4: [(7 * 60, 12 * 60)],
+	5: [(8 * 60, 10 * 60)],
+}
+HOLIDAYS = {date(2026, 12, 25), date(2026, 12, 28), date(2027, 1, 1), date(2027, 1, 26)}
+START = datetime(2026, 12, 20)
+
+
+def _open(when):
+	if when.date() in HOLIDAYS:
+		return False
+	minute = when.hour * 60 + when.minute
+	return any(start <= minute < end for start, end in HOURS.get(when.weekday(), []))
+
+
+def _walk_between(start, end):
+	minutes = 0
+	cursor = start
+	while cursor < end:
+		minutes += _open(cursor)
+		cursor += timedelta(minutes=1)
+	return minutes
+
+
+def _walk_add(start, minutes):
+	cursor = start
+	while True:
+		if _open(cursor):
+			minutes -= 1
+			if minutes == 0:
+				return cursor + timedelta(minutes=1)
+		cursor += timedelta(minutes=1)
+
+
+class UnitTestWorkCalendar(UnitTestCase):
+	def setUp(self):
+		self.calendar = work_calendar.CompiledCalendar(HOURS, HOLIDAYS)
+		self.rng = random.Random(1851)
+
+	def _random_time(self, days=30):
+		return START + timedelta(minutes=self.rng.randrange(0, days * 24 * 60))
+
+	def test_minutes_between_matches_walk(self):
+		for _ in range(60):
+			start = self._random_time()
+			end = start + timedelta(minutes=self.rng.randrange(0, 10 * 24 * 60))
+			self.assertAlmostEqual(self.calendar.minutes_between(start, end), _walk_between(start, end))
+			self.assertAlmostEqual(self.calendar.minutes_between(end, start), -_walk_between(start, end))
+
+	def test_add_minutes_matches_walk(self):
+		for _ in range(60):
+			start = self._random_time()
+			minutes = self.rng.randrange(1, 3000)
+			self.assertEqual(self.calendar.add_minutes(start, minutes), _walk_add(start, minutes))
+
+	def test_add_minutes_round_trip(self):
+		for _ in range(40):
+			start = self._random_time()
+			minutes = self.rng.randrange(1, 3000)
+			end = self.calendar.add_minutes(start, minutes)
+			self.assertAlmostEqual(self.calendar.minutes_between(start, end), minutes)
+
+	def test_split_shift_and_holiday_edges(self):
+		monday = datetime(2026, 12, 21)
+		# Exact fit ends at the close of the morning shift, not the start of the afternoon one.
+		self.assertEqual(self.calendar.add_minutes(monday.replace(hour=7), 300), monday.replace(hour=12))
+		self.assertEqual(
+			self.calendar.add_minutes(monday.replace(hour=11, minute=30), 60), monday.replace(hour=13)
+		)
+		# Friday 25th is a holiday: Thursday afternoon rolls over to the Saturday shift.
+		thursday = datetime(2026, 12, 24, 15)
+		self.assertEqual(self.calendar.add_minutes(thursday, 60), datetime(2026, 12, 26, 8, 30))
+		self.assertFalse(self.calendar.is_open(datetime(2026, 12, 25, 9)))
+		self.assertEqual(self.calendar.windows(date(2026, 12, 28)), [])
+		self.assertEqual(self.calendar.minutes_between(datetime(2026, 12, 25), datetime(2026, 12, 26)), 0)
+
+	def test_is_open_matches_hours(self):
+		for _ in range(200):
+			when = self._random_time().replace(second=0, microsecond=0)
+			self.assertEqual(self.calendar.is_open(when), _open(when))
+
+
+class _Cache:
+	"""Just enough of the Redis wrapper for the calendar hash."""
+
+	def __init__(self):
+		self.data = {}
+
+	def hget(self, key, field):
+		return self.data.get((key, field))
+
+	def hset(self, key, field, value):
+		self.data[(key, field)] = value
+
+	def hdel(self, key, field):
+		self.data.pop((key, field), None)
+
+
+def _local_cache(namespace, key, generator):
+	# Same contract as frappe.local_cache: the generator takes no arguments.
+	bucket = frappe.local.cache.setdefault(namespace, {})
+	if key not in bucket:
+		bucket[key] = generator()
+	return bucket[key]
+
+
+class UnitTestGetCalendar(UnitTestCase):
+	def setUp(self):
+		self.cache = _Cache()
+		self.db = MagicMock()
+		self.db.get_value.return_value = frappe._dict(
+			work_calendar_hours_json=json.dumps({"sat": [["09:00", "11:00"]]}),
+			work_calendar_holidays_json=json.dumps(["2026-12-26"]),
+		)
+		patches = [
+			patch.object(frappe, "local_cache", _local_cache, create=True),
+			patch.object(frappe, "cache", lambda: self.cache, create=True),
+			patch.object(frappe, "db", self.db, create=True),
+			patch.object(frappe, "local", SimpleNamespace(cache={}), create=True),
+		]
+		for p in patches:
+			p.start()
+			self.addCleanup(p.stop)
+
+	def test_named_calendar_is_loaded_once(self):
+		calendar = work_calendar.get_calendar("Weekend Crew")
+		self.assertEqual(calendar.windows(date(2027, 1, 2)), [(9 * 60, 11 * 60)])
+		self.assertEqual(calendar.windows(date(2026, 12, 26)), [])
+		self.assertIs(work_calendar.get_calendar("Weekend Crew"), calendar)
+		self.assertEqual(self.db.get_value.call_count, 1)
+
+	def test_invalidate_reloads(self):
+		work_calendar.get_calendar("Weekend Crew")
+		work_calendar.invalidate("Weekend Crew")
+		self.assertIsNone(self.cache.hget(work_calendar.CACHE_KEY, "Weekend Crew"))
+		work_calendar.get_calendar("Weekend Crew")
+		self.assertEqual(self.db.get_value.call_count, 2)
+
+	def test_unnamed_calendar_uses_default_hours(self):
+		self.assertEqual(work_calendar.get_calendar().windows(date(2026, 12, 21)), [(7 * 60, 15 * 60 + 30)])